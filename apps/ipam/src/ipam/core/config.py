@@ -26,6 +26,19 @@ class Settings(BaseServiceSettings):
     scan_timeout: int = Field(default=300, alias="SCAN_TIMEOUT")
     scan_concurrency: int = Field(default=50, alias="SCAN_CONCURRENCY")
     ping_timeout: float = Field(default=1.0, alias="PING_TIMEOUT")
+    # Reverse-DNS workers per scan (aiodns multiplexes these on the event loop)
+    scan_dns_concurrency: int = Field(default=64, ge=1, alias="SCAN_DNS_CONCURRENCY")
+    # Concurrent batch upserts per scan; each holds a pooled DB connection
+    scan_db_concurrency: int = Field(default=4, ge=1, alias="SCAN_DB_CONCURRENCY")
+
+    # nmap tuning: higher timing templates, probe rates and host groups finish
+    # large sweeps much faster but can miss slow or rate-limited hosts.
+    # Unset values leave nmap's own defaults in place.
+    nmap_timing_template: int | None = Field(
+        default=4, ge=0, le=5, alias="NMAP_TIMING_TEMPLATE"
+    )
+    nmap_min_rate: int | None = Field(default=None, ge=1, alias="NMAP_MIN_RATE")
+    nmap_min_hostgroup: int | None = Field(default=None, ge=1, alias="NMAP_MIN_HOSTGROUP")
 
 
 @lru_cache
@@ -362,6 +362,43 @@ class AddressRepository:
         )
         return IPAddress(**_row_to_dict(row))
 
+    async def bulk_upsert(self, network_id: str, addresses: list[IPAddressCreate]) -> int:
+        """Create or update many scan results in one round trip.
+
+        Returns the number of addresses that were newly inserted.
+        """
+        # ON CONFLICT can't touch the same row twice in one statement
+        rows = {data.address: data for data in addresses}
+        if not rows:
+            return 0
+
+        query = """
+            INSERT INTO ipam.addresses (
+                network_id, address, mac_address, hostname, status,
+                last_seen, discovered_at
+            )
+            SELECT $1, t.address, t.mac_address, t.hostname, t.status, NOW(), NOW()
+            FROM unnest($2::inet[], $3::macaddr[], $4::text[], $5::text[])
+                AS t(address, mac_address, hostname, status)
+            ON CONFLICT (network_id, address)
+            DO UPDATE SET
+                mac_address = COALESCE(EXCLUDED.mac_address, ipam.addresses.mac_address),
+                hostname = COALESCE(EXCLUDED.hostname, ipam.addresses.hostname),
+                status = EXCLUDED.status,
+                last_seen = NOW(),
+                updated_at = NOW()
+            RETURNING (xmax = 0) AS inserted
+        """
+        results = await self.conn.fetch(
+            query,
+            UUID(network_id),
+            [data.address for data in rows.values()],
+            [data.mac_address for data in rows.values()],
+            [data.hostname for data in rows.values()],
+            [data.status.value for data in rows.values()],
+        )
+        return sum(1 for row in results if row["inserted"])
+
     async def update(self, address_id: str, data: IPAddressUpdate) -> IPAddress | None:
         """Update an existing IP address."""
         updates = []
@@ -1,21 +1,44 @@
 """Network scanning service with ICMP ping and NMAP support."""
 
 import asyncio
+import functools
+import ipaddress
+import os
+import platform
+import re
+import shutil
 import socket
+import struct
 import subprocess
-import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import AsyncIterator
-import shutil
+from itertools import chain, islice
+from time import perf_counter
+from typing import AsyncIterator, Iterable, Iterator
 
-from netaddr import IPNetwork
+try:
+    import aiodns
+
+    AIODNS_AVAILABLE = True
+except ImportError:  # fall back to the blocking resolver in a thread
+    AIODNS_AVAILABLE = False
+
+try:
+    from lxml import etree as ET  # noqa: N812 - same name as the stdlib fallback
+
+    LXML_AVAILABLE = True
+except ImportError:  # stdlib fallback
+    import xml.etree.ElementTree as ET  # type: ignore[no-redef]
+
+    LXML_AVAILABLE = False
 
-from ..db import get_db, NetworkRepository, AddressRepository, ScanRepository
-from ..models.network import Network
-from ..models.address import IPAddressCreate, IPStatus, IPAddressDiscovered
-from ..models.scan import ScanJob, ScanJobCreate, ScanType, ScanStatus, ScanProgress, ScanResult
 from ..core.config import settings
 from ..core.logging import get_logger
+from ..db import AddressRepository, NetworkRepository, ScanRepository, get_db
+from ..models.address import IPAddressCreate, IPAddressDiscovered, IPStatus
+from ..models.network import Network
+from ..models.scan import ScanJob, ScanJobCreate, ScanProgress, ScanResult, ScanStatus, ScanType
+from .icmp import icmp_sweep
 
 logger = get_logger(__name__)
 
@@ -23,6 +46,119 @@ logger = get_logger(__name__)
 # Check for nmap availability
 NMAP_AVAILABLE = shutil.which("nmap") is not None
 
+_IS_WINDOWS = platform.system().lower() == "windows"
+
+# nmap only reports MAC addresses (via ARP) when it runs privileged
+NMAP_PRIVILEGED = hasattr(os, "geteuid") and os.geteuid() == 0
+
+# macOS/Linux: rtt min/avg/max/mdev = 0.123/0.456/0.789/0.012 ms
+_RTT_RE = re.compile(r"(?:rtt|round-trip)\s+min/avg/max.*?=\s*[\d.]+/([\d.]+)/", re.IGNORECASE)
+# Windows: Average = 10ms
+_WIN_AVG_RE = re.compile(r"Average\s*=\s*(\d+)ms", re.IGNORECASE)
+
+if LXML_AVAILABLE:
+    # Compiled once and reused across scans
+    _OPEN_PORTS_XPATH = ET.XPath("port[state/@state='open']")
+
+# Scan results are written to the database in batches of this size
+UPSERT_BATCH_SIZE = 100
+
+# Built-in ICMP sweeps ping at most this many hosts per datagram socket
+ICMP_SWEEP_SIZE = 4096
+
+# nmap stdout is fed to the XML pull parser in chunks of this size
+NMAP_READ_CHUNK = 64 * 1024
+
+# Ports probed by TCP liveness scans (both tcp_ping and nmap "tcp" sweeps)
+TCP_PROBE_PORTS = [22, 80, 443, 3389, 445, 23, 21, 25, 53, 8080]
+_TCP_PROBE_PORTS_ARG = ",".join(str(p) for p in TCP_PROBE_PORTS)
+
+# nmap argv per scan type, specialized once at import; nmap_scan only appends
+# port selection, tuning flags and the target. Unprivileged ping sweeps use
+# grepable output since they carry no MAC/port data that would need XML.
+_NMAP_CMD_TEMPLATES: dict[str, tuple[str, ...]] = {
+    # Fast ping scan only
+    "ping": ("nmap", "-oX" if NMAP_PRIVILEGED else "-oG", "-", "-sn", "-PE", "-PA80,443"),
+    # TCP liveness sweep over the same ports as tcp_ping; half-open SYN
+    # probes when privileged, full connects otherwise
+    "tcp": ("nmap", "-oX", "-", "-sS" if NMAP_PRIVILEGED else "-sT"),
+    # Quick TCP scan on common ports
+    "quick": ("nmap", "-oX", "-", "-sT", "-F", "--top-ports", "100"),
+    # Service detection on specified or top ports
+    "service": ("nmap", "-oX", "-", "-sT", "-sV", "--version-intensity", "2"),
+    # Full port scan with service detection
+    "full": ("nmap", "-oX", "-", "-sT", "-sV", "-p-"),
+}
+# Unknown scan types fall back to a plain ping scan
+_NMAP_DEFAULT_TEMPLATE = ("nmap", "-oX", "-", "-sn", "-PE")
+
+# Timing/throughput tuning (see Settings for the accuracy tradeoff)
+_NMAP_TUNING_ARGS: tuple[str, ...] = tuple(
+    arg
+    for arg, enabled in (
+        (f"-T{settings.nmap_timing_template}", settings.nmap_timing_template is not None),
+        (f"--min-rate={settings.nmap_min_rate}", bool(settings.nmap_min_rate)),
+        (f"--min-hostgroup={settings.nmap_min_hostgroup}", bool(settings.nmap_min_hostgroup)),
+    )
+    if enabled
+)
+
+
+@dataclass(slots=True)
+class PortRecord:
+    """An open port reported by nmap."""
+
+    port: int
+    protocol: str = "tcp"
+    service: str | None = None
+    product: str | None = None
+    version: str | None = None
+
+
+@dataclass(slots=True)
+class HostRecord:
+    """A live host parsed from nmap output."""
+
+    ip_address: str | None = None
+    hostname: str | None = None
+    mac_address: str | None = None
+    vendor: str | None = None
+    is_alive: bool = True
+    latency_ms: float | None = None
+    open_ports: list[PortRecord] = field(default_factory=list)
+    os_guess: str | None = None
+
+
+def iter_host_addresses(cidr: str) -> Iterator[str]:
+    """Lazily enumerate the usable host addresses of a CIDR as strings."""
+    net = ipaddress.ip_network(cidr, strict=False)
+    if net.version == 4 and net.prefixlen < 31:
+        # Format integers directly instead of building an IPv4Address per host
+        first = int(net.network_address) + 1
+        last = int(net.broadcast_address)
+        for value in range(first, last):
+            yield socket.inet_ntoa(value.to_bytes(4, "big"))
+    else:
+        for ip in net.hosts():
+            yield str(ip)
+
+
+def count_host_addresses(cidr: str) -> int:
+    """Count the addresses iter_host_addresses() yields without enumerating them."""
+    net = ipaddress.ip_network(cidr, strict=False)
+    if net.prefixlen >= net.max_prefixlen - 1:
+        return net.num_addresses
+    # IPv4 excludes network and broadcast; IPv6 excludes the subnet-router anycast
+    return net.num_addresses - (2 if net.version == 4 else 1)
+
+
+@functools.cache
+def _ping_template(count: int, timeout: float) -> tuple[str, ...]:
+    """Build the platform ping command (minus the target) once per setting."""
+    if _IS_WINDOWS:
+        return ("ping", "-n", str(count), "-w", str(int(timeout * 1000)))
+    return ("ping", "-c", str(count), "-W", str(int(timeout)))
+
 
 async def icmp_ping(ip: str, count: int = 2, timeout: float = 2.0) -> tuple[str, bool, float | None]:
     """
@@ -30,16 +166,9 @@ async def icmp_ping(ip: str, count: int = 2, timeout: float = 2.0) -> tuple[str,
     Returns (ip, is_alive, response_time_ms).
     """
     try:
-        import platform
-        system = platform.system().lower()
-
-        if system == "windows":
-            cmd = ["ping", "-n", str(count), "-w", str(int(timeout * 1000)), ip]
-        else:
-            cmd = ["ping", "-c", str(count), "-W", str(int(timeout)), ip]
-
         process = await asyncio.create_subprocess_exec(
-            *cmd,
+            *_ping_template(count, timeout),
+            ip,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
@@ -57,16 +186,9 @@ async def icmp_ping(ip: str, count: int = 2, timeout: float = 2.0) -> tuple[str,
 
         if process.returncode == 0:
             # Extract average latency
-            import re
-            # macOS/Linux: rtt min/avg/max/mdev = 0.123/0.456/0.789/0.012 ms
-            latency_match = re.search(
-                r"(?:rtt|round-trip)\s+min/avg/max.*?=\s*[\d.]+/([\d.]+)/",
-                output,
-                re.IGNORECASE,
-            )
+            latency_match = _RTT_RE.search(output)
             if not latency_match:
-                # Windows: Average = 10ms
-                latency_match = re.search(r"Average\s*=\s*(\d+)ms", output, re.IGNORECASE)
+                latency_match = _WIN_AVG_RE.search(output)
 
             latency = float(latency_match.group(1)) if latency_match else None
             return ip, True, latency
@@ -78,39 +200,88 @@ async def icmp_ping(ip: str, count: int = 2, timeout: float = 2.0) -> tuple[str,
         return ip, False, None
 
 
-async def tcp_ping(ip: str, ports: list[int] | None = None, timeout: float = 1.0) -> tuple[str, bool, float | None, list[int]]:
+# SO_LINGER with a zero timeout makes close() send RST instead of FIN
+_LINGER_ABORT = struct.pack("ii", 1, 0)
+
+
+async def _tcp_probe(ip: str, port: int, timeout: float) -> float:
+    """
+    Open a TCP connection, returning the connect time in ms.
+
+    The connection is aborted with RST rather than closed with FIN, so sweeps
+    don't leave FIN_WAIT/TIME_WAIT sockets behind.
+    """
+    start = perf_counter()
+    _, writer = await asyncio.wait_for(
+        asyncio.open_connection(ip, port),
+        timeout=timeout,
+    )
+    elapsed = (perf_counter() - start) * 1000
+    sock = writer.get_extra_info("socket")
+    if sock is not None:
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_ABORT)
+        except OSError:
+            pass
+    writer.transport.abort()
+    return elapsed
+
+
+async def tcp_ping(
+    ip: str,
+    ports: list[int] | None = None,
+    timeout: float = 1.0,
+    all_ports: bool = False,
+) -> tuple[str, bool, float | None, list[int]]:
     """
     TCP connect scan to check host reachability and open ports.
+
+    All ports are probed concurrently, so an unreachable host costs one
+    ``timeout`` rather than one per port. By default the first open port wins
+    and the remaining probes are cancelled; pass ``all_ports=True`` to wait
+    for every probe and collect all open ports.
     Returns (ip, is_alive, response_time_ms, open_ports).
     """
-    ports = ports or [22, 80, 443, 3389, 445, 23, 21, 25, 53, 8080]
-    open_ports = []
+    ports = ports or TCP_PROBE_PORTS
+    probes = {asyncio.create_task(_tcp_probe(ip, port, timeout)): port for port in ports}
+    pending = set(probes)
+    open_ports: list[int] = []
+    latency: float | None = None
 
-    for port in ports:
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    continue
+                open_ports.append(probes[task])
+                if latency is None:
+                    latency = task.result()
+            if open_ports and not all_ports:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    return ip, len(open_ports) > 0, latency, open_ports
+
+
+async def resolve_hostname(ip: str, resolver: "aiodns.DNSResolver | None" = None) -> str | None:
+    """Resolve IP address to hostname via reverse DNS.
+
+    With an aiodns resolver the lookup runs on the event loop through c-ares,
+    so hundreds can be in flight; otherwise gethostbyaddr is run in the
+    default executor and is bounded by its thread count.
+    """
+    if resolver is not None:
         try:
-            start = asyncio.get_event_loop().time()
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_connection(ip, port),
-                timeout=timeout,
-            )
-            writer.close()
-            await writer.wait_closed()
-
-            elapsed = (asyncio.get_event_loop().time() - start) * 1000
-            open_ports.append(port)
-
-            if len(open_ports) == 1:
-                # Return after first successful connection with latency
-                return ip, True, elapsed, open_ports
+            result = await resolver.gethostbyaddr(ip)
+            return result.name or None
+        except aiodns.error.DNSError:
+            return None
 
-        except (asyncio.TimeoutError, OSError, ConnectionRefusedError):
-            continue
-
-    return ip, len(open_ports) > 0, None, open_ports
-
-
-async def resolve_hostname(ip: str) -> str | None:
-    """Resolve IP address to hostname via reverse DNS."""
     try:
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
@@ -126,163 +297,312 @@ async def nmap_scan(
     scan_type: str = "ping",
     ports: str | None = None,
     timeout: int = 300,
-) -> list[dict]:
+) -> AsyncIterator[HostRecord]:
     """
-    Run nmap scan and parse results.
+    Run nmap scan and stream parsed hosts as nmap reports them.
+
+    Output is parsed incrementally from the subprocess pipe, so memory stays
+    bounded by a single host regardless of network size and callers can
+    process hosts while nmap is still scanning. Unprivileged ping scans use
+    the line-oriented grepable format, since they carry no MAC or port data
+    that would need XML; everything else uses XML.
 
     Args:
         cidr: Network CIDR to scan (e.g., 192.168.1.0/24)
-        scan_type: Type of scan ('ping', 'quick', 'full', 'service')
+        scan_type: Type of scan ('ping', 'tcp', 'quick', 'full', 'service')
         ports: Port specification (e.g., '22,80,443' or '1-1000')
         timeout: Maximum scan time in seconds
 
-    Returns:
-        List of discovered hosts with their details
+    Yields:
+        Discovered hosts with their details
     """
     if not NMAP_AVAILABLE:
         raise RuntimeError("nmap is not installed or not in PATH")
 
-    # Build nmap command based on scan type
-    cmd = ["nmap", "-oX", "-"]  # Output XML to stdout
-
-    if scan_type == "ping":
-        # Fast ping scan only
-        cmd.extend(["-sn", "-PE", "-PA80,443"])
-    elif scan_type == "quick":
-        # Quick TCP scan on common ports
-        cmd.extend(["-sT", "-F", "--top-ports", "100"])
+    # Build nmap command from the pre-built template for this scan type
+    cmd = list(_NMAP_CMD_TEMPLATES.get(scan_type, _NMAP_DEFAULT_TEMPLATE))
+    grepable = cmd[1] == "-oG"
+    if scan_type == "tcp":
+        cmd.extend(["-p", ports or _TCP_PROBE_PORTS_ARG])
     elif scan_type == "service":
-        # Service detection on specified or top ports
-        cmd.extend(["-sT", "-sV", "--version-intensity", "2"])
-        if ports:
-            cmd.extend(["-p", ports])
-        else:
-            cmd.extend(["--top-ports", "100"])
-    elif scan_type == "full":
-        # Full port scan with service detection
-        cmd.extend(["-sT", "-sV", "-p-"])
-    else:
-        # Default to ping scan
-        cmd.extend(["-sn", "-PE"])
-
-    # Add target network
+        cmd.extend(["-p", ports] if ports else ["--top-ports", "100"])
+    cmd.extend(_NMAP_TUNING_ARGS)
     cmd.append(cidr)
 
     logger.info("starting_nmap_scan", cidr=cidr, scan_type=scan_type, cmd=" ".join(cmd))
 
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    # Drain stderr concurrently so a chatty nmap can't block on a full pipe
+    stderr_task = asyncio.create_task(process.stderr.read())
+    parser = _GrepableParser() if grepable else _new_pull_parser()
+
     try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
+        while True:
+            remaining = deadline - loop.time()
+            try:
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                chunk = await asyncio.wait_for(
+                    process.stdout.read(NMAP_READ_CHUNK), timeout=remaining
+                )
+            except asyncio.TimeoutError:
+                raise RuntimeError(f"nmap scan timed out after {timeout} seconds")
+
+            if not chunk:
+                break
+
+            try:
+                hosts = _feed_parser(parser, chunk)
+            except ET.ParseError as e:
+                # Nobody reads stdout after this, so nmap must not be waited on;
+                # the finally block kills it
+                logger.error("nmap_xml_parse_error", error=str(e))
+                raise RuntimeError(f"nmap produced invalid XML: {e}") from e
+
+            for host_data in hosts:
+                yield host_data
+
+        if isinstance(parser, _GrepableParser):
+            for host_data in parser.close():
+                yield host_data
 
         try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=timeout,
-            )
+            await asyncio.wait_for(process.wait(), timeout=max(deadline - loop.time(), 0))
         except asyncio.TimeoutError:
-            process.kill()
             raise RuntimeError(f"nmap scan timed out after {timeout} seconds")
-
         if process.returncode != 0:
-            error_msg = stderr.decode("utf-8", errors="ignore")
+            error_msg = (await stderr_task).decode("utf-8", errors="ignore")
             raise RuntimeError(f"nmap failed: {error_msg}")
 
-        # Parse XML output
-        xml_output = stdout.decode("utf-8", errors="ignore")
-        return _parse_nmap_xml(xml_output)
-
     except Exception as e:
         logger.error("nmap_scan_error", cidr=cidr, error=str(e))
         raise
 
+    finally:
+        if process.returncode is None:
+            process.kill()
+            # wait() only returns once stdout is closed, which never happens
+            # while unread output holds the stream paused
+            while await process.stdout.read(NMAP_READ_CHUNK):
+                pass
+            await process.wait()
+        stderr_task.cancel()
 
-def _parse_nmap_xml(xml_output: str) -> list[dict]:
-    """Parse nmap XML output into structured host data."""
-    hosts = []
 
-    try:
-        root = ET.fromstring(xml_output)
+def _feed_parser(parser: "_GrepableParser | ET.XMLPullParser", chunk: bytes) -> list[HostRecord]:
+    """Feed a chunk of nmap output to either parser and return completed hosts."""
+    if isinstance(parser, _GrepableParser):
+        return parser.feed(chunk)
+    parser.feed(chunk)
+    return _drain_hosts(parser)
+
+
+class _GrepableParser:
+    """Incremental parser for nmap's grepable (-oG) output.
+
+    Each host line looks like ``Host: 10.0.0.1 (name)<TAB>Status: Up``, with
+    port scans adding ``Host: ...<TAB>Ports: 22/open/tcp//ssh///, ...`` lines.
+    A host is emitted once a line for a different host (or EOF) is seen, so
+    its status and port lines are merged into one record.
+    """
 
-        for host in root.findall(".//host"):
-            status = host.find("status")
-            if status is None or status.get("state") != "up":
+    def __init__(self) -> None:
+        self._buffer = b""
+        self._pending: HostRecord | None = None
+
+    def feed(self, chunk: bytes) -> list[HostRecord]:
+        """Parse the complete lines in ``chunk``; partial lines are buffered."""
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> list[HostRecord]:
+        """Flush the buffered line and the last pending host."""
+        hosts = self._parse_lines([self._buffer])
+        self._buffer = b""
+        if self._pending is not None:
+            hosts.append(self._pending)
+            self._pending = None
+        return hosts
+
+    def _parse_lines(self, lines: list[bytes]) -> list[HostRecord]:
+        hosts = []
+        for raw in lines:
+            line = raw.decode("utf-8", errors="ignore").rstrip("\r")
+            if not line.startswith("Host: "):
                 continue
 
-            host_data = {
-                "ip_address": None,
-                "hostname": None,
-                "mac_address": None,
-                "vendor": None,
-                "is_alive": True,
-                "latency_ms": None,
-                "open_ports": [],
-                "os_guess": None,
-            }
-
-            # Get IP address
-            for addr in host.findall("address"):
-                if addr.get("addrtype") == "ipv4":
-                    host_data["ip_address"] = addr.get("addr")
-                elif addr.get("addrtype") == "mac":
-                    host_data["mac_address"] = addr.get("addr")
-                    host_data["vendor"] = addr.get("vendor")
-
-            # Get hostname
-            hostnames = host.find("hostnames")
-            if hostnames is not None:
-                hostname_elem = hostnames.find("hostname")
-                if hostname_elem is not None:
-                    host_data["hostname"] = hostname_elem.get("name")
-
-            # Get latency from times element
-            times = host.find("times")
-            if times is not None:
-                srtt = times.get("srtt")
-                if srtt:
-                    host_data["latency_ms"] = int(srtt) / 1000  # Convert microseconds to ms
-
-            # Get open ports
-            ports_elem = host.find("ports")
-            if ports_elem is not None:
-                for port in ports_elem.findall("port"):
-                    state = port.find("state")
-                    if state is not None and state.get("state") == "open":
-                        port_info = {
-                            "port": int(port.get("portid", 0)),
-                            "protocol": port.get("protocol", "tcp"),
-                        }
-                        service = port.find("service")
-                        if service is not None:
-                            port_info["service"] = service.get("name")
-                            port_info["product"] = service.get("product")
-                            port_info["version"] = service.get("version")
-                        host_data["open_ports"].append(port_info)
-
-            # Get OS detection if available
-            os_elem = host.find("os")
-            if os_elem is not None:
-                osmatch = os_elem.find("osmatch")
-                if osmatch is not None:
-                    host_data["os_guess"] = osmatch.get("name")
-
-            if host_data["ip_address"]:
-                hosts.append(host_data)
+            fields = line.split("\t")
+            ip, _, name = fields[0][len("Host: "):].partition(" ")
+            if self._pending is not None and self._pending.ip_address != ip:
+                hosts.append(self._pending)
+                self._pending = None
+
+            status = None
+            ports: list[PortRecord] = []
+            for section in fields[1:]:
+                key, _, value = section.partition(": ")
+                if key == "Status":
+                    status = value.strip()
+                elif key == "Ports":
+                    ports = [port for port in map(_parse_grepable_port, value.split(", ")) if port]
+
+            if status is not None and status != "Up":
+                continue
 
-    except ET.ParseError as e:
-        logger.error("nmap_xml_parse_error", error=str(e))
+            if self._pending is None:
+                self._pending = HostRecord(ip_address=ip, hostname=name.strip("()") or None)
+            self._pending.open_ports.extend(ports)
+        return hosts
+
+
+def _parse_grepable_port(entry: str) -> PortRecord | None:
+    """Parse ``port/state/protocol/owner/service/rpc/version/``; None unless open."""
+    parts = entry.strip().split("/")
+    if len(parts) < 3 or parts[1] != "open" or not parts[0].isdigit():
+        return None
+    return PortRecord(
+        port=int(parts[0]),
+        protocol=parts[2] or "tcp",
+        service=(parts[4] or None) if len(parts) > 4 else None,
+        version=(parts[6] or None) if len(parts) > 6 else None,
+    )
+
+
+def _parse_nmap_grepable(text: str) -> list[HostRecord]:
+    """Parse complete nmap grepable output into structured host data."""
+    parser = _GrepableParser()
+    return parser.feed(text.encode("utf-8")) + parser.close()
+
+
+def _new_pull_parser() -> "ET.XMLPullParser":
+    """Create an incremental parser that reports completed <host> elements."""
+    if LXML_AVAILABLE:
+        return ET.XMLPullParser(
+            events=("end",),
+            tag="host",
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+        )
+    return ET.XMLPullParser(events=("end",))
+
+
+def _drain_hosts(parser: "ET.XMLPullParser") -> list[HostRecord]:
+    """Parse the <host> elements completed so far and release their memory."""
+    hosts = []
+    for _, elem in parser.read_events():
+        if elem.tag != "host":
+            continue
+
+        host_data = _parse_host(elem)
+        if host_data:
+            hosts.append(host_data)
 
+        elem.clear()
+        if LXML_AVAILABLE:
+            # Drop already-processed siblings so the root doesn't keep growing
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
     return hosts
 
 
+def _open_ports(ports: "ET.Element") -> list["ET.Element"]:
+    """Return the open <port> children of a host's <ports> element."""
+    if LXML_AVAILABLE:
+        return _OPEN_PORTS_XPATH(ports)
+    open_ports = []
+    for port in ports.findall("port"):
+        state = port.find("state")
+        if state is not None and state.get("state") == "open":
+            open_ports.append(port)
+    return open_ports
+
+
+def _parse_host(host: "ET.Element") -> HostRecord | None:
+    """Parse a single nmap <host> element; None if the host is down or has no IPv4.
+
+    Walks the host's children once and dispatches on tag, rather than
+    rescanning them with a separate find() per field.
+    """
+    host_data = HostRecord()
+    is_up = False
+
+    for child in host:
+        tag = child.tag
+        if tag == "status":
+            if child.get("state") != "up":
+                return None
+            is_up = True
+        elif tag == "address":
+            addrtype = child.get("addrtype")
+            if addrtype == "ipv4":
+                host_data.ip_address = child.get("addr")
+            elif addrtype == "mac":
+                host_data.mac_address = child.get("addr")
+                host_data.vendor = child.get("vendor")
+        elif tag == "hostnames":
+            hostname_elem = child.find("hostname")
+            if hostname_elem is not None:
+                host_data.hostname = hostname_elem.get("name")
+        elif tag == "times":
+            srtt = child.get("srtt")
+            if srtt:
+                host_data.latency_ms = int(srtt) / 1000  # Convert microseconds to ms
+        elif tag == "ports":
+            append_port = host_data.open_ports.append
+            for port in _open_ports(child):
+                port_info = PortRecord(
+                    port=int(port.get("portid", 0)),
+                    protocol=port.get("protocol", "tcp"),
+                )
+                service = port.find("service")
+                if service is not None:
+                    port_info.service = service.get("name")
+                    port_info.product = service.get("product")
+                    port_info.version = service.get("version")
+                append_port(port_info)
+        elif tag == "os":
+            # OS detection, if it ran
+            osmatch = child.find("osmatch")
+            if osmatch is not None:
+                host_data.os_guess = osmatch.get("name")
+
+    return host_data if is_up and host_data.ip_address else None
+
+
+def _parse_nmap_xml(xml_output: str) -> list[HostRecord]:
+    """Parse a complete nmap XML document into structured host data."""
+    parser = _new_pull_parser()
+    try:
+        parser.feed(xml_output.encode("utf-8"))
+        parser.close()
+        return _drain_hosts(parser)
+    except ET.ParseError as e:
+        logger.error("nmap_xml_parse_error", error=str(e))
+        return []
+
+
 class ScannerService:
     """Service for network scanning operations."""
 
     def __init__(self) -> None:
         self.concurrency = getattr(settings, "scan_concurrency", 50)
         self.ping_timeout = getattr(settings, "ping_timeout", 2.0)
+        self.dns_concurrency = getattr(settings, "scan_dns_concurrency", 64)
+        self.db_concurrency = getattr(settings, "scan_db_concurrency", 4)
+        self._resolver: "aiodns.DNSResolver | None" = None
+
+    def _get_resolver(self) -> "aiodns.DNSResolver | None":
+        """Get the async DNS resolver, created lazily on the running loop."""
+        if AIODNS_AVAILABLE and self._resolver is None:
+            self._resolver = aiodns.DNSResolver(timeout=self.ping_timeout, tries=2)
+        return self._resolver
 
     async def start_scan(
         self,
@@ -384,48 +704,46 @@ class ScannerService:
         scan_id: str,
         scan_repo: ScanRepository,
         address_repo: AddressRepository,
+        nmap_scan_type: str = "ping",
+        scan_type: ScanType = ScanType.NMAP,
     ) -> ScanResult:
-        """Run nmap-based network scan."""
+        """Run nmap-based network scan.
+
+        Also used by the built-in PING/TCP scans when nmap is installed, since a
+        single nmap process sweeping the CIDR is far cheaper than spawning one
+        probe per host.
+        """
         start_time = datetime.now(timezone.utc)
         active_ips: set[str] = set()
-        new_ips = 0
 
         # Calculate total hosts
-        ip_network = IPNetwork(network.network)
-        total_ips = ip_network.size - 2  # Exclude network and broadcast
+        total_ips = count_host_addresses(network.network)
 
         logger.info(
             "running_nmap_scan",
             scan_id=scan_id,
             network=network.network,
             total_ips=total_ips,
+            nmap_scan_type=nmap_scan_type,
         )
 
-        # Run nmap scan
-        hosts = await nmap_scan(network.network, scan_type="ping")
-
-        for host in hosts:
-            ip = host["ip_address"]
-            if not ip:
-                continue
-
-            active_ips.add(ip)
+        async def discovered() -> AsyncIterator[IPAddressCreate]:
+            # Hosts are ingested as nmap reports them rather than after the scan
+            async for host in nmap_scan(network.network, scan_type=nmap_scan_type):
+                ip = host.ip_address
+                if not ip:
+                    continue
 
-            # Check if this is a new IP
-            existing = await address_repo.find_by_ip(network.id, ip)
-            if not existing:
-                new_ips += 1
-
-            # Upsert the discovered address
-            await address_repo.upsert(
-                IPAddressCreate(
+                active_ips.add(ip)
+                yield IPAddressCreate(
                     network_id=network.id,
                     address=ip,
-                    hostname=host.get("hostname"),
-                    mac_address=host.get("mac_address"),
+                    hostname=host.hostname,
+                    mac_address=host.mac_address,
                     status=IPStatus.ACTIVE,
                 )
-            )
+
+        new_ips = await self._upsert_discovered(network.id, discovered())
 
         # Mark addresses not seen as inactive
         disappeared = await address_repo.mark_inactive(network.id, active_ips)
@@ -454,7 +772,7 @@ class ScannerService:
         return ScanResult(
             scan_id=scan_id,
             network_id=network.id,
-            scan_type=ScanType.NMAP,
+            scan_type=scan_type,
             status=ScanStatus.COMPLETED,
             started_at=start_time,
             completed_at=end_time,
@@ -474,15 +792,24 @@ class ScannerService:
         scan_repo: ScanRepository,
         address_repo: AddressRepository,
     ) -> ScanResult:
-        """Run built-in ICMP/TCP network scan."""
+        """Run built-in ICMP/TCP network scan as a probe -> DNS -> upsert pipeline."""
+        if NMAP_AVAILABLE and scan.scan_type in (ScanType.PING, ScanType.TCP):
+            # One nmap invocation over the whole CIDR replaces a ping/connect
+            # subprocess per host; the pure-Python path below is the fallback.
+            return await self._run_nmap_scan(
+                network,
+                scan_id,
+                scan_repo,
+                address_repo,
+                nmap_scan_type="tcp" if scan.scan_type == ScanType.TCP else "ping",
+                scan_type=scan.scan_type,
+            )
+
         start_time = datetime.now(timezone.utc)
         active_ips: set[str] = set()
-        new_ips = 0
 
         # Generate IP range from CIDR
-        ip_network = IPNetwork(network.network)
-        all_ips = [str(ip) for ip in ip_network.iter_hosts()]
-        total_ips = len(all_ips)
+        total_ips = count_host_addresses(network.network)
 
         logger.info(
             "scanning_network",
@@ -494,27 +821,21 @@ class ScannerService:
 
         # Scan in batches
         use_tcp = scan.scan_type == ScanType.TCP
-        async for discovered in self._scan_batch(all_ips, use_tcp=use_tcp):
-            if discovered.is_alive:
-                active_ips.add(discovered.address)
-
-                # Check if this is a new IP
-                existing = await address_repo.find_by_ip(
-                    network.id, discovered.address
-                )
-                if not existing:
-                    new_ips += 1
-
-                # Upsert the discovered address
-                await address_repo.upsert(
-                    IPAddressCreate(
+        async def discovered() -> AsyncIterator[IPAddressCreate]:
+            async for result in self._scan_batch(
+                iter_host_addresses(network.network), use_tcp=use_tcp
+            ):
+                if result.is_alive:
+                    active_ips.add(result.address)
+                    yield IPAddressCreate(
                         network_id=network.id,
-                        address=discovered.address,
-                        hostname=discovered.hostname,
-                        mac_address=discovered.mac_address,
+                        address=result.address,
+                        hostname=result.hostname,
+                        mac_address=result.mac_address,
                         status=IPStatus.ACTIVE,
                     )
-                )
+
+        new_ips = await self._upsert_discovered(network.id, discovered())
 
         # Mark addresses not seen as inactive
         disappeared = await address_repo.mark_inactive(network.id, active_ips)
@@ -556,39 +877,150 @@ class ScannerService:
             disappeared_ips=disappeared,
         )
 
+    async def _upsert_discovered(
+        self, network_id: str, addresses: AsyncIterator[IPAddressCreate]
+    ) -> int:
+        """Write discovered addresses in batches; returns how many were new.
+
+        Each batch is upserted on its own pooled connection, with up to
+        ``self.db_concurrency`` batches in flight while discovery continues.
+        """
+        db_slots = asyncio.Semaphore(self.db_concurrency)
+
+        async def flush(rows: list[IPAddressCreate]) -> int:
+            try:
+                async with get_db() as conn:
+                    return await AddressRepository(conn).bulk_upsert(network_id, rows)
+            finally:
+                db_slots.release()
+
+        flushes: list[asyncio.Task[int]] = []
+        async with asyncio.TaskGroup() as tg:
+            batch: list[IPAddressCreate] = []
+            async for address in addresses:
+                batch.append(address)
+                if len(batch) >= UPSERT_BATCH_SIZE:
+                    # Wait for a free slot so unwritten batches can't pile up
+                    await db_slots.acquire()
+                    flushes.append(tg.create_task(flush(batch)))
+                    batch = []
+
+            if batch:
+                await db_slots.acquire()
+                flushes.append(tg.create_task(flush(batch)))
+
+        return sum(task.result() for task in flushes)
+
     async def _scan_batch(
-        self, ips: list[str], use_tcp: bool = False
+        self, ips: Iterable[str], use_tcp: bool = False
     ) -> AsyncIterator[IPAddressDiscovered]:
-        """Scan IPs in concurrent batches."""
-        semaphore = asyncio.Semaphore(self.concurrency)
-
-        async def scan_with_limit(ip: str) -> IPAddressDiscovered | None:
-            async with semaphore:
-                if use_tcp:
-                    ip_addr, is_alive, response_time, open_ports = await tcp_ping(
-                        ip, timeout=self.ping_timeout
-                    )
+        """Scan IPs through a concurrent probe -> resolve pipeline.
+
+        Stage 1 probes hosts (ICMP sweeps in chunks, or a pool of
+        ``self.concurrency`` workers for TCP and subprocess pings) and hands
+        live hosts to stage 2, where ``self.dns_concurrency`` workers add
+        reverse DNS. Dead hosts skip stage 2. The stages are connected by
+        bounded queues, so they run concurrently, ``ips`` is consumed lazily,
+        and memory stays proportional to the worker counts rather than to the
+        network size. The caller's batched upserts form the last stage.
+        """
+        resolver = self._get_resolver()
+        alive: asyncio.Queue[IPAddressDiscovered | None] = asyncio.Queue(
+            maxsize=self.concurrency * 2
+        )
+        results: asyncio.Queue[IPAddressDiscovered | None] = asyncio.Queue(
+            maxsize=self.concurrency * 2
+        )
+
+        async def route(discovered: IPAddressDiscovered) -> None:
+            await (alive if discovered.is_alive else results).put(discovered)
+
+        async def probe(ip: str) -> IPAddressDiscovered:
+            if use_tcp:
+                ip_addr, is_alive, response_time, open_ports = await tcp_ping(
+                    ip, timeout=self.ping_timeout
+                )
+            else:
+                ip_addr, is_alive, response_time = await icmp_ping(
+                    ip, timeout=self.ping_timeout
+                )
+            return IPAddressDiscovered(
+                address=ip_addr,
+                is_alive=is_alive,
+                response_time_ms=response_time if is_alive else None,
+            )
+
+        async def probe_all() -> None:
+            ip_iter: Iterator[str] = iter(ips)
+
+            if not use_tcp:
+                # One ICMP datagram socket pings a whole chunk of IPs; only
+                # fall back to a ping subprocess per host when such sockets
+                # are not permitted, from whichever chunk that happens on.
+                while chunk := list(islice(ip_iter, ICMP_SWEEP_SIZE)):
+                    latencies = await icmp_sweep(chunk, timeout=self.ping_timeout)
+                    if latencies is None:
+                        ip_iter = chain(chunk, ip_iter)
+                        break
+                    for ip, latency in latencies.items():
+                        await route(
+                            IPAddressDiscovered(
+                                address=ip,
+                                is_alive=latency is not None,
+                                response_time_ms=latency,
+                            )
+                        )
                 else:
-                    ip_addr, is_alive, response_time = await icmp_ping(
-                        ip, timeout=self.ping_timeout
-                    )
+                    return
 
-                if is_alive:
-                    hostname = await resolve_hostname(ip)
-                    return IPAddressDiscovered(
-                        address=ip_addr,
-                        hostname=hostname,
-                        response_time_ms=response_time,
-                        is_alive=True,
-                    )
-                return IPAddressDiscovered(address=ip_addr, is_alive=False)
+            pending: asyncio.Queue[str | None] = asyncio.Queue(maxsize=self.concurrency * 2)
+
+            async def produce() -> None:
+                for ip in ip_iter:
+                    await pending.put(ip)
+                for _ in range(self.concurrency):
+                    await pending.put(None)
 
-        # Process all IPs concurrently (respecting semaphore limit)
-        tasks = [scan_with_limit(ip) for ip in ips]
-        for coro in asyncio.as_completed(tasks):
-            result = await coro
-            if result:
-                yield result
+            async def work() -> None:
+                while (ip := await pending.get()) is not None:
+                    await route(await probe(ip))
+
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(produce())
+                for _ in range(self.concurrency):
+                    tg.create_task(work())
+
+        async def probe_stage() -> None:
+            try:
+                await probe_all()
+            finally:
+                # Let the resolvers drain and exit even if probing failed
+                for _ in range(self.dns_concurrency):
+                    await alive.put(None)
+
+        async def resolve_stage() -> None:
+            while (discovered := await alive.get()) is not None:
+                discovered.hostname = await resolve_hostname(discovered.address, resolver)
+                await results.put(discovered)
+            await results.put(None)
+
+        prober = asyncio.create_task(probe_stage())
+        resolvers = [asyncio.create_task(resolve_stage()) for _ in range(self.dns_concurrency)]
+        try:
+            finished = 0
+            while finished < len(resolvers):
+                discovered = await results.get()
+                if discovered is None:
+                    finished += 1
+                    continue
+                yield discovered
+
+            # Surface a probing failure once everything it produced is out
+            await prober
+        finally:
+            for task in (prober, *resolvers):
+                task.cancel()
+            await asyncio.gather(prober, *resolvers, return_exceptions=True)
 
     async def run_quick_scan(
         self, cidr: str, scan_type: str = "ping"
@@ -598,14 +1030,12 @@ class ScannerService:
         Useful for ad-hoc scanning.
         """
         if scan_type == "nmap" and NMAP_AVAILABLE:
-            return await nmap_scan(cidr, scan_type="ping")
+            return [asdict(host) async for host in nmap_scan(cidr, scan_type="ping")]
         else:
             # Use built-in scanner
-            ip_network = IPNetwork(cidr)
-            all_ips = [str(ip) for ip in ip_network.iter_hosts()]
 
             results = []
-            async for discovered in self._scan_batch(all_ips, use_tcp=False):
+            async for discovered in self._scan_batch(iter_host_addresses(cidr), use_tcp=False):
                 if discovered.is_alive:
                     results.append({
                         "ip_address": discovered.address,
@@ -0,0 +1,62 @@
+"""Unit tests for batched ICMP echo sweeps."""
+import struct
+
+import pytest
+
+from ipam.services import icmp
+from ipam.services.icmp import (
+    ICMP_ECHO_REQUEST,
+    _checksum,
+    _echo_request,
+    icmp_sweep,
+    open_icmp_socket,
+)
+
+
+def icmp_available() -> bool:
+    sock = open_icmp_socket()
+    if sock is None:
+        return False
+    sock.close()
+    return True
+
+
+class TestEchoRequest:
+    """Test ICMP packet construction."""
+
+    def test_checksum_known_value(self):
+        # RFC 1071 worked example: 0001 f203 f4f5 f6f7 sums to ddf2
+        assert _checksum(bytes.fromhex("0001f203f4f5f6f7")) == 0xFFFF - 0xDDF2
+
+    def test_checksum_pads_odd_length(self):
+        assert _checksum(b"\x01") == _checksum(b"\x01\x00")
+
+    def test_echo_request_header_and_checksum(self):
+        packet = _echo_request(ident=0x1234, sequence=7)
+
+        icmp_type, code, _, ident, sequence = struct.unpack("!BBHHH", packet[:8])
+        assert (icmp_type, code, ident, sequence) == (ICMP_ECHO_REQUEST, 0, 0x1234, 7)
+        assert packet[8:] == icmp._PAYLOAD
+        # A packet carrying a valid checksum sums to zero
+        assert _checksum(packet) == 0
+
+
+class TestIcmpSweep:
+    """Test the datagram socket sweep."""
+
+    async def test_returns_none_without_icmp_socket(self, monkeypatch: pytest.MonkeyPatch):
+        """Callers fall back to subprocess pings when the socket is refused."""
+        monkeypatch.setattr(icmp, "open_icmp_socket", lambda: None)
+
+        assert await icmp_sweep(["127.0.0.1"]) is None
+
+    @pytest.mark.skipif(not icmp_available(), reason="ICMP datagram sockets not permitted")
+    async def test_loopback_replies_are_matched_per_address(self):
+        results = await icmp_sweep(["127.0.0.1", "127.0.0.2"], timeout=2.0)
+
+        assert set(results) == {"127.0.0.1", "127.0.0.2"}
+        assert all(rtt is not None and rtt >= 0 for rtt in results.values())
+
+    @pytest.mark.skipif(not icmp_available(), reason="ICMP datagram sockets not permitted")
+    async def test_empty_sweep(self):
+        assert await icmp_sweep([], timeout=0.1) == {}
@@ -0,0 +1,71 @@
+"""Unit tests for the ping scan pipeline."""
+import pytest
+
+from ipam.services import scanner
+from ipam.services.scanner import ScannerService
+
+
+@pytest.fixture
+def service(monkeypatch: pytest.MonkeyPatch) -> ScannerService:
+    async def no_hostname(ip: str, resolver=None) -> None:
+        return None
+
+    monkeypatch.setattr(scanner, "AIODNS_AVAILABLE", False)
+    monkeypatch.setattr(scanner, "resolve_hostname", no_hostname)
+    service = ScannerService()
+    service.concurrency = 2
+    service.dns_concurrency = 2
+    return service
+
+
+class TestScanBatch:
+    """Test ICMP sweeps and their subprocess fallback."""
+
+    async def test_sweep_failing_mid_scan_falls_back_for_remaining_ips(self, monkeypatch, service):
+        """Once sweeps stop working, every IP not yet swept is pinged one by one."""
+        ips = [f"10.0.0.{host}" for host in range(1, 8)]
+        swept: list[list[str]] = []
+        pinged: list[str] = []
+
+        async def icmp_sweep(chunk: list[str], timeout: float) -> dict[str, float | None] | None:
+            swept.append(chunk)
+            if len(swept) > 1:
+                return None
+            return dict.fromkeys(chunk, 1.0)
+
+        async def icmp_ping(ip: str, timeout: float) -> tuple[str, bool, float]:
+            pinged.append(ip)
+            return ip, True, 2.0
+
+        monkeypatch.setattr(scanner, "ICMP_SWEEP_SIZE", 3)
+        monkeypatch.setattr(scanner, "icmp_sweep", icmp_sweep)
+        monkeypatch.setattr(scanner, "icmp_ping", icmp_ping)
+
+        found = {host.address: host async for host in service._scan_batch(iter(ips))}
+
+        assert swept == [ips[:3], ips[3:6]]
+        assert sorted(pinged) == ips[3:]
+        assert sorted(found) == ips
+        assert all(found[ip].response_time_ms == 1.0 for ip in ips[:3])
+        assert all(found[ip].response_time_ms == 2.0 for ip in ips[3:])
+
+    async def test_sweeps_cover_every_chunk(self, monkeypatch, service):
+        ips = [f"10.0.0.{host}" for host in range(1, 8)]
+        swept: list[list[str]] = []
+
+        async def icmp_sweep(chunk: list[str], timeout: float) -> dict[str, float | None]:
+            swept.append(chunk)
+            return dict.fromkeys(chunk)
+
+        async def icmp_ping(ip: str, timeout: float):
+            raise AssertionError("no fallback expected")
+
+        monkeypatch.setattr(scanner, "ICMP_SWEEP_SIZE", 3)
+        monkeypatch.setattr(scanner, "icmp_sweep", icmp_sweep)
+        monkeypatch.setattr(scanner, "icmp_ping", icmp_ping)
+
+        found = [host async for host in service._scan_batch(iter(ips))]
+
+        assert swept == [ips[:3], ips[3:6], ips[6:]]
+        assert sorted(host.address for host in found) == ips
+        assert not any(host.is_alive for host in found)
@@ -0,0 +1,192 @@
+"""Unit tests for streaming nmap output parsing."""
+import asyncio
+import functools
+import ipaddress
+import sys
+
+import pytest
+
+from ipam.services import scanner
+from ipam.services.scanner import (
+    HostRecord,
+    PortRecord,
+    _feed_parser,
+    _GrepableParser,
+    _new_pull_parser,
+    _parse_nmap_grepable,
+    _parse_nmap_xml,
+    count_host_addresses,
+    iter_host_addresses,
+    nmap_scan,
+)
+
+NMAP_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE nmaprun>
+<nmaprun scanner="nmap" args="nmap -oX - -sT -sV 10.0.0.0/29" start="1700000000">
+<host starttime="1700000000" endtime="1700000001">
+<status state="up" reason="syn-ack"/>
+<address addr="10.0.0.1" addrtype="ipv4"/>
+<address addr="00:11:22:33:44:55" addrtype="mac" vendor="Acme"/>
+<hostnames><hostname name="gw.example.net" type="PTR"/></hostnames>
+<ports>
+<port protocol="tcp" portid="22"><state state="open"/><service name="ssh" product="OpenSSH" version="9.6"/></port>
+<port protocol="tcp" portid="23"><state state="closed"/><service name="telnet"/></port>
+<port protocol="udp" portid="161"><state state="open"/></port>
+</ports>
+<os><osmatch name="Linux 5.x" accuracy="98"/></os>
+<times srtt="1500" rttvar="200" to="100000"/>
+</host>
+<host><status state="down" reason="no-response"/><address addr="10.0.0.2" addrtype="ipv4"/></host>
+<host><status state="up" reason="echo-reply"/><address addr="10.0.0.3" addrtype="ipv4"/><hostnames/></host>
+<runstats><finished time="1700000002"/><hosts up="2" down="1" total="3"/></runstats>
+</nmaprun>
+"""
+
+EXPECTED_XML_HOSTS = [
+    HostRecord(
+        ip_address="10.0.0.1",
+        hostname="gw.example.net",
+        mac_address="00:11:22:33:44:55",
+        vendor="Acme",
+        latency_ms=1.5,
+        open_ports=[
+            PortRecord(port=22, protocol="tcp", service="ssh", product="OpenSSH", version="9.6"),
+            PortRecord(port=161, protocol="udp"),
+        ],
+        os_guess="Linux 5.x",
+    ),
+    HostRecord(ip_address="10.0.0.3"),
+]
+
+NMAP_GREPABLE = b"""# Nmap 7.94 scan initiated as: nmap -oG - -sn 10.0.0.0/29
+Host: 10.0.0.1 (gw.example.net)\tStatus: Up
+Host: 10.0.0.1 (gw.example.net)\tPorts: 22/open/tcp//ssh//OpenSSH 9.6/, 23/closed/tcp//telnet///\tIgnored State: filtered (998)
+Host: 10.0.0.2 ()\tStatus: Down
+Host: 10.0.0.4 ()\tStatus: Up
+# Nmap done at Tue Nov 14 22:13:22 2023 -- 8 IP addresses (2 hosts up) scanned in 1.20 seconds
+"""
+
+EXPECTED_GREPABLE_HOSTS = [
+    HostRecord(
+        ip_address="10.0.0.1",
+        hostname="gw.example.net",
+        open_ports=[PortRecord(port=22, protocol="tcp", service="ssh", version="OpenSSH 9.6")],
+    ),
+    HostRecord(ip_address="10.0.0.4"),
+]
+
+
+def chunks(data: bytes, size: int) -> list[bytes]:
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+class TestXmlPullParser:
+    """Test incremental parsing of nmap XML output."""
+
+    def test_whole_document(self):
+        """Only up hosts are returned, with only their open ports."""
+        assert _parse_nmap_xml(NMAP_XML.decode()) == EXPECTED_XML_HOSTS
+
+    def test_invalid_document_yields_no_hosts(self):
+        assert _parse_nmap_xml("<nmaprun><host></nmaprun>") == []
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 4096])
+    def test_chunked_feed_matches_whole_document(self, size: int):
+        """Hosts come out complete however the pipe splits the output."""
+        parser = _new_pull_parser()
+        hosts = []
+        for chunk in chunks(NMAP_XML, size):
+            hosts.extend(_feed_parser(parser, chunk))
+
+        assert hosts == EXPECTED_XML_HOSTS
+
+    def test_hosts_stream_before_document_ends(self):
+        """A host is yielded as soon as its closing tag arrives."""
+        parser = _new_pull_parser()
+        first_host_end = NMAP_XML.index(b"</host>") + len(b"</host>")
+
+        assert _feed_parser(parser, NMAP_XML[:first_host_end]) == EXPECTED_XML_HOSTS[:1]
+
+
+class TestGrepableParser:
+    """Test incremental parsing of nmap grepable output."""
+
+    def test_whole_output(self):
+        assert _parse_nmap_grepable(NMAP_GREPABLE.decode()) == EXPECTED_GREPABLE_HOSTS
+
+    @pytest.mark.parametrize("size", [1, 5, 33, 4096])
+    def test_chunked_feed_matches_whole_output(self, size: int):
+        parser = _GrepableParser()
+        hosts = []
+        for chunk in chunks(NMAP_GREPABLE, size):
+            hosts.extend(_feed_parser(parser, chunk))
+        hosts.extend(parser.close())
+
+        assert hosts == EXPECTED_GREPABLE_HOSTS
+
+    def test_last_host_flushed_without_trailing_newline(self):
+        parser = _GrepableParser()
+
+        assert parser.feed(b"Host: 10.0.0.9 ()\tStatus: Up") == []
+        assert parser.close() == [HostRecord(ip_address="10.0.0.9")]
+
+    def test_crlf_line_endings(self):
+        output = NMAP_GREPABLE.replace(b"\n", b"\r\n").decode()
+
+        assert _parse_nmap_grepable(output) == EXPECTED_GREPABLE_HOSTS
+
+
+class TestHostAddresses:
+    """Test host enumeration and counting agree for every prefix size."""
+
+    @pytest.mark.parametrize(
+        ("cidr", "expected"),
+        [
+            ("10.0.0.0/24", 254),
+            ("10.0.0.0/30", 2),
+            ("10.0.0.0/31", 2),
+            ("10.0.0.5/32", 1),
+            ("2001:db8::/126", 3),
+            ("2001:db8::1/128", 1),
+        ],
+    )
+    def test_count_matches_enumeration(self, cidr: str, expected: int):
+        assert count_host_addresses(cidr) == expected
+        assert sum(1 for _ in iter_host_addresses(cidr)) == expected
+
+    def test_ipv4_matches_stdlib_hosts(self):
+        """The integer fast path yields the same addresses as ipaddress."""
+        network = ipaddress.ip_network("10.0.4.0/22")
+
+        assert list(iter_host_addresses("10.0.5.17/22")) == [str(ip) for ip in network.hosts()]
+
+    def test_point_to_point_and_single_host(self):
+        assert list(iter_host_addresses("10.0.0.0/31")) == ["10.0.0.0", "10.0.0.1"]
+        assert list(iter_host_addresses("10.0.0.5/32")) == ["10.0.0.5"]
+
+
+class TestNmapScan:
+    """Test nmap_scan subprocess handling."""
+
+    async def test_parse_error_kills_nmap_instead_of_hanging(self, monkeypatch: pytest.MonkeyPatch):
+        """nmap writing invalid XML into a pipe nobody reads must not hang the scan."""
+        script = (
+            "import sys, time\n"
+            "sys.stdout.write('<nmaprun><host></nmaprun>' + 'x' * (1 << 20))\n"
+            "time.sleep(60)\n"
+        )
+        monkeypatch.setattr(scanner, "NMAP_AVAILABLE", True)
+        monkeypatch.setattr(scanner, "_NMAP_TUNING_ARGS", ())
+        monkeypatch.setattr(scanner, "_NMAP_CMD_TEMPLATES", {"ping": (sys.executable, "-c", script)})
+        # A tiny buffer limit pauses the pipe as soon as output goes unread
+        monkeypatch.setattr(
+            asyncio,
+            "create_subprocess_exec",
+            functools.partial(asyncio.create_subprocess_exec, limit=1),
+        )
+
+        async def consume() -> list[HostRecord]:
+            return [host async for host in nmap_scan("10.0.0.0/29", timeout=60)]
+
+        with pytest.raises(RuntimeError, match="invalid XML"):
+            await asyncio.wait_for(consume(), timeout=10)
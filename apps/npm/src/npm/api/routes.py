@@ -1,24 +1,33 @@
 """NPM API routes."""
 
+import hashlib
 from datetime import datetime, timezone, timedelta
-from math import ceil
-from typing import Annotated
+from typing import Annotated, AsyncIterator, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from asyncpg import Connection
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 
 from ..core.auth import JWTPayload, get_current_user, require_operator, require_admin
+from ..core.cache import (
+    DASHBOARD_CACHE_KEY, DASHBOARD_STATS_CACHE_KEY,
+    alert_cache_key, alert_rule_cache_key, cache_get, cache_set, cache_delete,
+)
+from ..core.config import settings
 from ..services.device import DeviceService
 from ..services.metrics import MetricsService
-from ..db import get_db, AlertRepository, AlertRuleRepository
+from ..db import get_connection, get_db, transaction, AlertRepository, AlertRuleRepository
 from ..models.device import Device, DeviceCreate, DeviceUpdate, DeviceWithInterfaces, DeviceStatus
 from ..models.interface import Interface, InterfaceUpdate
 from ..models.alert import (
     Alert, AlertCreate, AlertUpdate, AlertStatus, AlertSeverity,
-    AlertRule, AlertRuleCreate, AlertRuleUpdate, AlertWithContext
+    AlertRule, AlertRuleCreate, AlertRuleUpdate, AlertWithContext, AlertBulkAcknowledge
 )
 from ..models.metrics import DashboardData, DashboardStats, MetricSeries
 from ..models.common import PaginatedResponse, APIResponse, Pagination
 
+# Handlers wrap already-typed repository/service models, so response envelopes
+# are built with model_construct instead of re-validating their contents
 router = APIRouter(prefix="/api/v1/npm", tags=["NPM"])
 
 # Service instances
@@ -26,6 +35,19 @@ device_service = DeviceService()
 metrics_service = MetricsService()
 
 
+def _etag(payload: str) -> str:
+    """Weak ETag for a serialized entity."""
+    return f'W/"{hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against an ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (tag.strip() for tag in header.split(","))
+
+
 # ============================================
 # Device endpoints
 # ============================================
@@ -57,7 +79,7 @@ async def get_device(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Device {device_id} not found",
         )
-    return APIResponse(data=device)
+    return APIResponse.model_construct(data=device)
 
 
 @router.post("/devices", response_model=APIResponse[Device], status_code=status.HTTP_201_CREATED)
@@ -68,7 +90,7 @@ async def create_device(
     """Create a new device (requires operator role)."""
     try:
         device = await device_service.create_device(data)
-        return APIResponse(data=device, message="Device created successfully")
+        return APIResponse.model_construct(data=device, message="Device created successfully")
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,7 +112,7 @@ async def update_device(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Device {device_id} not found",
             )
-        return APIResponse(data=device, message="Device updated successfully")
+        return APIResponse.model_construct(data=device, message="Device updated successfully")
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -123,7 +145,7 @@ async def get_device_interfaces(
 ) -> APIResponse[list[Interface]]:
     """Get all interfaces for a device."""
     interfaces = await device_service.get_device_interfaces(device_id)
-    return APIResponse(data=interfaces)
+    return APIResponse.model_construct(data=interfaces)
 
 
 @router.put("/interfaces/{interface_id}", response_model=APIResponse[Interface])
@@ -139,7 +161,7 @@ async def update_interface(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Interface {interface_id} not found",
         )
-    return APIResponse(data=interface, message="Interface updated successfully")
+    return APIResponse.model_construct(data=interface, message="Interface updated successfully")
 
 
 # ============================================
@@ -157,7 +179,7 @@ async def get_device_metrics(
     end = datetime.now(timezone.utc)
     start = end - timedelta(hours=hours)
     metrics = await metrics_service.get_device_metrics(device_id, start, end, step)
-    return APIResponse(data=metrics)
+    return APIResponse.model_construct(data=metrics)
 
 
 @router.get("/interfaces/{interface_id}/metrics", response_model=APIResponse[dict[str, MetricSeries]])
@@ -171,59 +193,150 @@ async def get_interface_metrics(
     end = datetime.now(timezone.utc)
     start = end - timedelta(hours=hours)
     metrics = await metrics_service.get_interface_metrics(interface_id, start, end, step)
-    return APIResponse(data=metrics)
+    return APIResponse.model_construct(data=metrics)
 
 
 # ============================================
 # Alert endpoints
 # ============================================
 
-@router.get("/alerts", response_model=PaginatedResponse[Alert])
+@router.get("/alerts", response_model=PaginatedResponse[AlertWithContext])
 async def list_alerts(
     page: Annotated[int, Query(ge=1)] = 1,
     limit: Annotated[int, Query(ge=1, le=100)] = 20,
     status: AlertStatus | None = None,
     severity: AlertSeverity | None = None,
     device_id: str | None = None,
+    format: Literal["json", "ndjson"] = "json",
     _user: JWTPayload = Depends(get_current_user),
-) -> PaginatedResponse[Alert]:
-    """List all alerts with pagination and optional filters."""
+) -> PaginatedResponse[AlertWithContext] | StreamingResponse:
+    """
+    List all alerts with device, interface and rule names, paginated and filtered.
+
+    With ``format=ndjson`` the page is streamed one alert per line and the
+    pagination metadata moves to the X-Total-Count and X-Pages headers.
+    """
+    if format == "ndjson":
+        # The stream acquires its own connection, so holding a second one
+        # here would take two pool slots per request
+        return await _stream_alerts(page, limit, status, severity, device_id)
+
     async with get_db() as conn:
-        repo = AlertRepository(conn)
-        alerts, total = await repo.find_all(
+        alerts, total = await AlertRepository(conn).find_all_with_context(
             page=page,
             limit=limit,
             status=status,
-            severity=severity.value if severity else None,
+            severity=severity,
             device_id=device_id,
         )
 
-        return PaginatedResponse(
-            data=alerts,
-            pagination=Pagination(
-                page=page,
-                limit=limit,
-                total=total,
-                pages=ceil(total / limit) if total > 0 else 0,
-            ),
-        )
+    return PaginatedResponse.model_construct(
+        data=alerts,
+        pagination=Pagination.model_construct(
+            page=page,
+            limit=limit,
+            total=total,
+            pages=(total + limit - 1) // limit,
+        ),
+    )
+
+
+async def _stream_alerts(
+    page: int,
+    limit: int,
+    status: AlertStatus | None,
+    severity: AlertSeverity | None,
+    device_id: str | None,
+) -> StreamingResponse:
+    """Stream an alert page as NDJSON from a server-side cursor."""
+
+    async def rows() -> AsyncIterator[tuple[AlertWithContext | None, int]]:
+        # The cursor needs its own connection and transaction that outlive
+        # the handler, for as long as the response body is being sent
+        async with transaction() as stream_conn:
+            repo = AlertRepository(stream_conn)
+            empty = True
+            async for item in repo.iter_with_context(page, limit, status, severity, device_id):
+                empty = False
+                yield item
+            if empty and page > 1:
+                # Past the last page no row carries the total, so count it
+                yield None, await repo.count(status, severity, device_id)
+
+    stream = rows()
+    try:
+        # The first row carries the window total needed for the headers
+        first = await anext(stream, None)
+    except BaseException:
+        await stream.aclose()
+        raise
+    total = first[1] if first is not None else 0
+
+    async def body() -> AsyncIterator[bytes]:
+        try:
+            if first is not None and first[0] is not None:
+                yield first[0].model_dump_json().encode() + b"\n"
+                async for alert, _ in stream:
+                    yield alert.model_dump_json().encode() + b"\n"
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Total-Count": str(total),
+            "X-Pages": str((total + limit - 1) // limit),
+        },
+    )
 
 
 @router.get("/alerts/{alert_id}", response_model=APIResponse[Alert])
 async def get_alert(
     alert_id: str,
+    request: Request,
+    response: Response,
     _user: JWTPayload = Depends(get_current_user),
-) -> APIResponse[Alert]:
-    """Get an alert by ID."""
-    async with get_db() as conn:
-        repo = AlertRepository(conn)
-        alert = await repo.find_by_id(alert_id)
+) -> APIResponse[Alert] | Response:
+    """Get an alert by ID (304 when If-None-Match matches its ETag)."""
+    cache_key = alert_cache_key(alert_id)
+    alert: Alert | None = None
+    payload = await cache_get(cache_key)
+    if payload is None:
+        # Only a cache miss needs a pooled connection
+        async with get_db() as conn:
+            alert = await AlertRepository(conn).find_by_id(alert_id)
         if not alert:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Alert {alert_id} not found",
             )
-        return APIResponse(data=alert)
+        payload = alert.model_dump_json()
+        await cache_set(cache_key, payload, settings.entity_cache_ttl)
+
+    etag = _etag(payload)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return APIResponse.model_construct(data=alert or Alert.model_validate_json(payload))
+
+
+@router.post("/alerts/acknowledge", response_model=APIResponse[list[Alert]])
+async def acknowledge_alerts(
+    data: AlertBulkAcknowledge,
+    user: JWTPayload = Depends(require_operator),
+) -> APIResponse[list[Alert]]:
+    """Acknowledge several alerts at once (requires operator role)."""
+    try:
+        alerts = await device_service.acknowledge_alerts(data.ids, user.sub)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return APIResponse.model_construct(
+        data=alerts, message=f"{len(alerts)} alert(s) acknowledged"
+    )
 
 
 @router.post("/alerts/{alert_id}/acknowledge", response_model=APIResponse[Alert])
@@ -238,7 +351,7 @@ async def acknowledge_alert(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Alert {alert_id} not found",
         )
-    return APIResponse(data=alert, message="Alert acknowledged")
+    return APIResponse.model_construct(data=alert, message="Alert acknowledged")
 
 
 @router.post("/alerts/{alert_id}/resolve", response_model=APIResponse[Alert])
@@ -253,7 +366,7 @@ async def resolve_alert(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Alert {alert_id} not found",
         )
-    return APIResponse(data=alert, message="Alert resolved")
+    return APIResponse.model_construct(data=alert, message="Alert resolved")
 
 
 # ============================================
@@ -264,41 +377,53 @@ async def resolve_alert(
 async def list_alert_rules(
     is_active: bool | None = None,
     _user: JWTPayload = Depends(get_current_user),
+    conn: Connection = Depends(get_connection),
 ) -> APIResponse[list[AlertRule]]:
     """List all alert rules."""
-    async with get_db() as conn:
-        repo = AlertRuleRepository(conn)
-        rules = await repo.find_all(is_active=is_active)
-        return APIResponse(data=rules)
+    repo = AlertRuleRepository(conn)
+    rules = await repo.find_all(is_active=is_active)
+    return APIResponse.model_construct(data=rules)
 
 
 @router.get("/alert-rules/{rule_id}", response_model=APIResponse[AlertRule])
 async def get_alert_rule(
     rule_id: str,
+    request: Request,
+    response: Response,
     _user: JWTPayload = Depends(get_current_user),
-) -> APIResponse[AlertRule]:
-    """Get an alert rule by ID."""
-    async with get_db() as conn:
-        repo = AlertRuleRepository(conn)
-        rule = await repo.find_by_id(rule_id)
+) -> APIResponse[AlertRule] | Response:
+    """Get an alert rule by ID (304 when If-None-Match matches its ETag)."""
+    cache_key = alert_rule_cache_key(rule_id)
+    rule: AlertRule | None = None
+    payload = await cache_get(cache_key)
+    if payload is None:
+        async with get_db() as conn:
+            rule = await AlertRuleRepository(conn).find_by_id(rule_id)
         if not rule:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Alert rule {rule_id} not found",
             )
-        return APIResponse(data=rule)
+        payload = rule.model_dump_json()
+        await cache_set(cache_key, payload, settings.entity_cache_ttl)
+
+    etag = _etag(payload)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return APIResponse.model_construct(data=rule or AlertRule.model_validate_json(payload))
 
 
 @router.post("/alert-rules", response_model=APIResponse[AlertRule], status_code=status.HTTP_201_CREATED)
 async def create_alert_rule(
     data: AlertRuleCreate,
     user: JWTPayload = Depends(require_operator),
+    conn: Connection = Depends(get_connection),
 ) -> APIResponse[AlertRule]:
     """Create a new alert rule (requires operator role)."""
-    async with get_db() as conn:
-        repo = AlertRuleRepository(conn)
-        rule = await repo.create(data, created_by=user.sub)
-        return APIResponse(data=rule, message="Alert rule created successfully")
+    repo = AlertRuleRepository(conn)
+    rule = await repo.create(data, created_by=user.sub)
+    return APIResponse.model_construct(data=rule, message="Alert rule created successfully")
 
 
 @router.put("/alert-rules/{rule_id}", response_model=APIResponse[AlertRule])
@@ -306,33 +431,35 @@ async def update_alert_rule(
     rule_id: str,
     data: AlertRuleUpdate,
     _user: JWTPayload = Depends(require_operator),
+    conn: Connection = Depends(get_connection),
 ) -> APIResponse[AlertRule]:
     """Update an existing alert rule (requires operator role)."""
-    async with get_db() as conn:
-        repo = AlertRuleRepository(conn)
-        rule = await repo.update(rule_id, data)
-        if not rule:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Alert rule {rule_id} not found",
-            )
-        return APIResponse(data=rule, message="Alert rule updated successfully")
+    repo = AlertRuleRepository(conn)
+    rule = await repo.update(rule_id, data)
+    await cache_delete(alert_rule_cache_key(rule_id))
+    if not rule:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert rule {rule_id} not found",
+        )
+    return APIResponse.model_construct(data=rule, message="Alert rule updated successfully")
 
 
 @router.delete("/alert-rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_alert_rule(
     rule_id: str,
     _user: JWTPayload = Depends(require_admin),
+    conn: Connection = Depends(get_connection),
 ) -> None:
     """Delete an alert rule (requires admin role)."""
-    async with get_db() as conn:
-        repo = AlertRuleRepository(conn)
-        deleted = await repo.delete(rule_id)
-        if not deleted:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Alert rule {rule_id} not found",
-            )
+    repo = AlertRuleRepository(conn)
+    deleted = await repo.delete(rule_id)
+    await cache_delete(alert_rule_cache_key(rule_id))
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Alert rule {rule_id} not found",
+        )
 
 
 # ============================================
@@ -343,15 +470,25 @@ async def delete_alert_rule(
 async def get_dashboard(
     _user: JWTPayload = Depends(get_current_user),
 ) -> APIResponse[DashboardData]:
-    """Get NPM dashboard data."""
+    """Get NPM dashboard data (cached for DASHBOARD_CACHE_TTL seconds)."""
+    cached = await cache_get(DASHBOARD_CACHE_KEY)
+    if cached is not None:
+        return APIResponse.model_construct(data=DashboardData.model_validate_json(cached))
+
     data = await metrics_service.get_dashboard_data()
-    return APIResponse(data=data)
+    await cache_set(DASHBOARD_CACHE_KEY, data.model_dump_json(), settings.dashboard_cache_ttl)
+    return APIResponse.model_construct(data=data)
 
 
 @router.get("/dashboard/stats", response_model=APIResponse[DashboardStats])
 async def get_dashboard_stats(
     _user: JWTPayload = Depends(get_current_user),
 ) -> APIResponse[DashboardStats]:
-    """Get NPM dashboard statistics."""
+    """Get NPM dashboard statistics (cached for DASHBOARD_CACHE_TTL seconds)."""
+    cached = await cache_get(DASHBOARD_STATS_CACHE_KEY)
+    if cached is not None:
+        return APIResponse.model_construct(data=DashboardStats.model_validate_json(cached))
+
     stats = await metrics_service.get_dashboard_stats()
-    return APIResponse(data=stats)
+    await cache_set(DASHBOARD_STATS_CACHE_KEY, stats.model_dump_json(), settings.dashboard_cache_ttl)
+    return APIResponse.model_construct(data=stats)
@@ -4,15 +4,20 @@ NPM Network Discovery Collector
 Scans networks to discover devices using ICMP ping and SNMPv3 queries.
 """
 
+import array
 import asyncio
 import ipaddress
+import math
 import struct
 import socket
+import sys
 import time
 from dataclasses import dataclass
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 from datetime import datetime
 import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
 from pysnmp.hlapi.v3arch.asyncio import (
     SnmpEngine,
     CommunityData,
@@ -33,9 +38,18 @@ from pysnmp.hlapi.v3arch.asyncio import (
     usmNoPrivProtocol,
     usmNoAuthProtocol,
 )
+from pyasn1.type.univ import Integer, Null, OctetString
+
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:  # fall back to the default asyncio event loop
+    UVLOOP_AVAILABLE = False
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 import os
+import re
 
 from ..core.config import settings
 from ..core.logging import get_logger
@@ -53,6 +67,9 @@ SNMP_OIDS = {
     "ifNumber": "1.3.6.1.2.1.2.1.0",  # Number of interfaces
 }
 
+# Requested together in one PDU; pysnmp resolves each ObjectType once and reuses it
+_SYSTEM_INFO_OBJECTS = tuple(ObjectType(ObjectIdentity(oid)) for oid in SNMP_OIDS.values())
+
 # Auth protocol mapping
 AUTH_PROTOCOLS = {
     "sha": usmHMACSHAAuthProtocol,
@@ -65,14 +82,26 @@ AUTH_PROTOCOLS = {
 
 # Privacy protocol mapping
 PRIV_PROTOCOLS = {
+    "aes": usmAesCfb128Protocol,
     "aes-128": usmAesCfb128Protocol,
     "aes-192": usmAesCfb192Protocol,
     "aes-256": usmAesCfb256Protocol,
     "none": usmNoPrivProtocol,
 }
 
+# Linux value; older Pythons do not expose socket.IP_RECVTTL
+_IP_RECVTTL = getattr(socket, "IP_RECVTTL", 12)
+_TTL_CMSG_SPACE = socket.CMSG_SPACE(4)
+
+# ping output is ASCII, so the fallback parses it as bytes without decoding
+_PING_TIME_RE = re.compile(rb'time=(\d+\.?\d*)')
+_PING_TTL_RE = re.compile(rb'ttl=(\d+)', re.IGNORECASE)
+
+# ICMP checksums sum big-endian 16-bit words
+_LITTLE_ENDIAN = sys.byteorder == "little"
 
-@dataclass
+
+@dataclass(slots=True)
 class DiscoveredHost:
     """Represents a discovered host."""
     ip_address: str
@@ -84,6 +113,7 @@ class DiscoveredHost:
     os_family: Optional[str] = None
     sys_name: Optional[str] = None
     sys_description: Optional[str] = None
+    sys_object_id: Optional[str] = None
     sys_contact: Optional[str] = None
     sys_location: Optional[str] = None
     icmp_reachable: bool = False
@@ -97,7 +127,7 @@ class DiscoveredHost:
     fingerprint_confidence: str = "low"
 
 
-@dataclass
+@dataclass(slots=True)
 class SNMPv3Credential:
     """SNMPv3 credential data."""
     username: str
@@ -108,13 +138,16 @@ class SNMPv3Credential:
     priv_password: Optional[str]
 
 
-def decrypt_password(encrypted_data: str, encryption_key: bytes) -> str:
-    """Decrypt an AES-GCM encrypted password."""
+def decrypt_password(encrypted_data: str, aesgcm: AESGCM) -> str:
+    """
+    Decrypt an AES-GCM encrypted password.
+
+    Takes a long-lived AESGCM so the key schedule is built once per collector.
+    """
     try:
         data = base64.b64decode(encrypted_data)
         nonce = data[:12]
         ciphertext = data[12:]
-        aesgcm = AESGCM(encryption_key)
         plaintext = aesgcm.decrypt(nonce, ciphertext, None)
         return plaintext.decode("utf-8")
     except Exception as e:
@@ -123,21 +156,47 @@ def decrypt_password(encrypted_data: str, encryption_key: bytes) -> str:
 
 
 class ICMPPinger:
-    """ICMP ping implementation using raw sockets."""
+    """
+    ICMP ping over one shared unprivileged datagram socket.
+
+    Linux allows ICMP echo over ``SOCK_DGRAM`` sockets for groups listed in
+    ``net.ipv4.ping_group_range``. Every concurrent ``ping`` call sends from the
+    same socket and a single reader demultiplexes replies by (address, sequence),
+    so a sweep costs one socket instead of a ``ping`` process per host. Falls back
+    to the ``ping`` binary when the socket cannot be opened.
+    """
 
     ICMP_ECHO_REQUEST = 8
+    ICMP_ECHO_REPLY = 0
 
     def __init__(self, timeout: float = 2.0):
         self.timeout = timeout
         self.sequence = 0
+        self.ident = os.getpid() & 0xffff
+        # Echo request with checksum and sequence left zero; _create_packet
+        # fills those two fields in place for each ping
+        self._template = bytearray(
+            struct.pack('!BBHHH', self.ICMP_ECHO_REQUEST, 0, 0, self.ident, 0) + b'GridWatch' * 4
+        )
+        # ping -W takes milliseconds on macOS and whole seconds on Linux, where
+        # BusyBox ping rejects fractions; rounding up never yields -W 0 (no
+        # timeout), and _ping_subprocess enforces the exact deadline itself
+        if sys.platform == "darwin":
+            self._ping_wait = str(max(1, round(timeout * 1000)))
+        else:
+            self._ping_wait = str(max(1, math.ceil(timeout)))
+        self._sock: Optional[socket.socket] = None
+        self._socket_unavailable = False
+        self._pending: dict[tuple[str, int], tuple[float, asyncio.Future]] = {}
 
     def _checksum(self, data: bytes) -> int:
         """Calculate ICMP checksum."""
         if len(data) % 2:
             data += b'\x00'
-        total = 0
-        for i in range(0, len(data), 2):
-            total += (data[i] << 8) + data[i + 1]
+        words = array.array('H', data)
+        if _LITTLE_ENDIAN:
+            words.byteswap()
+        total = sum(words)
         total = (total >> 16) + (total & 0xffff)
         total += total >> 16
         return ~total & 0xffff
@@ -145,36 +204,117 @@ class ICMPPinger:
     def _create_packet(self) -> bytes:
         """Create ICMP echo request packet."""
         self.sequence = (self.sequence + 1) & 0xffff
-        header = struct.pack('!BBHHH', self.ICMP_ECHO_REQUEST, 0, 0, os.getpid() & 0xffff, self.sequence)
-        data = b'GridWatch' * 4
-        checksum = self._checksum(header + data)
-        header = struct.pack('!BBHHH', self.ICMP_ECHO_REQUEST, 0, checksum, os.getpid() & 0xffff, self.sequence)
-        return header + data
+        packet = self._template
+        struct.pack_into('!H', packet, 2, 0)
+        struct.pack_into('!H', packet, 6, self.sequence)
+        struct.pack_into('!H', packet, 2, self._checksum(packet))
+        return bytes(packet)
+
+    def _get_socket(self) -> Optional[socket.socket]:
+        """Open the shared ICMP socket on first use, or None if not permitted."""
+        if self._sock is not None or self._socket_unavailable:
+            return self._sock
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+        except (AttributeError, OSError) as e:
+            self._socket_unavailable = True
+            logger.info("icmp_socket_unavailable", error=str(e))
+            return None
+        sock.setblocking(False)
+        try:
+            # Datagram sockets strip the IP header; ask for the TTL as ancillary data
+            sock.setsockopt(socket.IPPROTO_IP, _IP_RECVTTL, 1)
+        except OSError:
+            pass
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+        self._sock = sock
+        return sock
+
+    def _on_readable(self) -> None:
+        """Drain echo replies and resolve the matching ping futures."""
+        while True:
+            try:
+                packet, ancdata, _, (addr, _) = self._sock.recvmsg(1500, _TTL_CMSG_SPACE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                continue
+            received = time.perf_counter()
+            if len(packet) < 8 or packet[0] != self.ICMP_ECHO_REPLY:
+                continue
+            # The kernel rewrites the identifier to the socket's port, so match on sequence
+            waiter = self._pending.pop((addr, (packet[6] << 8) | packet[7]), None)
+            if waiter is None:
+                continue
+            sent, future = waiter
+            if future.done():
+                continue
+            ttl = None
+            for level, kind, value in ancdata:
+                if level == socket.IPPROTO_IP and kind == socket.IP_TTL and len(value) >= 4:
+                    ttl = int.from_bytes(value[:4], sys.byteorder)
+            future.set_result((True, round((received - sent) * 1000, 3), ttl))
+
+    def close(self) -> None:
+        """Close the shared ICMP socket."""
+        if self._sock is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        self._pending.clear()
 
     async def ping(self, ip: str) -> tuple[bool, Optional[float], Optional[int]]:
         """Ping a host and return (reachable, latency_ms, ttl)."""
+        sock = self._get_socket()
+        if sock is None:
+            return await self._ping_subprocess(ip)
+
+        loop = asyncio.get_running_loop()
+        packet = self._create_packet()
+        key = (ip, self.sequence)
+        future = loop.create_future()
+        self._pending[key] = (time.perf_counter(), future)
+        try:
+            try:
+                sock.sendto(packet, (ip, 0))
+            except (BlockingIOError, InterruptedError):
+                await loop.sock_sendto(sock, packet, (ip, 0))
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            return False, None, None
+        except OSError as e:
+            logger.debug("ping_error", ip=ip, error=str(e))
+            return False, None, None
+        finally:
+            self._pending.pop(key, None)
+
+    async def _ping_subprocess(self, ip: str) -> tuple[bool, Optional[float], Optional[int]]:
+        """Ping a host with the ``ping`` binary."""
         try:
-            # Use subprocess for ping since raw sockets require root
             proc = await asyncio.create_subprocess_exec(
-                'ping', '-c', '1', '-W', str(int(self.timeout)), ip,
+                'ping', '-c', '1', '-W', self._ping_wait, ip,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE
             )
             start = time.time()
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=self.timeout + 1)
+            # Small margin for process startup; -W may be rounded up past this
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=self.timeout + 0.5)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise
             elapsed = (time.time() - start) * 1000
 
             if proc.returncode == 0:
                 # Parse actual RTT and TTL from output if available
-                output = stdout.decode()
-                import re
                 ttl = None
-                if 'time=' in output:
-                    match = re.search(r'time=(\d+\.?\d*)', output)
-                    if match:
-                        elapsed = float(match.group(1))
+                match = _PING_TIME_RE.search(stdout)
+                if match:
+                    elapsed = float(match.group(1))
                 # Extract TTL value (varies by OS output format)
-                ttl_match = re.search(r'ttl=(\d+)', output, re.IGNORECASE)
+                ttl_match = _PING_TTL_RE.search(stdout)
                 if ttl_match:
                     ttl = int(ttl_match.group(1))
                 return True, round(elapsed, 3), ttl
@@ -186,65 +326,86 @@ class ICMPPinger:
             return False, None, None
 
 
+def _snmp_value(value) -> int | str:
+    """Convert an SNMP value to a native type without pysnmp's pretty-printer."""
+    if isinstance(value, Integer):
+        # Integer32, Counter32, Gauge32 and TimeTicks all derive from Integer
+        return int(value)
+    if isinstance(value, OctetString):
+        return bytes(value).decode("utf-8", "replace")
+    return value.prettyPrint()
+
+
 class SNMPv3Scanner:
     """SNMPv3 scanner for device discovery."""
 
-    def __init__(self, credential: SNMPv3Credential, timeout: float = 5.0, retries: int = 2):
+    def __init__(
+        self,
+        credential: SNMPv3Credential,
+        timeout: float = 5.0,
+        retries: int = 2,
+        engine: Optional[SnmpEngine] = None,
+    ):
         self.credential = credential
         self.timeout = timeout
         self.retries = retries
-        self.engine = SnmpEngine()
+        # Share the collector's engine so localized USM keys and discovered
+        # engine IDs stay cached across jobs
+        self.engine = engine or SnmpEngine()
+        self._user_data = self._build_user_data(credential)
 
-    def _get_user_data(self) -> UsmUserData:
+    @staticmethod
+    def _build_user_data(credential: SNMPv3Credential) -> UsmUserData:
         """Create USM user data from credential."""
-        auth_proto = AUTH_PROTOCOLS.get(
-            self.credential.auth_protocol.lower() if self.credential.auth_protocol else "none",
-            usmNoAuthProtocol
-        )
-        priv_proto = PRIV_PROTOCOLS.get(
-            self.credential.priv_protocol.lower() if self.credential.priv_protocol else "none",
-            usmNoPrivProtocol
-        )
+        if credential.security_level == "noAuthNoPriv":
+            return UsmUserData(credential.username)
 
-        if self.credential.security_level == "noAuthNoPriv":
-            return UsmUserData(self.credential.username)
-        elif self.credential.security_level == "authNoPriv":
+        auth_proto = AUTH_PROTOCOLS.get((credential.auth_protocol or "none").lower(), usmNoAuthProtocol)
+        if credential.security_level == "authNoPriv":
             return UsmUserData(
-                self.credential.username,
-                authKey=self.credential.auth_password,
+                credential.username,
+                authKey=credential.auth_password,
                 authProtocol=auth_proto
             )
-        else:  # authPriv
-            return UsmUserData(
-                self.credential.username,
-                authKey=self.credential.auth_password,
-                authProtocol=auth_proto,
-                privKey=self.credential.priv_password,
-                privProtocol=priv_proto
-            )
+
+        # authPriv
+        priv_proto = PRIV_PROTOCOLS.get((credential.priv_protocol or "none").lower(), usmNoPrivProtocol)
+        return UsmUserData(
+            credential.username,
+            authKey=credential.auth_password,
+            authProtocol=auth_proto,
+            privKey=credential.priv_password,
+            privProtocol=priv_proto
+        )
+
+    def _get_user_data(self) -> UsmUserData:
+        """USM user data, resolved once when the scanner is created."""
+        return self._user_data
 
     async def get_system_info(self, ip: str, port: int = 161) -> Optional[dict]:
         """Get system information via SNMPv3."""
         try:
-            user_data = self._get_user_data()
             target = await UdpTransportTarget.create((ip, port), timeout=self.timeout, retries=self.retries)
 
-            results = {}
-            for name, oid in SNMP_OIDS.items():
-                error_indication, error_status, error_index, var_binds = await getCmd(
-                    self.engine,
-                    user_data,
-                    target,
-                    ContextData(),
-                    ObjectType(ObjectIdentity(oid))
-                )
+            # One GET for every OID: a single round trip and one USM auth/priv pass
+            error_indication, error_status, error_index, var_binds = await getCmd(
+                self.engine,
+                self._get_user_data(),
+                target,
+                ContextData(),
+                *_SYSTEM_INFO_OBJECTS,
+            )
 
-                if error_indication or error_status:
-                    continue
+            if error_indication or error_status:
+                return None
 
-                for var_bind in var_binds:
-                    value = var_bind[1].prettyPrint()
-                    results[name] = value
+            # Responses keep request order, so map varbinds back to names by position
+            results = {}
+            for name, (_, value) in zip(SNMP_OIDS, var_binds, strict=True):
+                # noSuchObject / noSuchInstance / endOfMibView are Null-typed
+                if isinstance(value, Null):
+                    continue
+                results[name] = _snmp_value(value)
 
             if results:
                 return results
@@ -317,18 +478,24 @@ OUI_VENDORS = {
 }
 
 
+# OUI table keyed by the 24-bit prefix so lookups skip string normalization
+_OUI_INT = {int(oui.replace(":", ""), 16): vendor for oui, vendor in OUI_VENDORS.items()}
+
+# Separators stripped from MAC addresses (colon, hyphen, and Cisco dotted forms)
+_MAC_SEPARATORS = str.maketrans("", "", ":-. ")
+
+
 def get_vendor_from_mac(mac_address: Optional[str]) -> Optional[str]:
     """Get vendor from MAC address OUI."""
     if not mac_address:
         return None
-    # Normalize MAC address
-    mac = mac_address.upper().replace("-", ":").replace(".", ":")
-    # Get first 3 octets (OUI)
-    parts = mac.split(":")
-    if len(parts) >= 3:
-        oui = ":".join(parts[:3])
-        return OUI_VENDORS.get(oui)
-    return None
+    oui = mac_address.translate(_MAC_SEPARATORS)[:6]
+    if len(oui) < 6:
+        return None
+    try:
+        return _OUI_INT.get(int(oui, 16))
+    except ValueError:
+        return None
 
 
 def detect_os_from_ttl(ttl: Optional[int]) -> Optional[str]:
@@ -349,211 +516,422 @@ def detect_os_from_ttl(ttl: Optional[int]) -> Optional[str]:
     return None
 
 
-def detect_device_type(sys_descr: Optional[str], sys_oid: Optional[str]) -> tuple[Optional[str], Optional[str], Optional[str]]:
-    """Detect device type, vendor, and model from SNMP system info."""
-    if not sys_descr:
-        return None, None, None
+# Model extraction patterns, compiled once
+_CISCO_MODEL_RE = re.compile(r'(?:catalyst\s*)?(\d{4}[A-Z]*)', re.IGNORECASE)
+_NEXUS_MODEL_RE = re.compile(r'[Nn]exus\s*(\d+[A-Z]*)')
+_SRX_MODEL_RE = re.compile(r'SRX(\d+)', re.IGNORECASE)
+_EX_MODEL_RE = re.compile(r'EX(\d+)', re.IGNORECASE)
+_MX_MODEL_RE = re.compile(r'MX(\d+)', re.IGNORECASE)
+_QFX_MODEL_RE = re.compile(r'QFX(\d+)', re.IGNORECASE)
+_PALO_ALTO_MODEL_RE = re.compile(r'PA-(\d+)', re.IGNORECASE)
+_FORTIGATE_MODEL_RE = re.compile(r'FortiGate-(\d+\w*)', re.IGNORECASE)
+_ARISTA_MODEL_RE = re.compile(r'DCS-(\d+[A-Z]*)', re.IGNORECASE)
+
+# Vendor keywords in detection priority order; each group names its handler
+_VENDOR_KEYWORDS = (
+    ("cisco", "cisco"),
+    ("juniper", "juniper|junos"),
+    ("palo_alto", "paloalto|pan-os"),
+    ("fortinet", "fortinet|fortigate|fortios"),
+    ("arista", "arista"),
+    ("aruba", "aruba|procurve|hpe"),
+    ("ubiquiti", "ubiquiti|edgeswitch|edgerouter|unifi"),
+    ("mikrotik", "mikrotik|routeros"),
+    ("pfsense", "pfsense"),
+    ("dell", "dell|force10|powerconnect"),
+    ("mellanox", "mellanox|nvidia"),
+    ("vmware", "vmware"),
+    ("linux", "linux"),
+    ("freebsd", "freebsd"),
+    ("windows", "windows|microsoft"),
+    ("brocade", "brocade|ruckus"),
+    ("f5", "f5|big-ip"),
+    ("generic", "switch|router|firewall|gateway|access point|load balancer"),
+)
+_VENDOR_PRIORITY = {name: priority for priority, (name, _) in enumerate(_VENDOR_KEYWORDS)}
+
+# Zero-width lookahead so one scan reports every keyword, including overlapping ones
+_VENDOR_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _VENDOR_KEYWORDS) + ")",
+    re.IGNORECASE,
+)
+
+_DeviceInfo = tuple[Optional[str], Optional[str], Optional[str]]
+
 
-    sys_descr_lower = sys_descr.lower()
-    vendor = None
+def _detect_cisco(sys_descr: str, lower: str) -> _DeviceInfo:
     device_type = None
     model = None
-    import re
-
-    # Cisco detection
-    if "cisco" in sys_descr_lower:
-        vendor = "Cisco"
-        if "ios-xe" in sys_descr_lower or "ios xe" in sys_descr_lower:
-            device_type = "Router/Switch"
-        elif "ios" in sys_descr_lower:
-            device_type = "Router/Switch"
-        elif "nx-os" in sys_descr_lower:
-            device_type = "Switch"
-        elif "asa" in sys_descr_lower:
-            device_type = "Firewall"
-        elif "firepower" in sys_descr_lower:
-            device_type = "Firewall"
-        elif "ucs" in sys_descr_lower:
-            device_type = "Server"
-        elif "wireless" in sys_descr_lower or "wlc" in sys_descr_lower:
-            device_type = "Wireless Controller"
-        # Try to extract model
-        match = re.search(r'(?:catalyst\s*)?(\d{4}[A-Z]*)', sys_descr, re.IGNORECASE)
-        if match:
-            model = f"Catalyst {match.group(1)}" if "catalyst" in sys_descr_lower else match.group(1)
-        # Nexus model
-        match = re.search(r'[Nn]exus\s*(\d+[A-Z]*)', sys_descr)
-        if match:
-            model = f"Nexus {match.group(1)}"
-
-    # Juniper detection
-    elif "juniper" in sys_descr_lower or "junos" in sys_descr_lower:
-        vendor = "Juniper"
-        if "srx" in sys_descr_lower:
-            device_type = "Firewall"
-            match = re.search(r'SRX(\d+)', sys_descr, re.IGNORECASE)
-            if match:
-                model = f"SRX{match.group(1)}"
-        elif "ex" in sys_descr_lower:
-            device_type = "Switch"
-            match = re.search(r'EX(\d+)', sys_descr, re.IGNORECASE)
-            if match:
-                model = f"EX{match.group(1)}"
-        elif "mx" in sys_descr_lower:
-            device_type = "Router"
-            match = re.search(r'MX(\d+)', sys_descr, re.IGNORECASE)
-            if match:
-                model = f"MX{match.group(1)}"
-        elif "qfx" in sys_descr_lower:
-            device_type = "Switch"
-            match = re.search(r'QFX(\d+)', sys_descr, re.IGNORECASE)
-            if match:
-                model = f"QFX{match.group(1)}"
-
-    # Palo Alto detection
-    elif "paloalto" in sys_descr_lower or "pan-os" in sys_descr_lower:
-        vendor = "Palo Alto"
+    if "ios-xe" in lower or "ios xe" in lower:
+        device_type = "Router/Switch"
+    elif "ios" in lower:
+        device_type = "Router/Switch"
+    elif "nx-os" in lower:
+        device_type = "Switch"
+    elif "asa" in lower:
         device_type = "Firewall"
-        match = re.search(r'PA-(\d+)', sys_descr, re.IGNORECASE)
-        if match:
-            model = f"PA-{match.group(1)}"
-
-    # Fortinet detection
-    elif "fortinet" in sys_descr_lower or "fortigate" in sys_descr_lower or "fortios" in sys_descr_lower:
-        vendor = "Fortinet"
-        if "fortiswitch" in sys_descr_lower:
-            device_type = "Switch"
-        elif "fortiap" in sys_descr_lower:
-            device_type = "Access Point"
-        else:
-            device_type = "Firewall"
-        match = re.search(r'FortiGate-(\d+\w*)', sys_descr, re.IGNORECASE)
-        if match:
-            model = f"FortiGate-{match.group(1)}"
-
-    # Arista detection
-    elif "arista" in sys_descr_lower:
-        vendor = "Arista"
+    elif "firepower" in lower:
+        device_type = "Firewall"
+    elif "ucs" in lower:
+        device_type = "Server"
+    elif "wireless" in lower or "wlc" in lower:
+        device_type = "Wireless Controller"
+    # Try to extract model
+    match = _CISCO_MODEL_RE.search(sys_descr)
+    if match:
+        model = f"Catalyst {match.group(1)}" if "catalyst" in lower else match.group(1)
+    # Nexus model
+    match = _NEXUS_MODEL_RE.search(sys_descr)
+    if match:
+        model = f"Nexus {match.group(1)}"
+    return device_type, "Cisco", model
+
+
+def _detect_juniper(sys_descr: str, lower: str) -> _DeviceInfo:
+    for keyword, device_type, pattern, prefix in (
+        ("srx", "Firewall", _SRX_MODEL_RE, "SRX"),
+        ("ex", "Switch", _EX_MODEL_RE, "EX"),
+        ("mx", "Router", _MX_MODEL_RE, "MX"),
+        ("qfx", "Switch", _QFX_MODEL_RE, "QFX"),
+    ):
+        if keyword in lower:
+            match = pattern.search(sys_descr)
+            return device_type, "Juniper", f"{prefix}{match.group(1)}" if match else None
+    return None, "Juniper", None
+
+
+def _detect_palo_alto(sys_descr: str, lower: str) -> _DeviceInfo:
+    match = _PALO_ALTO_MODEL_RE.search(sys_descr)
+    return "Firewall", "Palo Alto", f"PA-{match.group(1)}" if match else None
+
+
+def _detect_fortinet(sys_descr: str, lower: str) -> _DeviceInfo:
+    if "fortiswitch" in lower:
         device_type = "Switch"
-        match = re.search(r'DCS-(\d+[A-Z]*)', sys_descr, re.IGNORECASE)
-        if match:
-            model = f"DCS-{match.group(1)}"
-
-    # HPE/Aruba detection
-    elif "aruba" in sys_descr_lower or "procurve" in sys_descr_lower or "hpe" in sys_descr_lower:
-        vendor = "HPE/Aruba"
-        if "wireless" in sys_descr_lower or "mobility" in sys_descr_lower:
-            device_type = "Wireless Controller"
-        elif "instant" in sys_descr_lower:
-            device_type = "Access Point"
-        else:
-            device_type = "Switch"
+    elif "fortiap" in lower:
+        device_type = "Access Point"
+    else:
+        device_type = "Firewall"
+    match = _FORTIGATE_MODEL_RE.search(sys_descr)
+    return device_type, "Fortinet", f"FortiGate-{match.group(1)}" if match else None
 
-    # Ubiquiti detection
-    elif "ubiquiti" in sys_descr_lower or "edgeswitch" in sys_descr_lower or "edgerouter" in sys_descr_lower or "unifi" in sys_descr_lower:
-        vendor = "Ubiquiti"
-        if "edgerouter" in sys_descr_lower:
-            device_type = "Router"
-        elif "edgeswitch" in sys_descr_lower or "us-" in sys_descr_lower:
-            device_type = "Switch"
-        elif "unifi" in sys_descr_lower:
-            if "ap" in sys_descr_lower or "uap" in sys_descr_lower:
-                device_type = "Access Point"
-            else:
-                device_type = "Switch"
-        else:
-            device_type = "Network Device"
 
-    # MikroTik detection
-    elif "mikrotik" in sys_descr_lower or "routeros" in sys_descr_lower:
-        vendor = "MikroTik"
-        device_type = "Router"
+def _detect_arista(sys_descr: str, lower: str) -> _DeviceInfo:
+    match = _ARISTA_MODEL_RE.search(sys_descr)
+    return "Switch", "Arista", f"DCS-{match.group(1)}" if match else None
 
-    # pfSense detection
-    elif "pfsense" in sys_descr_lower:
-        vendor = "pfSense"
-        device_type = "Firewall"
 
-    # Dell/EMC detection
-    elif "dell" in sys_descr_lower or "force10" in sys_descr_lower or "powerconnect" in sys_descr_lower:
-        vendor = "Dell"
-        if "powerconnect" in sys_descr_lower:
-            device_type = "Switch"
-        elif "force10" in sys_descr_lower:
-            device_type = "Switch"
-        elif "server" in sys_descr_lower or "poweredge" in sys_descr_lower:
-            device_type = "Server"
+def _detect_aruba(sys_descr: str, lower: str) -> _DeviceInfo:
+    if "wireless" in lower or "mobility" in lower:
+        device_type = "Wireless Controller"
+    elif "instant" in lower:
+        device_type = "Access Point"
+    else:
+        device_type = "Switch"
+    return device_type, "HPE/Aruba", None
+
+
+def _detect_ubiquiti(sys_descr: str, lower: str) -> _DeviceInfo:
+    if "edgerouter" in lower:
+        device_type = "Router"
+    elif "edgeswitch" in lower or "us-" in lower:
+        device_type = "Switch"
+    elif "unifi" in lower:
+        if "ap" in lower or "uap" in lower:
+            device_type = "Access Point"
         else:
             device_type = "Switch"
+    else:
+        device_type = "Network Device"
+    return device_type, "Ubiquiti", None
 
-    # Mellanox/NVIDIA detection
-    elif "mellanox" in sys_descr_lower or "nvidia" in sys_descr_lower:
-        vendor = "Mellanox/NVIDIA"
-        device_type = "Switch"
 
-    # VMware detection
-    elif "vmware" in sys_descr_lower:
-        vendor = "VMware"
-        if "esxi" in sys_descr_lower:
-            device_type = "Hypervisor"
-        else:
-            device_type = "Virtual Machine"
-
-    # Linux detection
-    elif "linux" in sys_descr_lower:
-        vendor = "Linux"
-        if "ubuntu" in sys_descr_lower:
-            vendor = "Ubuntu"
-        elif "centos" in sys_descr_lower:
-            vendor = "CentOS"
-        elif "debian" in sys_descr_lower:
-            vendor = "Debian"
-        elif "red hat" in sys_descr_lower or "rhel" in sys_descr_lower:
-            vendor = "Red Hat"
+def _detect_dell(sys_descr: str, lower: str) -> _DeviceInfo:
+    if "powerconnect" in lower:
+        device_type = "Switch"
+    elif "force10" in lower:
+        device_type = "Switch"
+    elif "server" in lower or "poweredge" in lower:
         device_type = "Server"
+    else:
+        device_type = "Switch"
+    return device_type, "Dell", None
+
+
+def _detect_vmware(sys_descr: str, lower: str) -> _DeviceInfo:
+    return ("Hypervisor" if "esxi" in lower else "Virtual Machine"), "VMware", None
+
+
+def _detect_linux(sys_descr: str, lower: str) -> _DeviceInfo:
+    vendor = "Linux"
+    if "ubuntu" in lower:
+        vendor = "Ubuntu"
+    elif "centos" in lower:
+        vendor = "CentOS"
+    elif "debian" in lower:
+        vendor = "Debian"
+    elif "red hat" in lower or "rhel" in lower:
+        vendor = "Red Hat"
+    return "Server", vendor, None
+
+
+def _detect_windows(sys_descr: str, lower: str) -> _DeviceInfo:
+    return ("Server" if "server" in lower else "Workstation"), "Microsoft", None
+
+
+def _detect_brocade(sys_descr: str, lower: str) -> _DeviceInfo:
+    return ("Access Point" if "wireless" in lower else "Switch"), "Brocade/Ruckus", None
+
+
+def _detect_generic(sys_descr: str, lower: str) -> _DeviceInfo:
+    for keyword, device_type in (
+        ("switch", "Switch"),
+        ("router", "Router"),
+        ("firewall", "Firewall"),
+        ("gateway", "Gateway"),
+        ("access point", "Access Point"),
+        ("load balancer", "Load Balancer"),
+    ):
+        if keyword in lower:
+            return device_type, None, None
+    return None, None, None
+
+
+_VENDOR_HANDLERS = {
+    "cisco": _detect_cisco,
+    "juniper": _detect_juniper,
+    "palo_alto": _detect_palo_alto,
+    "fortinet": _detect_fortinet,
+    "arista": _detect_arista,
+    "aruba": _detect_aruba,
+    "ubiquiti": _detect_ubiquiti,
+    "mikrotik": lambda sys_descr, lower: ("Router", "MikroTik", None),
+    "pfsense": lambda sys_descr, lower: ("Firewall", "pfSense", None),
+    "dell": _detect_dell,
+    "mellanox": lambda sys_descr, lower: ("Switch", "Mellanox/NVIDIA", None),
+    "vmware": _detect_vmware,
+    "linux": _detect_linux,
+    "freebsd": lambda sys_descr, lower: ("Server", "FreeBSD", None),
+    "windows": _detect_windows,
+    "brocade": _detect_brocade,
+    "f5": lambda sys_descr, lower: ("Load Balancer", "F5", None),
+    "generic": _detect_generic,
+}
 
-    # FreeBSD detection
-    elif "freebsd" in sys_descr_lower:
-        vendor = "FreeBSD"
-        device_type = "Server"
 
-    # Windows detection
-    elif "windows" in sys_descr_lower or "microsoft" in sys_descr_lower:
-        vendor = "Microsoft"
-        if "server" in sys_descr_lower:
-            device_type = "Server"
-        else:
-            device_type = "Workstation"
+@lru_cache(maxsize=1024)
+def detect_device_type(sys_descr: Optional[str], sys_oid: Optional[str]) -> tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Detect device type, vendor, and model from SNMP system info.
 
-    # Brocade/Ruckus detection
-    elif "brocade" in sys_descr_lower or "ruckus" in sys_descr_lower:
-        vendor = "Brocade/Ruckus"
-        if "wireless" in sys_descr_lower:
-            device_type = "Access Point"
-        else:
-            device_type = "Switch"
+    Memoized: fleets of the same model and firmware report identical sysDescr
+    strings, so most hosts in a sweep skip classification entirely.
+    """
+    if not sys_descr:
+        return None, None, None
 
-    # F5 detection
-    elif "f5" in sys_descr_lower or "big-ip" in sys_descr_lower:
-        vendor = "F5"
-        device_type = "Load Balancer"
+    # One scan finds every vendor keyword; the highest-priority one picks the handler
+    vendor_key = min(
+        (match.lastgroup for match in _VENDOR_RE.finditer(sys_descr)),
+        key=_VENDOR_PRIORITY.__getitem__,
+        default=None,
+    )
+    if vendor_key is None:
+        return None, None, None
+    return _VENDOR_HANDLERS[vendor_key](sys_descr, sys_descr.lower())
+
+
+def fingerprint_host(host: DiscoveredHost) -> None:
+    """Fill in OS, vendor, device type and confidence from a host's probe results."""
+    confidence_score = 0  # Track confidence based on data sources
+
+    # Detect OS from TTL
+    if host.icmp_ttl:
+        host.os_family = detect_os_from_ttl(host.icmp_ttl)
+        confidence_score += 1  # TTL-based detection adds some confidence
+
+    if host.snmp_reachable:
+        confidence_score += 2  # SNMP response adds significant confidence
+
+        # Detect device type from SNMP data
+        device_type, vendor, model = detect_device_type(host.sys_description, host.sys_object_id)
+        host.device_type = device_type
+        host.vendor = vendor
+        host.model = model
+
+        if vendor:
+            confidence_score += 2  # Vendor detection adds confidence
+        if model:
+            confidence_score += 1  # Model detection adds confidence
+
+    # Try MAC-based vendor detection if we don't have vendor from SNMP
+    if not host.vendor and host.mac_address:
+        mac_vendor = get_vendor_from_mac(host.mac_address)
+        if mac_vendor:
+            host.vendor = mac_vendor
+            confidence_score += 1  # MAC OUI adds some confidence
+
+    # Calculate fingerprint confidence level
+    if confidence_score >= 5:
+        host.fingerprint_confidence = "high"
+    elif confidence_score >= 2:
+        host.fingerprint_confidence = "medium"
+    else:
+        host.fingerprint_confidence = "low"
+
+
+def _host_ips(network: ipaddress.IPv4Network | ipaddress.IPv6Network) -> tuple[int, Iterator[str]]:
+    """
+    Return the number of usable hosts in ``network`` and a lazy iterator of them.
+
+    IPv4 addresses are generated from an integer range, skipping the
+    IPv4Address object per host that network.hosts() would allocate.
+    """
+    if network.version != 4:
+        hosts = [str(host) for host in network.hosts()]
+        return len(hosts), iter(hosts)
+
+    first = int(network.network_address)
+    last = int(network.broadcast_address)
+    # /31 and /32 have no network or broadcast address to exclude
+    if network.prefixlen < 31:
+        first += 1
+        last -= 1
+    addresses = range(first, last + 1)
+    return len(addresses), (socket.inet_ntoa(address.to_bytes(4, "big")) for address in addresses)
+
+
+# Discovered hosts are written with COPY in batches of this many rows
+_SAVE_BATCH_SIZE = 500
+
+# Minimum seconds between job progress writes
+_PROGRESS_INTERVAL = 1.0
+
+# Seconds a decrypted SNMPv3 credential is reused across jobs; bounds how long
+# an edited credential can go unnoticed
+_CREDENTIAL_CACHE_TTL = 300.0
+
+_DISCOVERED_HOST_COLUMNS = (
+    "job_id", "ip_address", "hostname", "mac_address", "vendor", "model",
+    "device_type", "sys_name", "sys_description", "sys_contact", "sys_location",
+    "icmp_reachable", "icmp_latency_ms", "snmp_reachable", "snmp_engine_id",
+    "interfaces_count", "uptime_seconds", "os_family", "icmp_ttl", "open_ports",
+    "fingerprint_confidence",
+)
+
+# Column types for the unnest() arrays, in _DISCOVERED_HOST_COLUMNS order
+_DISCOVERED_HOST_TYPES = (
+    "uuid", "inet", "text", "macaddr", "text", "text",
+    "text", "text", "text", "text", "text",
+    "boolean", "numeric", "boolean", "text",
+    "integer", "bigint", "text", "integer", "text",
+    "text",
+)
+
+# Inserts a batch of hosts ($1 is the job, then one array per column) and
+# writes the job's progress in the same round-trip
+_SAVE_DISCOVERED_HOSTS_SQL = f"""
+    WITH inserted AS (
+        INSERT INTO npm.discovered_hosts ({', '.join(_DISCOVERED_HOST_COLUMNS)})
+        SELECT $1::uuid, * FROM unnest({', '.join(
+            f'${i}::{column_type}[]'
+            for i, column_type in enumerate(_DISCOVERED_HOST_TYPES[1:], 2)
+        )})
+    )
+    UPDATE npm.discovery_jobs
+    SET progress_percent = ${len(_DISCOVERED_HOST_COLUMNS) + 1},
+        discovered_hosts = ${len(_DISCOVERED_HOST_COLUMNS) + 2}
+    WHERE id = $1
+"""
+
+
+# Binary inet header for a single IPv4 host: family, prefix bits, is_cidr flag
+# and address length
+_INET4_HOST_HEADER = b"\x02\x20\x00\x04"
+
+
+def _encode_inet(value) -> bytes:
+    """Encode an inet in binary format; dotted IPv4 strings skip ipaddress."""
+    if isinstance(value, str):
+        try:
+            return _INET4_HOST_HEADER + socket.inet_pton(socket.AF_INET, value)
+        except OSError:
+            pass
+    interface = ipaddress.ip_interface(value)
+    packed = interface.packed
+    family = 2 if interface.version == 4 else 3
+    return bytes((family, interface.network.prefixlen, 0, len(packed))) + packed
+
+
+def _decode_inet(data: bytes):
+    """Decode a binary inet the way asyncpg's built-in codec does."""
+    bits, length = data[1], data[3]
+    address = data[4:4 + length]
+    if bits == length * 8:
+        return ipaddress.ip_address(address)
+    return ipaddress.ip_interface((address, bits))
+
+
+def _encode_macaddr(value: str) -> bytes:
+    """Encode a MAC address string (any common separator) as 6 raw bytes."""
+    mac = bytes.fromhex(value.translate(_MAC_SEPARATORS))
+    if len(mac) != 6:
+        raise ValueError(f"invalid MAC address: {value!r}")
+    return mac
+
+
+def _decode_macaddr(data: bytes) -> str:
+    return data.hex(":")
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """
+    Install binary codecs for the discovered_hosts network columns.
+
+    asyncpg only ships a text codec for macaddr, which COPY's binary format
+    cannot use, and its inet encoder parses every address through ipaddress.
+    """
+    await conn.set_type_codec(
+        "inet",
+        schema="pg_catalog",
+        encoder=_encode_inet,
+        decoder=_decode_inet,
+        format="binary",
+    )
+    await conn.set_type_codec(
+        "macaddr",
+        schema="pg_catalog",
+        encoder=_encode_macaddr,
+        decoder=_decode_macaddr,
+        format="binary",
+    )
 
-    # Generic network device detection
-    elif any(x in sys_descr_lower for x in ["switch", "router", "firewall", "gateway", "access point", "load balancer"]):
-        if "switch" in sys_descr_lower:
-            device_type = "Switch"
-        elif "router" in sys_descr_lower:
-            device_type = "Router"
-        elif "firewall" in sys_descr_lower:
-            device_type = "Firewall"
-        elif "gateway" in sys_descr_lower:
-            device_type = "Gateway"
-        elif "access point" in sys_descr_lower:
-            device_type = "Access Point"
-        elif "load balancer" in sys_descr_lower:
-            device_type = "Load Balancer"
 
-    return device_type, vendor, model
+def _discovered_host_record(job_id: str, host: DiscoveredHost) -> tuple:
+    """Build a discovered_hosts row in _DISCOVERED_HOST_COLUMNS order."""
+    return (
+        job_id,
+        host.ip_address,
+        host.hostname,
+        host.mac_address,
+        host.vendor,
+        host.model,
+        host.device_type,
+        host.sys_name,
+        host.sys_description,
+        host.sys_contact,
+        host.sys_location,
+        host.icmp_reachable,
+        host.icmp_latency_ms,
+        host.snmp_reachable,
+        host.snmp_engine_id,
+        host.interfaces_count,
+        host.uptime_seconds,
+        host.os_family,
+        host.icmp_ttl,
+        host.open_ports,
+        host.fingerprint_confidence,
+    )
 
 
 class DiscoveryCollector:
@@ -562,7 +940,10 @@ class DiscoveryCollector:
     def __init__(self, db_pool: asyncpg.Pool, encryption_key: bytes):
         self.db_pool = db_pool
         self.encryption_key = encryption_key
+        self._aesgcm = AESGCM(encryption_key)
+        self._credential_cache: dict[str, tuple[float, SNMPv3Credential]] = {}
         self.pinger = ICMPPinger(timeout=2.0)
+        self.snmp_engine = SnmpEngine()
         self.running = False
         self._shutdown_event = asyncio.Event()
 
@@ -587,6 +968,7 @@ class DiscoveryCollector:
                 logger.error("discovery_collector_error", error=str(e))
                 await asyncio.sleep(5.0)
 
+        self.pinger.close()
         logger.info("discovery_collector_stopped")
 
     async def stop(self) -> None:
@@ -614,7 +996,20 @@ class DiscoveryCollector:
             return None
 
     async def _get_snmpv3_credential(self, credential_id: str) -> Optional[SNMPv3Credential]:
-        """Get SNMPv3 credential by ID."""
+        """Get SNMPv3 credential by ID, cached for _CREDENTIAL_CACHE_TTL seconds."""
+        cached = self._credential_cache.get(credential_id)
+        if cached and time.monotonic() - cached[0] < _CREDENTIAL_CACHE_TTL:
+            return cached[1]
+
+        credential = await self._load_snmpv3_credential(credential_id)
+        if credential:
+            self._credential_cache[credential_id] = (time.monotonic(), credential)
+        else:
+            self._credential_cache.pop(credential_id, None)
+        return credential
+
+    async def _load_snmpv3_credential(self, credential_id: str) -> Optional[SNMPv3Credential]:
+        """Load and decrypt an SNMPv3 credential from the database."""
         async with self.db_pool.acquire() as conn:
             row = await conn.fetchrow("""
                 SELECT username, security_level, auth_protocol, auth_password_encrypted,
@@ -629,9 +1024,9 @@ class DiscoveryCollector:
             priv_password = None
 
             if row["auth_password_encrypted"]:
-                auth_password = decrypt_password(row["auth_password_encrypted"], self.encryption_key)
+                auth_password = decrypt_password(row["auth_password_encrypted"], self._aesgcm)
             if row["priv_password_encrypted"]:
-                priv_password = decrypt_password(row["priv_password_encrypted"], self.encryption_key)
+                priv_password = decrypt_password(row["priv_password_encrypted"], self._aesgcm)
 
             return SNMPv3Credential(
                 username=row["username"],
@@ -650,8 +1045,7 @@ class DiscoveryCollector:
         try:
             # Parse network
             network = ipaddress.ip_network(job["cidr"], strict=False)
-            hosts = list(network.hosts())
-            total_hosts = len(hosts)
+            total_hosts, host_ips = _host_ips(network)
 
             # Get SNMPv3 credential if needed
             snmp_credential = None
@@ -660,45 +1054,78 @@ class DiscoveryCollector:
 
             snmp_scanner = None
             if snmp_credential:
-                snmp_scanner = SNMPv3Scanner(snmp_credential)
+                snmp_scanner = SNMPv3Scanner(snmp_credential, engine=self.snmp_engine)
 
-            # Process hosts in batches
-            batch_size = 50
-            discovered_count = 0
+            # Keep a fixed number of scans in flight so one slow host does not
+            # hold back the rest, and save results as they complete
+            semaphore = asyncio.Semaphore(settings.discovery_concurrency)
+
+            async def scan(ip: str) -> Optional[DiscoveredHost]:
+                async with semaphore:
+                    return await self._scan_host(ip, job["discovery_method"], snmp_scanner)
 
-            for i in range(0, total_hosts, batch_size):
-                if not self.running:
-                    # Job cancelled
-                    await self._update_job_status(job_id, "cancelled")
-                    return
-
-                batch = hosts[i:i + batch_size]
-                tasks = []
-
-                for host in batch:
-                    ip = str(host)
-                    tasks.append(self._scan_host(
-                        ip,
-                        job["discovery_method"],
-                        snmp_scanner,
-                    ))
-
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Save discovered hosts
-                for result in results:
-                    if isinstance(result, Exception):
-                        continue
-                    if result and (result.icmp_reachable or result.snmp_reachable):
-                        await self._save_discovered_host(job_id, result)
-                        discovered_count += 1
-
-                # Update progress
-                progress = int((i + len(batch)) / total_hosts * 100)
-                await self._update_job_progress(job_id, progress, discovered_count)
-
-            # Mark job as completed
-            await self._update_job_status(job_id, "completed", discovered_count)
+            discovered_count = 0
+            pending_hosts: list[DiscoveredHost] = []
+            last_progress = time.monotonic()
+            written_progress = (0, 0)
+
+            # One connection carries the job's progress, host and status writes
+            async with self.db_pool.acquire() as job_conn:
+                # Statements the scan loop repeats are prepared once for the job
+                progress_stmt = await job_conn.prepare("""
+                    UPDATE npm.discovery_jobs
+                    SET progress_percent = $2, discovered_hosts = $3
+                    WHERE id = $1
+                """)
+                save_stmt = await job_conn.prepare(_SAVE_DISCOVERED_HOSTS_SQL)
+                tasks = [asyncio.create_task(scan(ip)) for ip in host_ips]
+
+                try:
+                    for completed, next_result in enumerate(asyncio.as_completed(tasks), 1):
+                        if not self.running:
+                            # Job cancelled
+                            await self._save_discovered_hosts(
+                                save_stmt, job_id, pending_hosts, (written_progress[0], discovered_count)
+                            )
+                            await self._update_job_status(job_id, "cancelled", conn=job_conn)
+                            return
+
+                        try:
+                            result = await next_result
+                        except Exception:
+                            result = None
+
+                        # Buffer discovered hosts and save them in bulk
+                        if result and (result.icmp_reachable or result.snmp_reachable):
+                            pending_hosts.append(result)
+                            discovered_count += 1
+                            if len(pending_hosts) >= _SAVE_BATCH_SIZE:
+                                await self._copy_discovered_hosts(job_conn, job_id, pending_hosts)
+                                pending_hosts.clear()
+
+                        # Update progress at most once per interval; it is only for display
+                        now = time.monotonic()
+                        if now - last_progress >= _PROGRESS_INTERVAL and completed < total_hosts:
+                            last_progress = now
+                            progress = (int(completed / total_hosts * 100), discovered_count)
+                            if pending_hosts:
+                                # Hosts found since the last write go out with the progress
+                                await self._save_discovered_hosts(save_stmt, job_id, pending_hosts, progress)
+                                pending_hosts.clear()
+                                written_progress = progress
+                            elif progress != written_progress:
+                                # Skip the write when neither value has moved since the last one
+                                written_progress = progress
+                                await progress_stmt.fetch(job_id, *progress)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+
+                await self._save_discovered_hosts(save_stmt, job_id, pending_hosts, (100, discovered_count))
+
+                # Mark job as completed
+                await self._update_job_status(job_id, "completed", discovered_count, conn=job_conn)
             logger.info("discovery_job_completed", job_id=job_id, discovered=discovered_count)
 
         except Exception as e:
@@ -711,9 +1138,8 @@ class DiscoveryCollector:
         method: str,
         snmp_scanner: Optional[SNMPv3Scanner],
     ) -> Optional[DiscoveredHost]:
-        """Scan a single host."""
+        """Probe a single host; fingerprinting happens in bulk before saving."""
         host = DiscoveredHost(ip_address=ip)
-        confidence_score = 0  # Track confidence based on data sources
 
         # ICMP ping
         if method in ("icmp", "both"):
@@ -722,109 +1148,63 @@ class DiscoveryCollector:
             host.icmp_latency_ms = latency
             host.icmp_ttl = ttl
 
-            # Detect OS from TTL
-            if ttl:
-                host.os_family = detect_os_from_ttl(ttl)
-                confidence_score += 1  # TTL-based detection adds some confidence
-
-        # SNMPv3 query
+        # SNMPv3 query; in "both" mode only hosts that answered ICMP are queried,
+        # so empty addresses don't each wait out the SNMP timeout and retries
+        if method == "both" and not host.icmp_reachable:
+            snmp_scanner = None
         if method in ("snmpv3", "both") and snmp_scanner:
             system_info = await snmp_scanner.get_system_info(ip)
             if system_info:
                 host.snmp_reachable = True
                 host.sys_name = system_info.get("sysName")
                 host.sys_description = system_info.get("sysDescr")
+                host.sys_object_id = system_info.get("sysObjectID")
                 host.sys_contact = system_info.get("sysContact")
                 host.sys_location = system_info.get("sysLocation")
-                confidence_score += 2  # SNMP response adds significant confidence
 
-                if system_info.get("ifNumber"):
-                    try:
-                        host.interfaces_count = int(system_info["ifNumber"])
-                    except ValueError:
-                        pass
+                if_number = system_info.get("ifNumber")
+                if isinstance(if_number, int):
+                    host.interfaces_count = if_number
 
-                if system_info.get("sysUpTime"):
-                    try:
-                        # sysUpTime is in hundredths of seconds
-                        host.uptime_seconds = int(system_info["sysUpTime"]) // 100
-                    except ValueError:
-                        pass
-
-                # Detect device type from SNMP data
-                device_type, vendor, model = detect_device_type(
-                    host.sys_description,
-                    system_info.get("sysObjectID")
-                )
-                host.device_type = device_type
-                host.vendor = vendor
-                host.model = model
-
-                if vendor:
-                    confidence_score += 2  # Vendor detection adds confidence
-                if model:
-                    confidence_score += 1  # Model detection adds confidence
-
-        # Try MAC-based vendor detection if we don't have vendor from SNMP
-        if not host.vendor and host.mac_address:
-            mac_vendor = get_vendor_from_mac(host.mac_address)
-            if mac_vendor:
-                host.vendor = mac_vendor
-                confidence_score += 1  # MAC OUI adds some confidence
-
-        # Calculate fingerprint confidence level
-        if confidence_score >= 5:
-            host.fingerprint_confidence = "high"
-        elif confidence_score >= 2:
-            host.fingerprint_confidence = "medium"
-        else:
-            host.fingerprint_confidence = "low"
+                uptime = system_info.get("sysUpTime")
+                if isinstance(uptime, int):
+                    # sysUpTime is in hundredths of seconds
+                    host.uptime_seconds = uptime // 100
 
         return host
 
-    async def _save_discovered_host(self, job_id: str, host: DiscoveredHost) -> None:
-        """Save a discovered host to the database."""
-        async with self.db_pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO npm.discovered_hosts (
-                    job_id, ip_address, hostname, mac_address, vendor, model,
-                    device_type, sys_name, sys_description, sys_contact, sys_location,
-                    icmp_reachable, icmp_latency_ms, snmp_reachable, snmp_engine_id,
-                    interfaces_count, uptime_seconds, os_family, icmp_ttl, open_ports,
-                    fingerprint_confidence
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20, $21)
-            """,
-                job_id,
-                host.ip_address,
-                host.hostname,
-                host.mac_address,
-                host.vendor,
-                host.model,
-                host.device_type,
-                host.sys_name,
-                host.sys_description,
-                host.sys_contact,
-                host.sys_location,
-                host.icmp_reachable,
-                host.icmp_latency_ms,
-                host.snmp_reachable,
-                host.snmp_engine_id,
-                host.interfaces_count,
-                host.uptime_seconds,
-                host.os_family,
-                host.icmp_ttl,
-                host.open_ports,
-                host.fingerprint_confidence,
-            )
-
-    async def _update_job_progress(self, job_id: str, progress: int, discovered: int) -> None:
-        """Update job progress."""
-        async with self.db_pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE npm.discovery_jobs
-                SET progress_percent = $2, discovered_hosts = $3
-                WHERE id = $1
-            """, job_id, progress, discovered)
+    async def _save_discovered_hosts(
+        self,
+        save_stmt: PreparedStatement,
+        job_id: str,
+        hosts: list[DiscoveredHost],
+        progress: tuple[int, int],
+    ) -> None:
+        """Fingerprint and insert discovered hosts, writing job progress in the same statement."""
+        if not hosts:
+            return
+        for host in hosts:
+            fingerprint_host(host)
+        records = [_discovered_host_record(job_id, host) for host in hosts]
+        # One array per column; the job id is bound once as $1
+        columns = list(zip(*records, strict=True))[1:]
+        await save_stmt.fetch(job_id, *columns, *progress)
+
+    async def _copy_discovered_hosts(
+        self,
+        conn: asyncpg.Connection,
+        job_id: str,
+        hosts: list[DiscoveredHost],
+    ) -> None:
+        """Fingerprint a full batch of discovered hosts and COPY them in."""
+        for host in hosts:
+            fingerprint_host(host)
+        await conn.copy_records_to_table(
+            "discovered_hosts",
+            schema_name="npm",
+            columns=_DISCOVERED_HOST_COLUMNS,
+            records=[_discovered_host_record(job_id, host) for host in hosts],
+        )
 
     async def _update_job_status(
         self,
@@ -832,16 +1212,53 @@ class DiscoveryCollector:
         status: str,
         discovered_count: int = 0,
         error_message: Optional[str] = None,
+        conn: Optional[asyncpg.Connection] = None,
     ) -> None:
-        """Update job status."""
-        async with self.db_pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE npm.discovery_jobs
-                SET status = $2, discovered_hosts = $3, error_message = $4,
-                    completed_at = CASE WHEN $2 IN ('completed', 'failed', 'cancelled') THEN NOW() ELSE completed_at END,
-                    progress_percent = CASE WHEN $2 = 'completed' THEN 100 ELSE progress_percent END
-                WHERE id = $1
-            """, job_id, status, discovered_count, error_message)
+        """Update job status, on ``conn`` if given or a pooled connection."""
+        if conn is None:
+            async with self.db_pool.acquire() as conn:
+                await self._update_job_status(job_id, status, discovered_count, error_message, conn)
+            return
+        await conn.execute("""
+            UPDATE npm.discovery_jobs
+            SET status = $2, discovered_hosts = $3, error_message = $4,
+                completed_at = CASE WHEN $2 IN ('completed', 'failed', 'cancelled') THEN NOW() ELSE completed_at END,
+                progress_percent = CASE WHEN $2 = 'completed' THEN 100 ELSE progress_percent END
+            WHERE id = $1
+        """, job_id, status, discovered_count, error_message)
+
+
+def _log_crypto_acceleration() -> None:
+    """
+    Log the OpenSSL build and whether the CPU exposes AES/carry-less multiply.
+
+    AES-GCM credential decryption relies on OpenSSL using AES-NI and
+    PCLMULQDQ (PMULL on ARM); without them it runs in software.
+    """
+    try:
+        from cryptography.hazmat.backends.openssl.backend import backend
+
+        openssl_version = backend.openssl_version_text()
+    except Exception:
+        openssl_version = None
+
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu_flags = {
+                flag
+                for line in f
+                if line.startswith(("flags", "Features"))
+                for flag in line.split(":", 1)[1].split()
+            }
+    except OSError:
+        logger.info("crypto_backend", openssl=openssl_version)
+        return
+
+    aes = "aes" in cpu_flags
+    clmul = "pclmulqdq" in cpu_flags or "pmull" in cpu_flags
+    logger.info("crypto_backend", openssl=openssl_version, aes=aes, clmul=clmul)
+    if not (aes and clmul):
+        logger.warning("aesni_unavailable", aes=aes, clmul=clmul)
 
 
 async def main():
@@ -855,16 +1272,15 @@ async def main():
         return
 
     encryption_key = base64.b64decode(encryption_key_b64)
+    _log_crypto_acceleration()
 
     # Create database pool
     db_pool = await asyncpg.create_pool(
-        host=settings.POSTGRES_HOST,
-        port=settings.POSTGRES_PORT,
-        user=settings.POSTGRES_USER,
-        password=settings.POSTGRES_PASSWORD,
-        database=settings.POSTGRES_DB,
-        min_size=2,
-        max_size=10,
+        str(settings.postgres_url),
+        min_size=settings.discovery_pool_min,
+        max_size=settings.discovery_pool_max,
+        statement_cache_size=settings.db_statement_cache_size,
+        init=_init_connection,
     )
 
     collector = DiscoveryCollector(db_pool, encryption_key)
@@ -887,4 +1303,7 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -1,11 +1,13 @@
 """NATS JetStream handler for NPM service messaging."""
 
 import asyncio
-import json
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Callable, Coroutine
 
 import nats
+import orjson
 from nats.js import JetStreamContext
 from nats.js.api import ConsumerConfig, DeliverPolicy, AckPolicy
 
@@ -27,6 +29,64 @@ SUBJECT_POLL_REQUEST = "npm.poll.request"
 # Stream configuration
 STREAM_NAME = "NPM_METRICS"
 
+# Matches the JetStream context's default timeout used by js.publish
+_PUBLISH_TIMEOUT = 5.0
+
+
+# Message timestamps are reused for this many seconds; bursts of alerts in the
+# same tick don't each pay for datetime.now().isoformat()
+_TIMESTAMP_RESOLUTION = 0.1
+_timestamp_cache: tuple[float, str] = (0.0, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO 8601, cached for _TIMESTAMP_RESOLUTION seconds."""
+    global _timestamp_cache
+    expires_at, timestamp = _timestamp_cache
+    now = time.monotonic()
+    if now >= expires_at:
+        timestamp = datetime.now(timezone.utc).isoformat()
+        _timestamp_cache = (now + _TIMESTAMP_RESOLUTION, timestamp)
+    return timestamp
+
+
+# Payloads the handler publishes itself; orjson serializes slotted dataclasses
+# directly, without building an intermediate dict per message
+@dataclass(slots=True)
+class DeviceStatusMessage:
+    """Device status update published on SUBJECT_DEVICE_STATUS."""
+
+    device_id: str
+    status: str
+    timestamp: str
+    previous_status: str | None = None
+
+
+@dataclass(slots=True)
+class AlertMessage:
+    """Alert published on SUBJECT_ALERTS."""
+
+    device_id: str
+    message: str
+    severity: str
+    details: dict[str, Any]
+    timestamp: str
+    source: str = "npm"
+
+
+@dataclass(slots=True)
+class PollRequestMessage:
+    """Poll request published on SUBJECT_POLL_REQUEST."""
+
+    device_id: str
+
+
+# Poll acknowledgements differ only in device and time, so those are spliced
+# into a pre-encoded DeviceStatusMessage envelope instead of serializing one
+_POLLING_STATUS_TEMPLATE = (
+    b'{"device_id":%b,"status":"polling","timestamp":"%b","previous_status":null}'
+)
+
 
 class NATSHandler:
     """Handler for NATS JetStream messaging."""
@@ -118,6 +178,7 @@ class NATSHandler:
             SUBJECT_POLL_REQUEST,
             "npm-poll-worker",
             self._handle_poll_request,
+            batch_size=settings.nats_poll_fetch_batch,
         )
         self._tasks.append(poll_consumer)
 
@@ -126,6 +187,8 @@ class NATSHandler:
             SUBJECT_DEVICE_STATUS,
             "npm-status-handler",
             self._handle_device_status,
+            batch_size=settings.nats_status_fetch_batch,
+            required_keys=(b'"device_id"', b'"status"'),
         )
         self._tasks.append(status_consumer)
 
@@ -136,8 +199,19 @@ class NATSHandler:
         subject: str,
         name: str,
         handler: Callable[[dict[str, Any]], Coroutine[Any, Any, None]],
+        batch_size: int = 100,
+        max_concurrency: int = 10,
+        required_keys: tuple[bytes, ...] = (),
+        prefetch: int = 1,
     ) -> asyncio.Task:
-        """Create a pull consumer for a subject."""
+        """
+        Create a pull consumer for a subject.
+
+        Messages whose raw payload lacks any of ``required_keys`` (quoted JSON
+        key names) are acked without being parsed, for handlers that would
+        ignore them anyway. Up to ``prefetch`` batches are pulled ahead while
+        the current one is being handled.
+        """
         if not self.js:
             raise RuntimeError("NATS not connected")
 
@@ -153,27 +227,63 @@ class NATSHandler:
             ),
         )
 
-        async def consume():
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def process(msg) -> None:
+            if not all(key in msg.data for key in required_keys):
+                return
+            async with semaphore:
+                await handler(orjson.loads(msg.data))
+
+        # Batches fetched ahead of the one being processed, so the next pull
+        # is in flight while handlers run
+        prefetched: asyncio.Queue[list] = asyncio.Queue(maxsize=prefetch)
+
+        async def fetch():
             while self._running:
                 try:
-                    messages = await consumer.fetch(batch=10, timeout=5)
-                    for msg in messages:
-                        try:
-                            data = json.loads(msg.data.decode())
-                            await handler(data)
-                            await msg.ack()
-                        except Exception as e:
-                            logger.error(
-                                "message_processing_failed",
-                                subject=subject,
-                                error=str(e),
-                            )
-                            await msg.nak()
+                    messages = await consumer.fetch(batch=batch_size, timeout=5)
                 except asyncio.TimeoutError:
                     continue
                 except Exception as e:
-                    logger.error("consumer_error", subject=subject, error=str(e))
+                    logger.error("consumer_fetch_error", subject=subject, error=str(e))
                     await asyncio.sleep(1)
+                    continue
+                await prefetched.put(messages)
+
+        async def process_batch(messages: list) -> None:
+            # Handlers do independent I/O, so run the batch concurrently
+            results = await asyncio.gather(
+                *(process(msg) for msg in messages),
+                return_exceptions=True,
+            )
+
+            for msg, result in zip(messages, results, strict=True):
+                if isinstance(result, BaseException):
+                    logger.error(
+                        "message_processing_failed",
+                        subject=subject,
+                        error=str(result),
+                    )
+                    await msg.nak()
+                else:
+                    await msg.ack()
+
+        async def consume():
+            # Prefetching relies on explicit acks: each ack covers only its own
+            # message, so acking the next batch cannot settle messages this one
+            # nak'd before they are redelivered
+            fetcher = asyncio.create_task(fetch())
+            try:
+                while self._running:
+                    messages = await prefetched.get()
+                    try:
+                        await process_batch(messages)
+                    except Exception as e:
+                        logger.error("consumer_error", subject=subject, error=str(e))
+                        await asyncio.sleep(1)
+            finally:
+                fetcher.cancel()
 
         return asyncio.create_task(consume())
 
@@ -189,11 +299,10 @@ class NATSHandler:
 
         # Trigger immediate poll for device
         # This would call the SNMPPoller to poll a specific device
-        await self.publish_device_status({
-            "device_id": device_id,
-            "status": "polling",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-        })
+        await self.publish_device_status(_POLLING_STATUS_TEMPLATE % (
+            orjson.dumps(device_id),
+            _utc_timestamp().encode(),
+        ))
 
     async def _handle_device_status(self, data: dict[str, Any]) -> None:
         """Handle device status update message."""
@@ -208,35 +317,61 @@ class NATSHandler:
 
         # Check if status changed from UP to DOWN (trigger alert)
         if previous_status == DeviceStatus.UP.value and status == DeviceStatus.DOWN.value:
-            await self.publish_alert({
-                "device_id": device_id,
-                "message": f"Device is no longer responding",
-                "severity": AlertSeverity.CRITICAL.value,
-                "details": {
+            await self.publish_alert(AlertMessage(
+                device_id=device_id,
+                message="Device is no longer responding",
+                severity=AlertSeverity.CRITICAL.value,
+                details={
                     "previous_status": previous_status,
                     "current_status": status,
                 },
-            })
+                timestamp=_utc_timestamp(),
+            ))
 
     async def publish_metrics(self, metrics: dict[str, Any]) -> None:
         """Publish metrics to NATS for VictoriaMetrics consumption."""
-        if not self.js:
+        await self.publish_metrics_batch([metrics])
+
+    async def publish_metrics_batch(
+        self, metrics_list: list[dict[str, Any]], timeout: float = _PUBLISH_TIMEOUT
+    ) -> None:
+        """
+        Publish several metrics messages, pipelining their JetStream acks.
+
+        Every message is sent before any ack is awaited, so a burst costs
+        roughly one round-trip instead of one per message. Raises
+        asyncio.TimeoutError if the acks do not all arrive within ``timeout``.
+        """
+        if not self.js or not metrics_list:
             return
 
-        subject = f"npm.metrics.{metrics.get('type', 'generic')}"
-        await self.js.publish(
-            subject,
-            json.dumps(metrics).encode(),
-        )
+        acks = [
+            await self.js.publish_async(
+                f"npm.metrics.{metrics.get('type', 'generic')}",
+                orjson.dumps(metrics),
+                wait_stall=timeout,
+            )
+            for metrics in metrics_list
+        ]
+        try:
+            await asyncio.wait_for(asyncio.gather(*acks), timeout=timeout)
+        except asyncio.TimeoutError:
+            # publish_async futures never expire on their own; cancelling them
+            # frees their pending-publish slots (e.g. acks lost in a reconnect)
+            for ack in acks:
+                ack.cancel()
+            raise
 
-    async def publish_device_status(self, data: dict[str, Any]) -> None:
-        """Publish device status update."""
+    async def publish_device_status(
+        self, data: DeviceStatusMessage | dict[str, Any] | bytes
+    ) -> None:
+        """Publish device status update (bytes are sent as already-encoded JSON)."""
         if not self.js:
             return
 
         await self.js.publish(
             SUBJECT_DEVICE_STATUS,
-            json.dumps(data).encode(),
+            data if isinstance(data, bytes) else orjson.dumps(data),
         )
 
     async def publish_interface_status(self, data: dict[str, Any]) -> None:
@@ -246,24 +381,30 @@ class NATSHandler:
 
         await self.js.publish(
             SUBJECT_INTERFACE_STATUS,
-            json.dumps(data).encode(),
+            orjson.dumps(data),
         )
 
-    async def publish_alert(self, data: dict[str, Any]) -> None:
-        """Publish alert to shared alerts stream."""
+    async def publish_alert(self, data: AlertMessage | dict[str, Any]) -> None:
+        """
+        Publish alert to shared alerts stream.
+
+        Dict payloads are stamped with ``source`` and ``timestamp`` in place
+        rather than copied, so callers should not reuse them across alerts.
+        """
         if not self.nc:
             return
 
+        if isinstance(data, AlertMessage):
+            device_id = data.device_id
+        else:
+            device_id = data.get("device_id")
+            data["source"] = "npm"
+            data["timestamp"] = _utc_timestamp()
+        payload = orjson.dumps(data)
+
         # Publish to shared alerts subject (not JetStream - for immediate delivery)
-        await self.nc.publish(
-            SUBJECT_ALERTS,
-            json.dumps({
-                **data,
-                "source": "npm",
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }).encode(),
-        )
-        logger.info("alert_published", device_id=data.get("device_id"))
+        await self.nc.publish(SUBJECT_ALERTS, payload)
+        logger.info("alert_published", device_id=device_id)
 
     async def request_poll(self, device_id: str) -> None:
         """Request immediate poll for a device."""
@@ -272,6 +413,6 @@ class NATSHandler:
 
         await self.js.publish(
             SUBJECT_POLL_REQUEST,
-            json.dumps({"device_id": device_id}).encode(),
+            orjson.dumps(PollRequestMessage(device_id=device_id)),
         )
         logger.info("poll_request_published", device_id=device_id)
@@ -26,8 +26,11 @@ Standard MIBs supported:
 MIB files are stored in: infrastructure/mibs/
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
 from enum import Enum
+from functools import cache
+from types import MappingProxyType
 from typing import Any
 
 
@@ -46,7 +49,7 @@ class VendorType(str, Enum):
     WINDOWS = "windows"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class OIDDefinition:
     """Definition for a single SNMP OID."""
     oid: str
@@ -57,6 +60,15 @@ class OIDDefinition:
     scale: float = 1.0  # multiplier for unit conversion
 
 
+def oid_to_tuple(oid: str) -> tuple[int, ...]:
+    """Convert a dotted OID string to a tuple of ints.
+
+    Tuples compare element-wise in C, so prefix checks become
+    ``t[:len(prefix)] == prefix`` instead of repeated string splitting.
+    """
+    return tuple(int(part) for part in oid.strip(".").split("."))
+
+
 # =============================================================================
 # Standard RFC MIBs (all vendors)
 # =============================================================================
@@ -528,6 +540,46 @@ SOPHOS_OIDS = {
 }
 
 
+# =============================================================================
+# Read-only views
+# =============================================================================
+# The tables are shared by every poller task, so they are exposed as read-only
+# views; callers can hold references to them without taking defensive copies.
+
+def _freeze(table: dict[str, dict[str, OIDDefinition]]) -> Mapping[str, Mapping[str, OIDDefinition]]:
+    """Wrap a vendor table and each of its categories in read-only views."""
+    return MappingProxyType({category: MappingProxyType(oids) for category, oids in table.items()})
+
+
+STANDARD_OIDS = _freeze(STANDARD_OIDS)
+ARISTA_OIDS = _freeze(ARISTA_OIDS)
+ARUBA_OIDS = _freeze(ARUBA_OIDS)
+JUNIPER_OIDS = _freeze(JUNIPER_OIDS)
+MELLANOX_OIDS = _freeze(MELLANOX_OIDS)
+PFSENSE_OIDS = _freeze(PFSENSE_OIDS)
+HPE_ARUBA_CX_OIDS = _freeze(HPE_ARUBA_CX_OIDS)
+LINUX_OIDS = _freeze(LINUX_OIDS)
+REDHAT_OIDS = LINUX_OIDS
+WINDOWS_OIDS = _freeze(WINDOWS_OIDS)
+SOPHOS_OIDS = _freeze(SOPHOS_OIDS)
+
+_NO_OIDS: Mapping[str, Mapping[str, OIDDefinition]] = MappingProxyType({})
+
+
+_VENDOR_OIDS: dict[VendorType, Mapping[str, Mapping[str, OIDDefinition]]] = {
+    VendorType.ARISTA: ARISTA_OIDS,
+    VendorType.ARUBA: ARUBA_OIDS,
+    VendorType.HPE_ARUBA_CX: HPE_ARUBA_CX_OIDS,
+    VendorType.JUNIPER: JUNIPER_OIDS,
+    VendorType.MELLANOX: MELLANOX_OIDS,
+    VendorType.PFSENSE: PFSENSE_OIDS,
+    VendorType.SOPHOS: SOPHOS_OIDS,
+    VendorType.LINUX: LINUX_OIDS,
+    VendorType.REDHAT: REDHAT_OIDS,
+    VendorType.WINDOWS: WINDOWS_OIDS,
+}
+
+
 # =============================================================================
 # Vendor Detection by sysObjectID
 # =============================================================================
@@ -547,7 +599,17 @@ VENDOR_OID_PREFIXES = {
     "1.3.6.1.4.1.77": VendorType.WINDOWS,         # LanMgr (Windows)
 }
 
+# Prefixes keyed by their dotted components. Matching whole components keeps
+# e.g. enterprise 2604 from also claiming 26041; lengths are tried longest
+# first so a more specific prefix wins.
+_VENDOR_PREFIX_PARTS = {
+    tuple(prefix.split(".")): vendor for prefix, vendor in VENDOR_OID_PREFIXES.items()
+}
+_VENDOR_PREFIX_LENGTHS = sorted({len(parts) for parts in _VENDOR_PREFIX_PARTS}, reverse=True)
+
 
+# A fleet reports a handful of distinct sysObjectIDs, so results are memoized
+@cache
 def detect_vendor_from_sys_object_id(sys_object_id: str) -> VendorType:
     """Detect vendor type from sysObjectID OID.
 
@@ -557,54 +619,48 @@ def detect_vendor_from_sys_object_id(sys_object_id: str) -> VendorType:
     Returns:
         VendorType enum indicating the detected vendor
     """
-    for prefix, vendor in VENDOR_OID_PREFIXES.items():
-        if sys_object_id.startswith(prefix):
+    parts = tuple(sys_object_id.strip(".").split(".", _VENDOR_PREFIX_LENGTHS[0]))
+    for length in _VENDOR_PREFIX_LENGTHS:
+        vendor = _VENDOR_PREFIX_PARTS.get(parts[:length])
+        if vendor is not None:
             return vendor
     return VendorType.GENERIC
 
 
-def get_vendor_oids(vendor: VendorType) -> dict[str, dict[str, OIDDefinition]]:
+def get_vendor_oids(vendor: VendorType) -> Mapping[str, Mapping[str, OIDDefinition]]:
     """Get vendor-specific OID mappings.
 
     Args:
         vendor: The vendor type
 
     Returns:
-        Dictionary of OID categories and definitions
+        Read-only mapping of OID categories and definitions
     """
-    vendor_maps = {
-        VendorType.ARISTA: ARISTA_OIDS,
-        VendorType.ARUBA: ARUBA_OIDS,
-        VendorType.HPE_ARUBA_CX: HPE_ARUBA_CX_OIDS,
-        VendorType.JUNIPER: JUNIPER_OIDS,
-        VendorType.MELLANOX: MELLANOX_OIDS,
-        VendorType.PFSENSE: PFSENSE_OIDS,
-        VendorType.SOPHOS: SOPHOS_OIDS,
-        VendorType.LINUX: LINUX_OIDS,
-        VendorType.REDHAT: REDHAT_OIDS,
-        VendorType.WINDOWS: WINDOWS_OIDS,
-    }
-    return vendor_maps.get(vendor, {})
-
-
-def get_all_oids_for_vendor(vendor: VendorType) -> dict[str, dict[str, OIDDefinition]]:
+    return _VENDOR_OIDS.get(vendor, _NO_OIDS)
+
+
+def _merge_vendor_oids(vendor: VendorType) -> Mapping[str, Mapping[str, OIDDefinition]]:
+    """Merge standard and vendor OIDs into read-only nested mappings."""
+    # Categories only one side defines are shared as-is; only overlaps are copied
+    merged = dict(STANDARD_OIDS)
+    for category, oids in get_vendor_oids(vendor).items():
+        standard = merged.get(category)
+        merged[category] = oids if standard is None else MappingProxyType({**standard, **oids})
+    return MappingProxyType(merged)
+
+
+# The merge only depends on the vendor, so every vendor's is built once here
+_ALL_VENDOR_OIDS = {vendor: _merge_vendor_oids(vendor) for vendor in VendorType}
+
+
+def get_all_oids_for_vendor(vendor: VendorType) -> Mapping[str, Mapping[str, OIDDefinition]]:
     """Get all OIDs (standard + vendor-specific) for a vendor.
 
     Args:
         vendor: The vendor type
 
     Returns:
-        Combined dictionary of standard and vendor OIDs
+        Read-only mapping of standard and vendor OID categories, shared
+        between callers
     """
-    # Start with standard OIDs
-    all_oids = dict(STANDARD_OIDS)
-
-    # Add vendor-specific OIDs
-    vendor_oids = get_vendor_oids(vendor)
-    for category, oids in vendor_oids.items():
-        if category in all_oids:
-            all_oids[category].update(oids)
-        else:
-            all_oids[category] = oids
-
-    return all_oids
+    return _ALL_VENDOR_OIDS.get(vendor, _ALL_VENDOR_OIDS[VendorType.GENERIC])
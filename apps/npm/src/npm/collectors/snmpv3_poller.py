@@ -3,14 +3,15 @@
 import asyncio
 import subprocess
 import re
+from collections import deque
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 from dataclasses import dataclass
+from functools import lru_cache
 
 from pysnmp.hlapi.v3arch.asyncio import (
     get_cmd,
-    next_cmd,
     bulk_cmd,
     UsmUserData,
     UdpTransportTarget,
@@ -31,12 +32,21 @@ from pysnmp.hlapi.v3arch.asyncio import (
     usmNoAuthProtocol,
     usmNoPrivProtocol,
 )
+from pysnmp.proto.rfc1905 import EndOfMibView, NoSuchInstance, NoSuchObject
+
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:  # fall back to the default asyncio event loop
+    UVLOOP_AVAILABLE = False
 
 from ..core.config import settings
 from ..core.logging import get_logger, configure_logging
 from ..db import init_db, close_db, get_db
 from ..models.metrics import DeviceMetrics
 from ..services.crypto import get_crypto_service
+from .oid_mappings import oid_to_tuple
 
 logger = get_logger(__name__)
 
@@ -133,6 +143,22 @@ OID_IF_HC_OUT_OCTETS = "1.3.6.1.2.1.31.1.1.1.10" # ifHCOutOctets (64-bit)
 OID_IF_HIGH_SPEED = "1.3.6.1.2.1.31.1.1.1.15"    # ifHighSpeed (Mbps)
 OID_IF_ALIAS = "1.3.6.1.2.1.31.1.1.1.18"         # ifAlias (description)
 
+# Per-interface columns fetched each poll
+_INTERFACE_COLUMNS = (
+    OID_IF_OPER_STATUS,
+    OID_IF_ADMIN_STATUS,
+    OID_IF_HC_IN_OCTETS,
+    OID_IF_IN_OCTETS,
+    OID_IF_HC_OUT_OCTETS,
+    OID_IF_OUT_OCTETS,
+    OID_IF_IN_ERRORS,
+    OID_IF_OUT_ERRORS,
+    OID_IF_IN_DISCARDS,
+    OID_IF_OUT_DISCARDS,
+    OID_IF_HIGH_SPEED,
+    OID_IF_SPEED,
+)
+
 # ============================================
 # Vendor-Specific CPU OIDs
 # ============================================
@@ -252,6 +278,8 @@ class SNMPv3Credential:
     priv_protocol: str | None
     priv_password: str | None
     context_name: str | None = None
+    credential_id: str | None = None  # npm.snmpv3_credentials row, if stored
+    updated_at: datetime | None = None
 
 
 @dataclass
@@ -262,13 +290,78 @@ class ICMPResult:
     packet_loss_percent: float
 
 
+# Varbinds per GET request; keeps responses well under a 1500-byte MTU agent's limit
+_MAX_GET_VARBINDS = 20
+# Rows requested per GETBULK while walking a table
+_WALK_REPETITIONS = 25
+# Per-varbind exceptions an agent returns instead of a value
+_MISSING_VALUE_TYPES = (NoSuchObject, NoSuchInstance, EndOfMibView)
+
+
+@lru_cache(maxsize=8192)
+def _object_type(oid: str) -> ObjectType:
+    """
+    Shared request varbind for ``oid``.
+
+    pysnmp resolves an ObjectType against the MIB view in place on first use
+    and skips resolution afterwards, so reusing one instance per OID avoids
+    repeating that work on every poll.
+    """
+    return ObjectType(ObjectIdentity(oid_to_tuple(oid)))
+
+
+def _to_int(value: Any) -> int | None:
+    """Convert an SNMP value to int, or None if it is missing or not numeric."""
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _column_int(values: dict[str, Any], column: str, index: int) -> int | None:
+    """Integer value of a table column's row from get_multiple results."""
+    return _to_int(values.get(f"{column}.{index}"))
+
+
 class SNMPv3Client:
     """SNMPv3 client for querying devices."""
 
     def __init__(self) -> None:
+        # One engine serves every device; pysnmp registers USM users, target
+        # params and the UDP socket on it once and reuses them per request
         self.engine = SnmpEngine()
+        self._transports: dict[tuple[str, int, float, int], UdpTransportTarget] = {}
+        self._user_data: dict[str, tuple[datetime | None, UsmUserData]] = {}
+
+    async def _get_transport(self, ip: str, port: int, timeout: float, retries: int) -> UdpTransportTarget:
+        """Get the transport target for a device, resolving its address only once."""
+        key = (ip, port, timeout, retries)
+        transport = self._transports.get(key)
+        if transport is None:
+            transport = await UdpTransportTarget.create((ip, port), timeout=timeout, retries=retries)
+            self._transports[key] = transport
+        return transport
 
     def _get_user_data(self, credential: SNMPv3Credential) -> UsmUserData:
+        """
+        Get USM user data for a credential, shared by devices that use it.
+
+        Entries are keyed by credential row and replaced when the row's
+        updated_at changes, so a rotated password takes effect on the next
+        poll. Credentials that are not stored rows are built per call.
+        """
+        if credential.credential_id is None:
+            return self._build_user_data(credential)
+        cached = self._user_data.get(credential.credential_id)
+        if cached is not None and cached[0] == credential.updated_at:
+            return cached[1]
+        user_data = self._build_user_data(credential)
+        self._user_data[credential.credential_id] = (credential.updated_at, user_data)
+        return user_data
+
+    def _build_user_data(self, credential: SNMPv3Credential) -> UsmUserData:
         """Build USM user data from credential."""
         auth_proto = AUTH_PROTOCOLS.get(credential.auth_protocol, usmNoAuthProtocol)
         priv_proto = PRIV_PROTOCOLS.get(credential.priv_protocol, usmNoPrivProtocol)
@@ -307,9 +400,10 @@ class SNMPv3Client:
             error_indication, error_status, error_index, var_binds = await get_cmd(
                 self.engine,
                 user_data,
-                await UdpTransportTarget.create((ip, port), timeout=timeout, retries=retries),
+                await self._get_transport(ip, port, timeout, retries),
                 context,
-                ObjectType(ObjectIdentity(oid)),
+                # Integer tuples are taken as-is; dotted strings get re-parsed per request
+                _object_type(oid),
             )
 
             if error_indication:
@@ -344,11 +438,58 @@ class SNMPv3Client:
         timeout: float = 5.0,
         retries: int = 2,
     ) -> dict[str, Any]:
-        """Perform multiple SNMPv3 GET operations."""
-        results = {}
-        for oid in oids:
-            result = await self.get(ip, port, credential, oid, timeout, retries)
-            results[oid] = result
+        """
+        Perform SNMPv3 GETs for several OIDs, packing up to _MAX_GET_VARBINDS
+        varbinds into each request.
+
+        OIDs the agent does not have (noSuchObject/noSuchInstance) map to None.
+        A request the agent rejects as a whole (tooBig, genErr, ...) is retried
+        one OID at a time, so only the OIDs that fail on their own are lost.
+        """
+        results: dict[str, Any] = dict.fromkeys(oids)
+        try:
+            user_data = self._get_user_data(credential)
+            context = ContextData(contextName=credential.context_name or "")
+            transport = await self._get_transport(ip, port, timeout, retries)
+
+            batches = deque(
+                oids[start:start + _MAX_GET_VARBINDS]
+                for start in range(0, len(oids), _MAX_GET_VARBINDS)
+            )
+            while batches:
+                batch = batches.popleft()
+                error_indication, error_status, error_index, var_binds = await get_cmd(
+                    self.engine,
+                    user_data,
+                    transport,
+                    context,
+                    *(_object_type(oid) for oid in batch),
+                )
+
+                if error_indication:
+                    # Timeouts and auth failures will not clear up for the next batch
+                    logger.warning("snmp_get_error", ip=ip, oids=len(batch), error=str(error_indication))
+                    break
+
+                if error_status:
+                    logger.warning(
+                        "snmp_get_status_error",
+                        ip=ip,
+                        oids=len(batch),
+                        error=error_status.prettyPrint(),
+                        index=error_index,
+                    )
+                    if len(batch) > 1:
+                        batches.extend([oid] for oid in batch)
+                    continue
+
+                for oid, var_bind in zip(batch, var_binds, strict=True):
+                    if not isinstance(var_bind[1], _MISSING_VALUE_TYPES):
+                        results[oid] = var_bind[1]
+
+        except Exception as e:
+            logger.error("snmp_get_exception", ip=ip, oids=len(oids), error=str(e))
+
         return results
 
     async def walk(
@@ -361,22 +502,26 @@ class SNMPv3Client:
         retries: int = 2,
         max_rows: int = 100,
     ) -> dict[str, Any]:
-        """Perform SNMPv3 WALK operation using next_cmd to retrieve a table."""
+        """Perform SNMPv3 WALK operation using GETBULK to retrieve a table."""
         results = {}
         try:
             user_data = self._get_user_data(credential)
             context = ContextData(contextName=credential.context_name or "")
-            transport = await UdpTransportTarget.create((ip, port), timeout=timeout, retries=retries)
+            transport = await self._get_transport(ip, port, timeout, retries)
 
-            current_oid = oid
+            root = oid_to_tuple(oid)
+            current_oid = root
             rows_fetched = 0
 
             while rows_fetched < max_rows:
-                error_indication, error_status, error_index, var_binds = await next_cmd(
+                # Each GETBULK returns up to _WALK_REPETITIONS rows in one round-trip
+                error_indication, error_status, error_index, var_binds = await bulk_cmd(
                     self.engine,
                     user_data,
                     transport,
                     context,
+                    0,
+                    min(_WALK_REPETITIONS, max_rows - rows_fetched),
                     ObjectType(ObjectIdentity(current_oid)),
                 )
 
@@ -398,12 +543,14 @@ class SNMPv3Client:
                     break
 
                 for var_bind in var_binds:
-                    oid_str = str(var_bind[0])
-                    if not oid_str.startswith(oid):
+                    name = var_bind[0].getOid().asTuple()
+                    if name[:len(root)] != root or isinstance(var_bind[1], EndOfMibView):
                         # We've walked past the requested OID tree
                         return results
-                    results[oid_str] = var_bind[1]
-                    current_oid = oid_str
+                    if rows_fetched >= max_rows:
+                        return results
+                    results[str(var_bind[0])] = var_bind[1]
+                    current_oid = name
                     rows_fetched += 1
 
         except Exception as e:
@@ -412,6 +559,12 @@ class SNMPv3Client:
         return results
 
 
+# ping summary lines: Linux/BSD "rtt|round-trip min/avg/max", Windows "Average = Nms"
+_PING_RTT_RE = re.compile(r"(?:rtt|round-trip)\s+min/avg/max.*?=\s*[\d.]+/([\d.]+)/", re.IGNORECASE)
+_PING_AVERAGE_RE = re.compile(r"Average\s*=\s*(\d+)ms", re.IGNORECASE)
+_PING_LOSS_RE = re.compile(r"(\d+)%\s+(?:packet\s+)?loss", re.IGNORECASE)
+
+
 class ICMPPoller:
     """ICMP ping poller using system ping command."""
 
@@ -445,19 +598,15 @@ class ICMPPoller:
             # Parse results
             if process.returncode == 0:
                 # Extract latency (average)
-                latency_match = re.search(
-                    r"(?:rtt|round-trip)\s+min/avg/max.*?=\s*[\d.]+/([\d.]+)/",
-                    output,
-                    re.IGNORECASE,
-                )
+                latency_match = _PING_RTT_RE.search(output)
                 if not latency_match:
                     # Windows format
-                    latency_match = re.search(r"Average\s*=\s*(\d+)ms", output, re.IGNORECASE)
+                    latency_match = _PING_AVERAGE_RE.search(output)
 
                 latency = float(latency_match.group(1)) if latency_match else None
 
                 # Extract packet loss
-                loss_match = re.search(r"(\d+)%\s+(?:packet\s+)?loss", output, re.IGNORECASE)
+                loss_match = _PING_LOSS_RE.search(output)
                 packet_loss = float(loss_match.group(1)) if loss_match else 0.0
 
                 return ICMPResult(
@@ -535,7 +684,8 @@ class SNMPv3MetricsCollector:
                     d.vendor, d.poll_icmp, d.poll_snmp, d.snmp_port,
                     c.username, c.security_level, c.auth_protocol,
                     c.auth_password_encrypted, c.priv_protocol, c.priv_password_encrypted,
-                    c.context_name
+                    c.context_name, c.id::text as credential_id,
+                    c.updated_at as credential_updated_at
                 FROM npm.devices d
                 LEFT JOIN npm.snmpv3_credentials c ON d.snmpv3_credential_id = c.id
                 WHERE d.is_active = true
@@ -617,6 +767,8 @@ class SNMPv3MetricsCollector:
                 priv_protocol=device['priv_protocol'],
                 priv_password=priv_password,
                 context_name=device['context_name'],
+                credential_id=device['credential_id'],
+                updated_at=device['credential_updated_at'],
             )
 
             # Get uptime
@@ -921,9 +1073,13 @@ class SNMPv3MetricsCollector:
             return None
 
         # Get allocation units, size, and used for the RAM entry
-        alloc_val = await self.snmp_client.get(ip, port, credential, f"{hr_storage_alloc}.{ram_index}")
-        size_val = await self.snmp_client.get(ip, port, credential, f"{hr_storage_size}.{ram_index}")
-        used_val = await self.snmp_client.get(ip, port, credential, f"{hr_storage_used}.{ram_index}")
+        storage_oids = [
+            f"{hr_storage_alloc}.{ram_index}",
+            f"{hr_storage_size}.{ram_index}",
+            f"{hr_storage_used}.{ram_index}",
+        ]
+        storage = await self.snmp_client.get_multiple(ip, port, credential, storage_oids)
+        alloc_val, size_val, used_val = (storage[oid] for oid in storage_oids)
 
         if alloc_val is None or size_val is None or used_val is None:
             return None
@@ -1043,122 +1199,48 @@ class SNMPv3MetricsCollector:
                 return interfaces
 
             # Extract interface indices from the OIDs
-            for oid_str, descr_value in if_descr_results.items():
-                # OID format: 1.3.6.1.2.1.2.2.1.2.<if_index>
-                parts = oid_str.split(".")
-                if_index = int(parts[-1])
+            # OID format: 1.3.6.1.2.1.2.2.1.2.<if_index>
+            if_indices = [int(oid_str.split(".")[-1]) for oid_str in if_descr_results]
+
+            # Every column for every interface goes out in packed GETs; the
+            # 32-bit counter and ifSpeed fallbacks ride along rather than
+            # costing another round-trip when the 64-bit column is missing
+            values = await self.snmp_client.get_multiple(
+                ip,
+                port,
+                credential,
+                [f"{column}.{if_index}" for if_index in if_indices for column in _INTERFACE_COLUMNS],
+            )
 
+            for if_index, descr_value in zip(if_indices, if_descr_results.values(), strict=True):
                 interface = {
                     "if_index": if_index,
                     "name": str(descr_value) if descr_value else f"Interface {if_index}",
                 }
 
-                # Get additional metrics for this interface
-                # Operational status
-                oper_status = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_OPER_STATUS}.{if_index}"
-                )
-                if oper_status is not None:
-                    try:
-                        interface["oper_status"] = int(oper_status)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Admin status
-                admin_status = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_ADMIN_STATUS}.{if_index}"
-                )
-                if admin_status is not None:
-                    try:
-                        interface["admin_status"] = int(admin_status)
-                    except (ValueError, TypeError):
-                        pass
-
                 # Try 64-bit counters first (ifHC*), fall back to 32-bit
-                in_octets = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_HC_IN_OCTETS}.{if_index}"
-                )
-                if in_octets is None:
-                    in_octets = await self.snmp_client.get(
-                        ip, port, credential, f"{OID_IF_IN_OCTETS}.{if_index}"
-                    )
-                if in_octets is not None:
-                    try:
-                        interface["in_octets"] = int(in_octets)
-                    except (ValueError, TypeError):
-                        pass
-
-                out_octets = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_HC_OUT_OCTETS}.{if_index}"
-                )
-                if out_octets is None:
-                    out_octets = await self.snmp_client.get(
-                        ip, port, credential, f"{OID_IF_OUT_OCTETS}.{if_index}"
-                    )
-                if out_octets is not None:
-                    try:
-                        interface["out_octets"] = int(out_octets)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Error counters
-                in_errors = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_IN_ERRORS}.{if_index}"
-                )
-                if in_errors is not None:
-                    try:
-                        interface["in_errors"] = int(in_errors)
-                    except (ValueError, TypeError):
-                        pass
-
-                out_errors = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_OUT_ERRORS}.{if_index}"
-                )
-                if out_errors is not None:
-                    try:
-                        interface["out_errors"] = int(out_errors)
-                    except (ValueError, TypeError):
-                        pass
-
-                # Discard counters
-                in_discards = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_IN_DISCARDS}.{if_index}"
-                )
-                if in_discards is not None:
-                    try:
-                        interface["in_discards"] = int(in_discards)
-                    except (ValueError, TypeError):
-                        pass
-
-                out_discards = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_OUT_DISCARDS}.{if_index}"
-                )
-                if out_discards is not None:
-                    try:
-                        interface["out_discards"] = int(out_discards)
-                    except (ValueError, TypeError):
-                        pass
+                hc_in_octets = _column_int(values, OID_IF_HC_IN_OCTETS, if_index)
+                hc_out_octets = _column_int(values, OID_IF_HC_OUT_OCTETS, if_index)
+                fields = {
+                    "oper_status": _column_int(values, OID_IF_OPER_STATUS, if_index),
+                    "admin_status": _column_int(values, OID_IF_ADMIN_STATUS, if_index),
+                    "in_octets": hc_in_octets if hc_in_octets is not None else _column_int(values, OID_IF_IN_OCTETS, if_index),
+                    "out_octets": hc_out_octets if hc_out_octets is not None else _column_int(values, OID_IF_OUT_OCTETS, if_index),
+                    "in_errors": _column_int(values, OID_IF_IN_ERRORS, if_index),
+                    "out_errors": _column_int(values, OID_IF_OUT_ERRORS, if_index),
+                    "in_discards": _column_int(values, OID_IF_IN_DISCARDS, if_index),
+                    "out_discards": _column_int(values, OID_IF_OUT_DISCARDS, if_index),
+                }
 
-                # Interface speed (try ifHighSpeed first - in Mbps)
-                speed = await self.snmp_client.get(
-                    ip, port, credential, f"{OID_IF_HIGH_SPEED}.{if_index}"
-                )
-                if speed is not None:
-                    try:
-                        interface["speed_mbps"] = int(speed)
-                    except (ValueError, TypeError):
-                        pass
-                else:
-                    # Fall back to ifSpeed (in bps)
-                    speed = await self.snmp_client.get(
-                        ip, port, credential, f"{OID_IF_SPEED}.{if_index}"
-                    )
+                # Interface speed (ifHighSpeed is in Mbps, ifSpeed in bps)
+                speed = _column_int(values, OID_IF_HIGH_SPEED, if_index)
+                if speed is None:
+                    speed = _column_int(values, OID_IF_SPEED, if_index)
                     if speed is not None:
-                        try:
-                            interface["speed_mbps"] = int(speed) // 1_000_000
-                        except (ValueError, TypeError):
-                            pass
+                        speed //= 1_000_000
+                fields["speed_mbps"] = speed
 
+                interface.update((key, value) for key, value in fields.items() if value is not None)
                 interfaces.append(interface)
 
         except Exception as e:
@@ -1175,8 +1257,11 @@ class SNMPv3MetricsCollector:
         """Get Sophos firewall service status."""
         services = {}
 
+        results = await self.snmp_client.get_multiple(
+            ip, port, credential, list(SOPHOS_SERVICE_OIDS.values())
+        )
         for service_name, oid in SOPHOS_SERVICE_OIDS.items():
-            result = await self.snmp_client.get(ip, port, credential, oid)
+            result = results[oid]
             if result is not None:
                 try:
                     # Sophos may return integer (1=running, 0=stopped) or string
@@ -1382,4 +1467,7 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
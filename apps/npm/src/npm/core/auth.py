@@ -1,6 +1,7 @@
 """JWT authentication utilities."""
 
 from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 from fastapi import Depends, HTTPException, Request, status
@@ -37,29 +38,41 @@ class JWTPayload:
         return self.role in ("admin", "operator")
 
 
+@lru_cache(maxsize=4096)
+def _decode_token(token: str, key: str, algorithm: str) -> dict[str, Any]:
+    """
+    Verify a token's signature and claims.
+
+    Cached by raw token so clients reusing a token skip the signature check on
+    later requests; failures raise and are never cached. Expiry is re-checked
+    by verify_token on every call, so a cached token still lapses on time.
+    """
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience="GridWatch-api",
+        issuer="gridwatch-net-enterprise",
+    )
+
+
 def verify_token(token: str) -> JWTPayload:
     """Verify and decode JWT token."""
     try:
         # Determine which key/algorithm to use
         if settings.jwt_public_key:
             key = settings.jwt_public_key
-            algorithms = ["RS256"]
+            algorithm = "RS256"
         elif settings.jwt_secret:
             key = settings.jwt_secret
-            algorithms = ["HS256"]
+            algorithm = "HS256"
         else:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="JWT configuration missing",
             )
 
-        payload = jwt.decode(
-            token,
-            key,
-            algorithms=algorithms,
-            audience="GridWatch-api",
-            issuer="gridwatch-net-enterprise",
-        )
+        payload = _decode_token(token, key, algorithm)
 
         # Check expiration
         exp = payload.get("exp", 0)
@@ -0,0 +1,129 @@
+"""Two-tier response cache: a small in-process TTL cache in front of Redis.
+
+The cache is an optimization only: when Redis is not initialized or a call
+fails, Redis reads behave as misses and writes are skipped so requests fall
+through to PostgreSQL. The in-process tier is not shared between workers, so its TTL
+is kept short (LOCAL_CACHE_TTL) to bound staleness after writes elsewhere.
+"""
+
+from collections import OrderedDict
+from time import monotonic
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from .config import settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
+DASHBOARD_CACHE_KEY = "npm:dashboard"
+DASHBOARD_STATS_CACHE_KEY = "npm:dashboard:stats"
+
+
+def alert_cache_key(alert_id: str) -> str:
+    """Cache key for a single alert."""
+    return f"npm:alert:{alert_id}"
+
+
+def alert_rule_cache_key(rule_id: str) -> str:
+    """Cache key for a single alert rule."""
+    return f"npm:alert-rule:{rule_id}"
+
+
+class _LocalCache:
+    """Bounded in-process TTL cache with oldest-first eviction."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def set(self, key: str, value: str, ttl: float) -> None:
+        self._data[key] = (monotonic() + min(ttl, self.ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        self._data.pop(key, None)
+
+
+_local = _LocalCache(settings.local_cache_size, settings.local_cache_ttl)
+_redis: Redis | None = None
+
+
+async def init_cache() -> None:
+    """Initialize the Redis client."""
+    global _redis
+
+    if _redis is not None:
+        return
+
+    logger.info("initializing_cache", url=str(settings.redis_url).split("@")[-1])
+    _redis = Redis.from_url(str(settings.redis_url), decode_responses=True)
+
+
+async def close_cache() -> None:
+    """Close the Redis client."""
+    global _redis
+
+    if _redis is None:
+        return
+
+    logger.info("closing_cache")
+    await _redis.aclose()
+    _redis = None
+
+
+async def cache_get(key: str) -> str | None:
+    """Get a cached value, or None on a miss or if Redis is unavailable."""
+    value = _local.get(key)
+    if value is not None or _redis is None:
+        return value
+    try:
+        value = await _redis.get(key)
+    except RedisError as e:
+        logger.warning("cache_get_failed", key=key, error=str(e))
+        return None
+    if value is not None:
+        _local.set(key, value, _local.ttl)
+    return value
+
+
+async def cache_set(key: str, value: str, ttl: int) -> None:
+    """Cache a value for ``ttl`` seconds (the local tier caps it lower)."""
+    _local.set(key, value, ttl)
+    if _redis is None:
+        return
+    try:
+        await _redis.set(key, value, ex=ttl)
+    except RedisError as e:
+        logger.warning("cache_set_failed", key=key, error=str(e))
+
+
+async def cache_delete(*keys: str) -> None:
+    """Drop cached values."""
+    for key in keys:
+        _local.pop(key)
+    if _redis is None or not keys:
+        return
+    try:
+        await _redis.delete(*keys)
+    except RedisError as e:
+        logger.warning("cache_delete_failed", keys=keys, error=str(e))
+
+
+async def invalidate_dashboard() -> None:
+    """Drop cached dashboard payloads after alert state changes."""
+    await cache_delete(DASHBOARD_CACHE_KEY, DASHBOARD_STATS_CACHE_KEY)
@@ -1,5 +1,6 @@
 """Application configuration with environment validation."""
 
+import os
 from functools import lru_cache
 from typing import Literal
 
@@ -29,9 +30,26 @@ class Settings(BaseSettings):
     postgres_url: PostgresDsn = Field(..., alias="POSTGRES_URL")
     db_pool_min: int = Field(default=5, alias="DB_POOL_MIN")
     db_pool_max: int = Field(default=20, alias="DB_POOL_MAX")
+    # Seconds a request waits for a pooled connection before failing with 503
+    db_pool_timeout: float = Field(default=5.0, alias="DB_POOL_TIMEOUT")
+    # Prepared statements kept per connection; set to 0 behind PgBouncer in
+    # transaction pooling mode, where server-side statements are not stable
+    db_statement_cache_size: int = Field(default=1024, ge=0, alias="DB_STATEMENT_CACHE_SIZE")
+    # Discovery collector pool; scans and their host/progress writes run concurrently
+    discovery_pool_min: int = Field(default=2, ge=1, alias="DISCOVERY_POOL_MIN")
+    discovery_pool_max: int = Field(
+        default_factory=lambda: max(10, 2 * (os.cpu_count() or 1)),
+        ge=1,
+        alias="DISCOVERY_POOL_MAX",
+    )
 
     # Redis
     redis_url: RedisDsn = Field(..., alias="REDIS_URL")
+    dashboard_cache_ttl: int = Field(default=10, alias="DASHBOARD_CACHE_TTL")
+    entity_cache_ttl: int = Field(default=60, alias="ENTITY_CACHE_TTL")
+    # In-process tier in front of Redis (per worker, so keep the TTL short)
+    local_cache_ttl: float = Field(default=5.0, alias="LOCAL_CACHE_TTL")
+    local_cache_size: int = Field(default=10_000, alias="LOCAL_CACHE_SIZE")
 
     # NATS
     nats_url: str = Field(default="nats://localhost:4222", alias="NATS_URL")
@@ -39,6 +57,9 @@ class Settings(BaseSettings):
     nats_password: str | None = Field(default=None, alias="NATS_PASSWORD")
     nats_tls_enabled: bool = Field(default=False, alias="NATS_TLS_ENABLED")
     nats_tls_ca: str | None = Field(default=None, alias="NATS_TLS_CA")  # Path to CA cert
+    # Messages pulled per JetStream fetch; status updates are the high-volume stream
+    nats_poll_fetch_batch: int = Field(default=20, ge=1, alias="NATS_POLL_FETCH_BATCH")
+    nats_status_fetch_batch: int = Field(default=200, ge=1, alias="NATS_STATUS_FETCH_BATCH")
 
     # JWT
     jwt_secret: str | None = Field(default=None, alias="JWT_SECRET")
@@ -69,6 +90,10 @@ class Settings(BaseSettings):
     snmp_retries: int = Field(default=3, alias="SNMP_RETRIES")
     max_concurrent_polls: int = Field(default=50, alias="MAX_CONCURRENT_POLLS")
 
+    # Discovery
+    # Hosts scanned concurrently per discovery job
+    discovery_concurrency: int = Field(default=256, ge=1, alias="DISCOVERY_CONCURRENCY")
+
     # Alerting
     alert_evaluation_interval: int = Field(default=30, alias="ALERT_EVALUATION_INTERVAL")
     alert_retention_days: int = Field(default=30, alias="ALERT_RETENTION_DAYS")
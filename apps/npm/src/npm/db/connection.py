@@ -1,10 +1,12 @@
 """PostgreSQL connection pool management."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import asyncpg
 from asyncpg import Pool
+from fastapi import HTTPException, status
 
 from ..core.config import settings
 from ..core.logging import get_logger
@@ -28,12 +30,20 @@ async def init_db() -> None:
         min_size=settings.db_pool_min,
         max_size=settings.db_pool_max,
         command_timeout=60,
+        # asyncpg prepares each distinct query text once per connection and
+        # reuses the plan; hot lookups such as find_by_id only pay Bind/Execute
+        statement_cache_size=settings.db_statement_cache_size,
         server_settings={
             "search_path": "npm,shared,public",
         },
     )
 
-    logger.info("database_pool_initialized", min_size=settings.db_pool_min, max_size=settings.db_pool_max)
+    logger.info(
+        "database_pool_initialized",
+        min_size=settings.db_pool_min,
+        max_size=settings.db_pool_max,
+        statement_cache_size=settings.db_statement_cache_size,
+    )
 
 
 async def close_db() -> None:
@@ -63,6 +73,30 @@ async def get_db() -> AsyncGenerator[asyncpg.Connection, None]:
         yield connection
 
 
+async def get_connection() -> AsyncGenerator[asyncpg.Connection, None]:
+    """
+    FastAPI dependency yielding a pooled connection for the request.
+
+    FastAPI caches dependencies per request, so every repository a handler
+    builds shares this one acquire. Waiting for a free connection is bounded
+    by DB_POOL_TIMEOUT so an exhausted pool fails fast with 503 instead of
+    queueing requests until the command timeout.
+    """
+    pool = get_pool()
+    try:
+        connection = await pool.acquire(timeout=settings.db_pool_timeout)
+    except asyncio.TimeoutError as e:
+        logger.warning("database_pool_exhausted", timeout=settings.db_pool_timeout)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database connection pool exhausted",
+        ) from e
+    try:
+        yield connection
+    finally:
+        await pool.release(connection)
+
+
 @asynccontextmanager
 async def transaction() -> AsyncGenerator[asyncpg.Connection, None]:
     """Get a database connection with an active transaction."""
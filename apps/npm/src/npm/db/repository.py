@@ -1,15 +1,17 @@
 """Database repositories for NPM entities."""
 
+import json
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import UUID
 
-from asyncpg import Connection
+from asyncpg import Connection, Record
+from pydantic import TypeAdapter
 
 from ..models.device import Device, DeviceCreate, DeviceUpdate, DeviceStatus, DeviceWithInterfaces, LatestDeviceMetrics
 from ..models.interface import Interface, InterfaceCreate, InterfaceUpdate, InterfaceStatus
 from ..models.alert import (
-    Alert, AlertCreate, AlertUpdate, AlertStatus,
+    Alert, AlertCreate, AlertUpdate, AlertStatus, AlertSeverity, AlertWithContext,
     AlertRule, AlertRuleCreate, AlertRuleUpdate
 )
 from ..core.logging import get_logger
@@ -450,6 +452,69 @@ class InterfaceRepository:
         return _row_to_dict(row) if row else {}
 
 
+# Alert and alert rule columns in model field order. UUIDs are cast to text in
+# SQL so rows validate straight into the models without a per-row fix-up pass.
+_ALERT_RULE_COLUMNS = """id::text AS id, name, description, metric_type, condition,
+                   threshold, duration_seconds, severity, is_active,
+                   created_by::text AS created_by, created_at, updated_at"""
+
+
+def _alert_columns(table: str = "") -> str:
+    """Alert select list, optionally qualified with a table alias."""
+    p = f"{table}." if table else ""
+    return f"""{p}id::text AS id, {p}rule_id::text AS rule_id,
+                   {p}device_id::text AS device_id, {p}interface_id::text AS interface_id,
+                   {p}message, {p}severity, {p}status, {p}triggered_at, {p}acknowledged_at,
+                   {p}acknowledged_by::text AS acknowledged_by, {p}resolved_at, {p}details"""
+
+
+_ALERT_COLUMNS = _alert_columns()
+_ALERT_CONTEXT_COLUMNS = _alert_columns("a")
+
+# Whole pages are validated in one pydantic-core call instead of a Python loop
+_ALERT_RULE_LIST = TypeAdapter(list[AlertRule])
+
+
+def _alert_fields(row: Record) -> dict[str, Any]:
+    """
+    Read an alert row selected with _alert_columns() by column position.
+
+    The SQL already yields model-ready types, so only the enums and the JSONB
+    details (returned as text) need converting before model_construct.
+    """
+    details = row[11]
+    return {
+        "id": row[0],
+        "rule_id": row[1],
+        "device_id": row[2],
+        "interface_id": row[3],
+        "message": row[4],
+        "severity": AlertSeverity(row[5]),
+        "status": AlertStatus(row[6]) if row[6] else AlertStatus.ACTIVE,
+        "triggered_at": row[7],
+        "acknowledged_at": row[8],
+        "acknowledged_by": row[9],
+        "resolved_at": row[10],
+        "details": json.loads(details) if details is not None else None,
+    }
+
+
+def _alert_from_row(row: Record) -> Alert:
+    """Build an Alert from a trusted row without re-validating it."""
+    return Alert.model_construct(**_alert_fields(row))
+
+
+def _alert_with_context_from_row(row: Record) -> AlertWithContext:
+    """Build an AlertWithContext from a row selected by find_all_with_context."""
+    return AlertWithContext.model_construct(
+        **_alert_fields(row),
+        device_name=row[12],
+        device_ip=row[13],
+        interface_name=row[14],
+        rule_name=row[15],
+    )
+
+
 class AlertRuleRepository:
     """Repository for alert rule operations."""
 
@@ -466,39 +531,33 @@ class AlertRuleRepository:
             params.append(is_active)
 
         query = f"""
-            SELECT id, name, description, metric_type, condition, threshold,
-                   duration_seconds, severity, is_active, created_by,
-                   created_at, updated_at
+            SELECT {_ALERT_RULE_COLUMNS}
             FROM npm.alert_rules
             {where_clause}
             ORDER BY name
         """
         rows = await self.conn.fetch(query, *params)
-        return [AlertRule(**_row_to_dict(row)) for row in rows]
+        return _ALERT_RULE_LIST.validate_python([dict(row) for row in rows])
 
     async def find_by_id(self, rule_id: str) -> AlertRule | None:
         """Find an alert rule by ID."""
-        query = """
-            SELECT id, name, description, metric_type, condition, threshold,
-                   duration_seconds, severity, is_active, created_by,
-                   created_at, updated_at
+        query = f"""
+            SELECT {_ALERT_RULE_COLUMNS}
             FROM npm.alert_rules
             WHERE id = $1
         """
         row = await self.conn.fetchrow(query, UUID(rule_id))
-        return AlertRule(**_row_to_dict(row)) if row else None
+        return AlertRule.model_validate(dict(row)) if row else None
 
     async def create(self, data: AlertRuleCreate, created_by: str | None = None) -> AlertRule:
         """Create a new alert rule."""
-        query = """
+        query = f"""
             INSERT INTO npm.alert_rules (
                 name, description, metric_type, condition, threshold,
                 duration_seconds, severity, is_active, created_by
             )
             VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
-            RETURNING id, name, description, metric_type, condition, threshold,
-                      duration_seconds, severity, is_active, created_by,
-                      created_at, updated_at
+            RETURNING {_ALERT_RULE_COLUMNS}
         """
         row = await self.conn.fetchrow(
             query,
@@ -513,7 +572,7 @@ class AlertRuleRepository:
             UUID(created_by) if created_by else None,
         )
         logger.info("alert_rule_created", rule_id=str(row["id"]), name=data.name)
-        return AlertRule(**_row_to_dict(row))
+        return AlertRule.model_validate(dict(row))
 
     async def update(self, rule_id: str, data: AlertRuleUpdate) -> AlertRule | None:
         """Update an existing alert rule."""
@@ -538,14 +597,12 @@ class AlertRuleRepository:
             UPDATE npm.alert_rules
             SET {', '.join(updates)}, updated_at = NOW()
             WHERE id = $1
-            RETURNING id, name, description, metric_type, condition, threshold,
-                      duration_seconds, severity, is_active, created_by,
-                      created_at, updated_at
+            RETURNING {_ALERT_RULE_COLUMNS}
         """
         row = await self.conn.fetchrow(query, *params)
         if row:
             logger.info("alert_rule_updated", rule_id=rule_id)
-        return AlertRule(**_row_to_dict(row)) if row else None
+        return AlertRule.model_validate(dict(row)) if row else None
 
     async def delete(self, rule_id: str) -> bool:
         """Delete an alert rule by ID."""
@@ -563,82 +620,181 @@ class AlertRepository:
     def __init__(self, conn: Connection) -> None:
         self.conn = conn
 
-    async def find_all(
-        self,
-        page: int = 1,
-        limit: int = 20,
-        status: AlertStatus | None = None,
-        severity: str | None = None,
-        device_id: str | None = None,
-    ) -> tuple[list[Alert], int]:
-        """Find all alerts with pagination and optional filters."""
+    @staticmethod
+    def _filters(
+        status: AlertStatus | None,
+        severity: AlertSeverity | None,
+        device_id: str | None,
+        prefix: str = "",
+    ) -> tuple[str, list[Any]]:
+        """Build the WHERE clause and parameters for alert list filters."""
         where_clauses = []
         params: list[Any] = []
         param_idx = 1
 
+        # AlertStatus/AlertSeverity are str enums, so asyncpg binds them as
+        # text directly; no .value unwrapping is needed
         if status:
-            where_clauses.append(f"status = ${param_idx}")
-            params.append(status.value)
+            where_clauses.append(f"{prefix}status = ${param_idx}")
+            params.append(status)
             param_idx += 1
 
         if severity:
-            where_clauses.append(f"severity = ${param_idx}")
+            where_clauses.append(f"{prefix}severity = ${param_idx}")
             params.append(severity)
             param_idx += 1
 
         if device_id:
-            where_clauses.append(f"device_id = ${param_idx}")
+            where_clauses.append(f"{prefix}device_id = ${param_idx}")
             params.append(UUID(device_id))
             param_idx += 1
 
         where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+        return where_sql, params
 
-        # Get total count
-        count_sql = f"SELECT COUNT(*) FROM npm.alerts {where_sql}"
-        total = await self.conn.fetchval(count_sql, *params)
+    async def _count(self, where_sql: str, params: list[Any]) -> int:
+        """Count alerts matching a filter built by _filters."""
+        return await self.conn.fetchval(f"SELECT COUNT(*) FROM npm.alerts {where_sql}", *params)
 
-        # Get paginated results
-        offset = (page - 1) * limit
-        params.extend([limit, offset])
+    async def find_all(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        status: AlertStatus | None = None,
+        severity: AlertSeverity | None = None,
+        device_id: str | None = None,
+    ) -> tuple[list[Alert], int]:
+        """Find all alerts with pagination and optional filters."""
+        where_sql, params = self._filters(status, severity, device_id)
+        param_idx = len(params) + 1
 
+        # Page and total count in one round trip; the window count is computed
+        # over the filtered set before LIMIT/OFFSET apply
+        offset = (page - 1) * limit
         query = f"""
-            SELECT id, rule_id, device_id, interface_id, message, severity,
-                   status, triggered_at, acknowledged_at, acknowledged_by,
-                   resolved_at, details
+            SELECT {_ALERT_COLUMNS}, COUNT(*) OVER() AS total
             FROM npm.alerts
             {where_sql}
             ORDER BY triggered_at DESC
             LIMIT ${param_idx} OFFSET ${param_idx + 1}
         """
 
+        rows = await self.conn.fetch(query, *params, limit, offset)
+        if rows:
+            total = rows[0]["total"]
+        elif offset:
+            # Past the last page there is no row to carry the count
+            total = await self._count(where_sql, params)
+        else:
+            total = 0
+
+        alerts = [_alert_from_row(row) for row in rows]
+
+        return alerts, total
+
+    async def find_all_with_context(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        status: AlertStatus | None = None,
+        severity: AlertSeverity | None = None,
+        device_id: str | None = None,
+    ) -> tuple[list[AlertWithContext], int]:
+        """
+        Find alerts with device, interface and rule names joined in.
+
+        One query returns the page, its related names and the total count, so
+        listing N alerts never costs N follow-up lookups.
+        """
+        query, params = self._context_query(page, limit, status, severity, device_id)
+
         rows = await self.conn.fetch(query, *params)
-        alerts = [Alert(**_row_to_dict(row)) for row in rows]
+        if rows:
+            total = rows[0]["total"]
+        elif page > 1:
+            total = await self.count(status, severity, device_id)
+        else:
+            total = 0
+
+        alerts = [_alert_with_context_from_row(row) for row in rows]
 
         return alerts, total
 
+    async def iter_with_context(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        status: AlertStatus | None = None,
+        severity: AlertSeverity | None = None,
+        device_id: str | None = None,
+    ) -> AsyncIterator[tuple[AlertWithContext, int]]:
+        """
+        Yield (alert, total) pairs for a page from a server-side cursor.
+
+        Rows are decoded as they arrive instead of materializing the page.
+        Must be called inside a transaction.
+        """
+        query, params = self._context_query(page, limit, status, severity, device_id)
+        async for row in self.conn.cursor(query, *params):
+            yield _alert_with_context_from_row(row), row["total"]
+
+    async def count(
+        self,
+        status: AlertStatus | None = None,
+        severity: AlertSeverity | None = None,
+        device_id: str | None = None,
+    ) -> int:
+        """Count alerts matching the list filters."""
+        where_sql, params = self._filters(status, severity, device_id)
+        return await self._count(where_sql, params)
+
+    def _context_query(
+        self,
+        page: int,
+        limit: int,
+        status: AlertStatus | None,
+        severity: AlertSeverity | None,
+        device_id: str | None,
+    ) -> tuple[str, list[Any]]:
+        """Build the joined, windowed page query used by the context listings."""
+        where_sql, params = self._filters(status, severity, device_id, prefix="a.")
+        param_idx = len(params) + 1
+        params.extend([limit, (page - 1) * limit])
+
+        query = f"""
+            SELECT {_ALERT_CONTEXT_COLUMNS},
+                   d.name AS device_name, host(d.ip_address) AS device_ip,
+                   i.name AS interface_name, r.name AS rule_name,
+                   COUNT(*) OVER() AS total
+            FROM npm.alerts a
+            LEFT JOIN npm.devices d ON d.id = a.device_id
+            LEFT JOIN npm.interfaces i ON i.id = a.interface_id
+            LEFT JOIN npm.alert_rules r ON r.id = a.rule_id
+            {where_sql}
+            ORDER BY a.triggered_at DESC
+            LIMIT ${param_idx} OFFSET ${param_idx + 1}
+        """
+        return query, params
+
     async def find_by_id(self, alert_id: str) -> Alert | None:
         """Find an alert by ID."""
-        query = """
-            SELECT id, rule_id, device_id, interface_id, message, severity,
-                   status, triggered_at, acknowledged_at, acknowledged_by,
-                   resolved_at, details
+        query = f"""
+            SELECT {_ALERT_COLUMNS}
             FROM npm.alerts
             WHERE id = $1
         """
         row = await self.conn.fetchrow(query, UUID(alert_id))
-        return Alert(**_row_to_dict(row)) if row else None
+        return _alert_from_row(row) if row else None
 
     async def create(self, data: AlertCreate) -> Alert:
         """Create a new alert."""
-        query = """
+        query = f"""
             INSERT INTO npm.alerts (
                 rule_id, device_id, interface_id, message, severity,
                 status, triggered_at, details
             )
             VALUES ($1, $2, $3, $4, $5, 'active', NOW(), $6)
-            RETURNING id, rule_id, device_id, interface_id, message, severity,
-                      status, triggered_at, acknowledged_at, acknowledged_by,
-                      resolved_at, details
+            RETURNING {_ALERT_COLUMNS}
         """
         row = await self.conn.fetchrow(
             query,
@@ -647,10 +803,10 @@ class AlertRepository:
             UUID(data.interface_id) if data.interface_id else None,
             data.message,
             data.severity.value,
-            data.details,
+            json.dumps(data.details) if data.details is not None else None,
         )
         logger.info("alert_created", alert_id=str(row["id"]))
-        return Alert(**_row_to_dict(row))
+        return _alert_from_row(row)
 
     async def update_status(
         self,
@@ -675,14 +831,34 @@ class AlertRepository:
             UPDATE npm.alerts
             SET {', '.join(updates)}
             WHERE id = $1
-            RETURNING id, rule_id, device_id, interface_id, message, severity,
-                      status, triggered_at, acknowledged_at, acknowledged_by,
-                      resolved_at, details
+            RETURNING {_ALERT_COLUMNS}
         """
         row = await self.conn.fetchrow(query, *params)
         if row:
             logger.info("alert_status_updated", alert_id=alert_id, status=status.value)
-        return Alert(**_row_to_dict(row)) if row else None
+        return _alert_from_row(row) if row else None
+
+    async def acknowledge_many(
+        self,
+        alert_ids: list[str],
+        acknowledged_by: str | None = None,
+    ) -> list[Alert]:
+        """Acknowledge a set of alerts in one statement; returns those found."""
+        query = f"""
+            UPDATE npm.alerts
+            SET status = $2, acknowledged_at = NOW(), acknowledged_by = $3
+            WHERE id = ANY($1::uuid[])
+            RETURNING {_ALERT_COLUMNS}
+        """
+        rows = await self.conn.fetch(
+            query,
+            [UUID(alert_id) for alert_id in alert_ids],
+            AlertStatus.ACKNOWLEDGED.value,
+            UUID(acknowledged_by) if acknowledged_by else None,
+        )
+        if rows:
+            logger.info("alerts_acknowledged", count=len(rows))
+        return [_alert_from_row(row) for row in rows]
 
     async def get_active_count(self) -> dict[str, int]:
         """Get count of active alerts by severity."""
@@ -700,13 +876,11 @@ class AlertRepository:
 
     async def get_recent(self, limit: int = 10) -> list[Alert]:
         """Get recent alerts."""
-        query = """
-            SELECT id, rule_id, device_id, interface_id, message, severity,
-                   status, triggered_at, acknowledged_at, acknowledged_by,
-                   resolved_at, details
+        query = f"""
+            SELECT {_ALERT_COLUMNS}
             FROM npm.alerts
             ORDER BY triggered_at DESC
             LIMIT $1
         """
         rows = await self.conn.fetch(query, limit)
-        return [Alert(**_row_to_dict(row)) for row in rows]
+        return [_alert_from_row(row) for row in rows]
@@ -9,6 +9,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
 from .core.logging import configure_logging, get_logger
+from .core.cache import init_cache, close_cache
 from .db.connection import init_db, close_db
 from .api import router, health_router
 from .collectors.nats_handler import NATSHandler
@@ -34,6 +35,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Initialize database pool
     await init_db()
+    await init_cache()
 
     # Connect to NATS
     try:
@@ -52,6 +54,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     if nats_handler:
         await nats_handler.disconnect()
 
+    await close_cache()
     await close_db()
 
 
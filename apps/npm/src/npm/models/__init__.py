@@ -14,6 +14,7 @@ from .alert import (
     Alert,
     AlertCreate,
     AlertUpdate,
+    AlertBulkAcknowledge,
     AlertRule,
     AlertRuleCreate,
     AlertRuleUpdate,
@@ -51,6 +52,7 @@ __all__ = [
     "Alert",
     "AlertCreate",
     "AlertUpdate",
+    "AlertBulkAcknowledge",
     "AlertRule",
     "AlertRuleCreate",
     "AlertRuleUpdate",
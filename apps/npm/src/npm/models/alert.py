@@ -111,6 +111,12 @@ class AlertUpdate(BaseModel):
     acknowledged_by: str | None = None
 
 
+class AlertBulkAcknowledge(BaseModel):
+    """Model for acknowledging several alerts in one request."""
+
+    ids: list[str] = Field(..., min_length=1, max_length=500)
+
+
 class Alert(AlertBase):
     """Full alert model with all fields."""
 
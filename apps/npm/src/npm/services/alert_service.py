@@ -1,9 +1,13 @@
 """Alert evaluation service for NPM."""
 
 import asyncio
+import operator
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
+from ..core.cache import (
+    init_cache, close_cache, alert_cache_key, cache_delete, invalidate_dashboard
+)
 from ..core.config import settings
 from ..core.logging import get_logger, configure_logging
 from ..db import init_db, close_db, get_db, AlertRepository, AlertRuleRepository, DeviceRepository
@@ -12,6 +16,17 @@ from .metrics import MetricsService
 
 logger = get_logger(__name__)
 
+# Rule conditions resolve to a comparison function once per rule instead of
+# walking an if/elif chain for every metric sample
+_CONDITION_OPS: dict[ConditionType, Callable[[float, float], bool]] = {
+    ConditionType.GREATER_THAN: operator.gt,
+    ConditionType.LESS_THAN: operator.lt,
+    ConditionType.EQUAL: operator.eq,
+    ConditionType.NOT_EQUAL: operator.ne,
+    ConditionType.GREATER_EQUAL: operator.ge,
+    ConditionType.LESS_EQUAL: operator.le,
+}
+
 
 class AlertEvaluator:
     """Service for evaluating alert rules against current metrics."""
@@ -69,6 +84,8 @@ class AlertEvaluator:
         # Query current metric values from VictoriaMetrics
         metric_query = self._build_metric_query(rule.metric_type)
         results = await self.metrics_service.query_instant(metric_query)
+        compare = _CONDITION_OPS.get(rule.condition)
+        threshold = rule.threshold
 
         for result in results:
             metric = result.get("metric", {})
@@ -79,9 +96,7 @@ class AlertEvaluator:
             interface_id = metric.get("interface_id")
 
             # Check if condition is met
-            condition_met = self._check_condition(
-                current_value, rule.condition, rule.threshold
-            )
+            condition_met = compare is not None and compare(current_value, threshold)
 
             if condition_met:
                 await self._create_or_update_alert(
@@ -109,27 +124,6 @@ class AlertEvaluator:
         }
         return metric_queries.get(metric_type, metric_type)
 
-    def _check_condition(
-        self,
-        value: float,
-        condition: ConditionType,
-        threshold: float,
-    ) -> bool:
-        """Check if a condition is met."""
-        if condition == ConditionType.GREATER_THAN:
-            return value > threshold
-        elif condition == ConditionType.LESS_THAN:
-            return value < threshold
-        elif condition == ConditionType.EQUAL:
-            return value == threshold
-        elif condition == ConditionType.NOT_EQUAL:
-            return value != threshold
-        elif condition == ConditionType.GREATER_EQUAL:
-            return value >= threshold
-        elif condition == ConditionType.LESS_EQUAL:
-            return value <= threshold
-        return False
-
     async def _create_or_update_alert(
         self,
         rule: AlertRule,
@@ -171,6 +165,7 @@ class AlertEvaluator:
                 )
 
                 await alert_repo.create(alert_data)
+                await invalidate_dashboard()
                 logger.info(
                     "alert_created",
                     rule_id=rule.id,
@@ -196,11 +191,17 @@ class AlertEvaluator:
                 device_id=device_id,
             )
 
+            resolved = []
             for alert in existing_alerts:
                 if alert.rule_id == rule.id:
                     await alert_repo.update_status(alert.id, AlertStatus.RESOLVED)
+                    resolved.append(alert_cache_key(alert.id))
                     logger.info("alert_auto_resolved", alert_id=alert.id, rule_id=rule.id)
 
+        if resolved:
+            await cache_delete(*resolved)
+            await invalidate_dashboard()
+
     def _build_alert_message(self, rule: AlertRule, current_value: float) -> str:
         """Build a human-readable alert message."""
         condition_text = {
@@ -224,6 +225,7 @@ async def main() -> None:
     logger.info("starting_alert_service")
 
     await init_db()
+    await init_cache()
 
     evaluator = AlertEvaluator()
     await evaluator.start()
@@ -236,6 +238,7 @@ async def main() -> None:
         logger.info("shutting_down_alert_service")
     finally:
         await evaluator.stop()
+        await close_cache()
         await close_db()
 
 
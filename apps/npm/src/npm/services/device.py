@@ -1,12 +1,11 @@
 """Device service for business logic."""
 
-from math import ceil
-
 from ..db import get_db, DeviceRepository, InterfaceRepository, AlertRepository
 from ..models.device import Device, DeviceCreate, DeviceUpdate, DeviceWithInterfaces, DeviceStatus
 from ..models.interface import Interface, InterfaceUpdate
 from ..models.alert import Alert, AlertStatus
 from ..models.common import PaginatedResponse, Pagination
+from ..core.cache import alert_cache_key, cache_delete, invalidate_dashboard
 from ..core.logging import get_logger
 from .crypto import get_crypto_service
 
@@ -44,7 +43,7 @@ class DeviceService:
                     page=page,
                     limit=limit,
                     total=total,
-                    pages=ceil(total / limit) if total > 0 else 0,
+                    pages=(total + limit - 1) // limit,
                 ),
             )
 
@@ -137,19 +136,28 @@ class DeviceService:
 
     async def acknowledge_alert(self, alert_id: str, user_id: str) -> Alert | None:
         """Acknowledge an alert."""
+        alerts = await self.acknowledge_alerts([alert_id], user_id)
+        return alerts[0] if alerts else None
+
+    async def acknowledge_alerts(self, alert_ids: list[str], user_id: str) -> list[Alert]:
+        """Acknowledge several alerts in a single round trip."""
         async with get_db() as conn:
             repo = AlertRepository(conn)
-            return await repo.update_status(
-                alert_id,
-                AlertStatus.ACKNOWLEDGED,
-                acknowledged_by=user_id,
-            )
+            alerts = await repo.acknowledge_many(alert_ids, acknowledged_by=user_id)
+        if alerts:
+            await cache_delete(*(alert_cache_key(alert.id) for alert in alerts))
+            await invalidate_dashboard()
+        return alerts
 
     async def resolve_alert(self, alert_id: str) -> Alert | None:
         """Resolve an alert."""
         async with get_db() as conn:
             repo = AlertRepository(conn)
-            return await repo.update_status(alert_id, AlertStatus.RESOLVED)
+            alert = await repo.update_status(alert_id, AlertStatus.RESOLVED)
+        if alert:
+            await cache_delete(alert_cache_key(alert_id))
+            await invalidate_dashboard()
+        return alert
 
     async def get_active_devices_for_polling(self) -> list[Device]:
         """Get all active devices that should be polled."""
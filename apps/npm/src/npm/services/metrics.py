@@ -1,5 +1,6 @@
 """Metrics service for VictoriaMetrics integration."""
 
+import asyncio
 import httpx
 from datetime import datetime, timezone, timedelta
 from typing import Any
@@ -7,6 +8,7 @@ from typing import Any
 from ..core.config import settings
 from ..core.logging import get_logger
 from ..db import get_db, DeviceRepository, InterfaceRepository, AlertRepository
+from ..models.alert import Alert
 from ..models.metrics import (
     MetricPoint, MetricSeries, DeviceMetrics, InterfaceMetrics,
     DashboardStats, DashboardData, TopDevice, TopInterface
@@ -186,18 +188,19 @@ class MetricsService:
         start = start or (end - timedelta(hours=1))
 
         labels = {"device_id": device_id}
-        metrics = {}
-
-        for metric_name in [
+        metric_names = [
             "npm_device_cpu_utilization",
             "npm_device_memory_utilization",
             "npm_device_uptime_seconds",
-        ]:
-            metrics[metric_name] = await self.query_metric_history(
-                metric_name, labels, start, end, step
+        ]
+        series = await asyncio.gather(
+            *(
+                self.query_metric_history(metric_name, labels, start, end, step)
+                for metric_name in metric_names
             )
+        )
 
-        return metrics
+        return dict(zip(metric_names, series, strict=True))
 
     async def get_interface_metrics(
         self,
@@ -211,57 +214,74 @@ class MetricsService:
         start = start or (end - timedelta(hours=1))
 
         labels = {"interface_id": interface_id}
-        metrics = {}
-
-        for metric_name in [
+        metric_names = [
             "npm_interface_in_octets",
             "npm_interface_out_octets",
             "npm_interface_in_errors",
             "npm_interface_out_errors",
             "npm_interface_in_utilization",
             "npm_interface_out_utilization",
-        ]:
-            metrics[metric_name] = await self.query_metric_history(
-                metric_name, labels, start, end, step
+        ]
+        series = await asyncio.gather(
+            *(
+                self.query_metric_history(metric_name, labels, start, end, step)
+                for metric_name in metric_names
             )
+        )
 
-        return metrics
+        return dict(zip(metric_names, series, strict=True))
 
     async def get_dashboard_stats(self) -> DashboardStats:
         """Get aggregated statistics for the NPM dashboard."""
-        async with get_db() as conn:
-            device_repo = DeviceRepository(conn)
-            interface_repo = InterfaceRepository(conn)
-            alert_repo = AlertRepository(conn)
-
-            device_stats = await device_repo.get_stats()
-            interface_stats = await interface_repo.get_stats()
-            alert_counts = await alert_repo.get_active_count()
-
-            return DashboardStats(
-                total_devices=device_stats.get("total", 0),
-                devices_up=device_stats.get("up", 0),
-                devices_down=device_stats.get("down", 0),
-                devices_degraded=device_stats.get("degraded", 0),
-                total_interfaces=interface_stats.get("total", 0),
-                interfaces_up=interface_stats.get("up", 0),
-                interfaces_down=interface_stats.get("down", 0),
-                active_alerts=alert_counts.get("total", 0),
-                critical_alerts=alert_counts.get("critical", 0),
-                warning_alerts=alert_counts.get("warning", 0),
-            )
+        # Independent aggregates run concurrently, each on its own pooled
+        # connection (one connection cannot run overlapping queries)
+        async def device_stats() -> dict[str, int]:
+            async with get_db() as conn:
+                return await DeviceRepository(conn).get_stats()
+
+        async def interface_stats() -> dict[str, int]:
+            async with get_db() as conn:
+                return await InterfaceRepository(conn).get_stats()
+
+        async def alert_counts() -> dict[str, int]:
+            async with get_db() as conn:
+                return await AlertRepository(conn).get_active_count()
+
+        devices, interfaces, alerts = await asyncio.gather(
+            device_stats(), interface_stats(), alert_counts()
+        )
+
+        return DashboardStats(
+            total_devices=devices.get("total", 0),
+            devices_up=devices.get("up", 0),
+            devices_down=devices.get("down", 0),
+            devices_degraded=devices.get("degraded", 0),
+            total_interfaces=interfaces.get("total", 0),
+            interfaces_up=interfaces.get("up", 0),
+            interfaces_down=interfaces.get("down", 0),
+            active_alerts=alerts.get("total", 0),
+            critical_alerts=alerts.get("critical", 0),
+            warning_alerts=alerts.get("warning", 0),
+        )
 
     async def get_dashboard_data(self) -> DashboardData:
         """Get complete dashboard data including top metrics."""
-        stats = await self.get_dashboard_stats()
-
-        # Get recent alerts
-        async with get_db() as conn:
-            alert_repo = AlertRepository(conn)
-            recent_alerts = await alert_repo.get_recent(limit=10)
+        async def recent_alerts_query() -> list[Alert]:
+            async with get_db() as conn:
+                return await AlertRepository(conn).get_recent(limit=10)
+
+        # PostgreSQL aggregates, recent alerts and the VictoriaMetrics top-k
+        # queries are independent, so issue them all at once
+        stats, recent_alerts, top_cpu, top_util = await asyncio.gather(
+            self.get_dashboard_stats(),
+            recent_alerts_query(),
+            self.query_instant("topk(5, npm_device_cpu_utilization)"),
+            self.query_instant(
+                "topk(5, max(npm_interface_in_utilization, npm_interface_out_utilization))"
+            ),
+        )
 
-        # Query top devices by CPU (from VictoriaMetrics)
-        top_cpu = await self.query_instant("topk(5, npm_device_cpu_utilization)")
+        # Top devices by CPU (from VictoriaMetrics)
         top_devices_cpu = [
             TopDevice(
                 device_id=r.get("metric", {}).get("device_id", ""),
@@ -273,10 +293,7 @@ class MetricsService:
             for r in top_cpu
         ]
 
-        # Query top interfaces by utilization
-        top_util = await self.query_instant(
-            "topk(5, max(npm_interface_in_utilization, npm_interface_out_utilization))"
-        )
+        # Top interfaces by utilization
         top_interfaces = [
             TopInterface(
                 interface_id=r.get("metric", {}).get("interface_id", ""),
@@ -0,0 +1,145 @@
+"""Unit tests for bulk alert acknowledgement."""
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from npm.db.repository import AlertRepository
+from npm.models.alert import AlertBulkAcknowledge, AlertSeverity, AlertStatus
+from npm.services import device as device_module
+from npm.services.device import DeviceService
+
+
+def alert_row(alert_id: str, user_id: str) -> tuple:
+    """Row in _alert_columns() order, as returned by UPDATE ... RETURNING."""
+    now = datetime.now(UTC)
+    return (
+        alert_id, None, str(uuid4()), None,
+        "Device is no longer responding", AlertSeverity.CRITICAL.value,
+        AlertStatus.ACKNOWLEDGED.value, now, now, user_id, None, '{"source": "test"}',
+    )
+
+
+class FakeConnection:
+    """Records fetch() calls and answers with canned rows."""
+
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.calls: list[tuple] = []
+
+    async def fetch(self, query: str, *args):
+        self.calls.append((query, args))
+        return self.rows
+
+
+class TestAlertBulkAcknowledgeModel:
+    """Test request validation for POST /alerts/acknowledge."""
+
+    def test_accepts_ids(self):
+        assert AlertBulkAcknowledge(ids=["a", "b"]).ids == ["a", "b"]
+
+    def test_rejects_empty_list(self):
+        with pytest.raises(ValidationError):
+            AlertBulkAcknowledge(ids=[])
+
+    def test_rejects_more_than_500_ids(self):
+        with pytest.raises(ValidationError):
+            AlertBulkAcknowledge(ids=[str(uuid4()) for _ in range(501)])
+
+
+class TestAcknowledgeMany:
+    """Test AlertRepository.acknowledge_many."""
+
+    async def test_single_statement_for_all_ids(self):
+        """All IDs go out as one uuid[] parameter in a single UPDATE."""
+        user_id = str(uuid4())
+        alert_ids = [str(uuid4()) for _ in range(3)]
+        conn = FakeConnection([alert_row(alert_id, user_id) for alert_id in alert_ids])
+
+        alerts = await AlertRepository(conn).acknowledge_many(alert_ids, acknowledged_by=user_id)
+
+        assert len(conn.calls) == 1
+        query, args = conn.calls[0]
+        assert "ANY($1::uuid[])" in query
+        assert args == (
+            [UUID(alert_id) for alert_id in alert_ids],
+            AlertStatus.ACKNOWLEDGED.value,
+            UUID(user_id),
+        )
+        assert [alert.id for alert in alerts] == alert_ids
+        assert all(alert.status == AlertStatus.ACKNOWLEDGED for alert in alerts)
+        assert alerts[0].details == {"source": "test"}
+
+    async def test_without_user(self):
+        """acknowledged_by is optional and sent as NULL."""
+        conn = FakeConnection([])
+
+        alerts = await AlertRepository(conn).acknowledge_many([str(uuid4())])
+
+        assert alerts == []
+        assert conn.calls[0][1][2] is None
+
+
+class TestDeviceServiceAcknowledge:
+    """Test cache invalidation around bulk acknowledgement."""
+
+    @pytest.fixture
+    def deleted(self, monkeypatch: pytest.MonkeyPatch) -> list:
+        """Capture cache invalidations made by the service."""
+        calls: list = []
+
+        async def cache_delete(*keys: str) -> None:
+            calls.append(keys)
+
+        async def invalidate_dashboard() -> None:
+            calls.append("dashboard")
+
+        monkeypatch.setattr(device_module, "cache_delete", cache_delete)
+        monkeypatch.setattr(device_module, "invalidate_dashboard", invalidate_dashboard)
+        return calls
+
+    def use_rows(self, monkeypatch: pytest.MonkeyPatch, rows: list[tuple]) -> None:
+        @asynccontextmanager
+        async def get_db():
+            yield FakeConnection(rows)
+
+        monkeypatch.setattr(device_module, "get_db", get_db)
+
+    async def test_drops_cache_for_acknowledged_alerts(
+        self, monkeypatch: pytest.MonkeyPatch, deleted: list
+    ):
+        """Only alerts that were found are evicted, in one cache_delete call."""
+        user_id = str(uuid4())
+        found = [str(uuid4()), str(uuid4())]
+        self.use_rows(monkeypatch, [alert_row(alert_id, user_id) for alert_id in found])
+
+        alerts = await DeviceService().acknowledge_alerts([*found, str(uuid4())], user_id)
+
+        assert [alert.id for alert in alerts] == found
+        assert deleted == [
+            tuple(f"npm:alert:{alert_id}" for alert_id in found),
+            "dashboard",
+        ]
+
+    async def test_nothing_found_leaves_cache_alone(
+        self, monkeypatch: pytest.MonkeyPatch, deleted: list
+    ):
+        self.use_rows(monkeypatch, [])
+
+        assert await DeviceService().acknowledge_alerts([str(uuid4())], str(uuid4())) == []
+        assert deleted == []
+
+    async def test_single_acknowledge_delegates(
+        self, monkeypatch: pytest.MonkeyPatch, deleted: list
+    ):
+        """The per-alert endpoint returns the one alert, or None if missing."""
+        user_id = str(uuid4())
+        alert_id = str(uuid4())
+        self.use_rows(monkeypatch, [alert_row(alert_id, user_id)])
+        alert = await DeviceService().acknowledge_alert(alert_id, user_id)
+        assert alert is not None and alert.id == alert_id
+
+        self.use_rows(monkeypatch, [])
+        assert await DeviceService().acknowledge_alert(alert_id, user_id) is None
@@ -0,0 +1,173 @@
+"""Unit tests for the alert API handlers."""
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from npm.api import routes
+
+
+class FakeAlert:
+    """Alert that serializes to a fixed JSON object."""
+
+    def __init__(self, alert_id: str) -> None:
+        self.alert_id = alert_id
+
+    def model_dump_json(self) -> str:
+        return f'{{"id": "{self.alert_id}"}}'
+
+
+class FakeConnection:
+    """Connection standing in for one pool slot."""
+
+    def __init__(self, alerts: list[FakeAlert], total: int) -> None:
+        self.alerts = alerts
+        self.total = total
+        self.counted = False
+
+
+class FakeAlertRepository:
+    """AlertRepository reading its page from a FakeConnection."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    async def iter_with_context(self, page, limit, status, severity, device_id):
+        for alert in self.conn.alerts:
+            yield alert, self.conn.total
+
+    async def count(self, status, severity, device_id) -> int:
+        self.conn.counted = True
+        return self.conn.total
+
+    async def find_by_id(self, alert_id: str) -> FakeAlert | None:
+        return next((alert for alert in self.conn.alerts if alert.alert_id == alert_id), None)
+
+
+class FakePool:
+    """Tracks how many connections are checked out at once."""
+
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+        self.active = self.peak = 0
+
+    @asynccontextmanager
+    async def acquire(self):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            yield self.conn
+        finally:
+            self.active -= 1
+
+
+def install(monkeypatch: pytest.MonkeyPatch, pool: FakePool) -> None:
+    monkeypatch.setattr(routes, "AlertRepository", FakeAlertRepository)
+    monkeypatch.setattr(routes, "transaction", pool.acquire)
+    monkeypatch.setattr(routes, "get_db", pool.acquire)
+
+
+async def list_ndjson(page: int) -> tuple[dict, bytes]:
+    response = await routes.list_alerts(
+        page=page, limit=2, status=None, severity=None, device_id=None,
+        format="ndjson", _user=None,
+    )
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    return response.headers, body
+
+
+class TestStreamAlerts:
+    """Test the NDJSON alert listing."""
+
+    async def test_streams_page_on_one_connection(self, monkeypatch):
+        pool = FakePool(FakeConnection([FakeAlert("a"), FakeAlert("b")], total=5))
+        install(monkeypatch, pool)
+
+        headers, body = await list_ndjson(page=1)
+
+        assert body == b'{"id": "a"}\n{"id": "b"}\n'
+        assert headers["X-Total-Count"] == "5"
+        assert headers["X-Pages"] == "3"
+        assert pool.peak == 1
+        assert pool.active == 0
+
+    async def test_page_past_the_end_counts_on_stream_connection(self, monkeypatch):
+        conn = FakeConnection([], total=3)
+        pool = FakePool(conn)
+        install(monkeypatch, pool)
+
+        headers, body = await list_ndjson(page=4)
+
+        assert body == b""
+        assert headers["X-Total-Count"] == "3"
+        assert conn.counted
+        assert pool.peak == 1
+        assert pool.active == 0
+
+    async def test_empty_first_page_skips_count(self, monkeypatch):
+        conn = FakeConnection([], total=0)
+        install(monkeypatch, FakePool(conn))
+
+        headers, body = await list_ndjson(page=1)
+
+        assert body == b""
+        assert headers["X-Total-Count"] == "0"
+        assert not conn.counted
+
+    async def test_failed_first_fetch_releases_connection(self, monkeypatch):
+        pool = FakePool(FakeConnection([], total=0))
+        install(monkeypatch, pool)
+
+        async def failing(self, page, limit, status, severity, device_id):
+            raise ConnectionError("connection lost")
+            yield
+
+        monkeypatch.setattr(FakeAlertRepository, "iter_with_context", failing)
+
+        with pytest.raises(ConnectionError):
+            await list_ndjson(page=1)
+        assert pool.active == 0
+
+
+class TestGetAlert:
+    """Test that cached alerts are served without a database connection."""
+
+    @pytest.fixture
+    def cache(self, monkeypatch: pytest.MonkeyPatch) -> dict[str, str]:
+        entries: dict[str, str] = {}
+
+        async def cache_get(key: str) -> str | None:
+            return entries.get(key)
+
+        async def cache_set(key: str, value: str, ttl: int) -> None:
+            entries[key] = value
+
+        monkeypatch.setattr(routes, "cache_get", cache_get)
+        monkeypatch.setattr(routes, "cache_set", cache_set)
+        return entries
+
+    async def test_miss_reads_and_caches_alert(self, monkeypatch, cache):
+        pool = FakePool(FakeConnection([FakeAlert("a")], total=1))
+        install(monkeypatch, pool)
+
+        result = await routes.get_alert(
+            "a", SimpleNamespace(headers={}), Response(), _user=None
+        )
+
+        assert result.data.alert_id == "a"
+        assert cache == {routes.alert_cache_key("a"): '{"id": "a"}'}
+        assert pool.peak == 1
+        assert pool.active == 0
+
+    async def test_hit_does_not_acquire_connection(self, monkeypatch, cache):
+        pool = FakePool(FakeConnection([], total=0))
+        install(monkeypatch, pool)
+        payload = '{"id": "a"}'
+        cache[routes.alert_cache_key("a")] = payload
+        request = SimpleNamespace(headers={"if-none-match": routes._etag(payload)})
+
+        result = await routes.get_alert("a", request, Response(), _user=None)
+
+        assert result.status_code == 304
+        assert pool.peak == 0
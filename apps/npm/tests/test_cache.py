@@ -0,0 +1,104 @@
+"""Unit tests for the in-process tier of the response cache."""
+import pytest
+
+from npm.core import cache
+from npm.core.cache import _LocalCache
+
+
+class FakeClock:
+    """Stands in for time.monotonic so TTLs can be stepped through."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    fake = FakeClock()
+    monkeypatch.setattr(cache, "monotonic", fake)
+    return fake
+
+
+class TestLocalCache:
+    """Test TTL expiry and eviction of _LocalCache."""
+
+    def test_get_returns_value_until_ttl_expires(self, clock: FakeClock):
+        """Entries are served until their TTL passes, then dropped."""
+        local = _LocalCache(maxsize=10, ttl=5.0)
+        local.set("key", "value", ttl=5)
+
+        clock.now += 4.9
+        assert local.get("key") == "value"
+
+        clock.now += 0.2
+        assert local.get("key") is None
+        assert "key" not in local._data
+
+    def test_ttl_is_capped_by_local_ttl(self, clock: FakeClock):
+        """A longer Redis TTL does not keep the local copy alive longer."""
+        local = _LocalCache(maxsize=10, ttl=5.0)
+        local.set("key", "value", ttl=300)
+
+        clock.now += 5.1
+        assert local.get("key") is None
+
+    def test_shorter_ttl_is_kept(self, clock: FakeClock):
+        """A TTL below the local cap is honoured."""
+        local = _LocalCache(maxsize=10, ttl=5.0)
+        local.set("key", "value", ttl=1)
+
+        clock.now += 1.1
+        assert local.get("key") is None
+
+    def test_evicts_oldest_entry_when_full(self, clock: FakeClock):
+        """The least recently written entry is evicted past maxsize."""
+        local = _LocalCache(maxsize=2, ttl=5.0)
+        local.set("a", "1", ttl=5)
+        local.set("b", "2", ttl=5)
+        local.set("a", "1", ttl=5)  # rewrite moves "a" to the newest position
+        local.set("c", "3", ttl=5)
+
+        assert local.get("b") is None
+        assert local.get("a") == "1"
+        assert local.get("c") == "3"
+
+    def test_pop_ignores_missing_keys(self, clock: FakeClock):
+        """pop() drops an entry and tolerates keys that are not cached."""
+        local = _LocalCache(maxsize=10, ttl=5.0)
+        local.set("key", "value", ttl=5)
+
+        local.pop("key")
+        local.pop("missing")
+        assert local.get("key") is None
+
+
+class TestCacheWithoutRedis:
+    """Test the module API when Redis has not been initialized."""
+
+    @pytest.fixture(autouse=True)
+    def local_only(self, monkeypatch: pytest.MonkeyPatch, clock: FakeClock) -> None:
+        monkeypatch.setattr(cache, "_redis", None)
+        monkeypatch.setattr(cache, "_local", _LocalCache(maxsize=10, ttl=5.0))
+
+    async def test_set_then_get_hits_local_tier(self):
+        """Values written while Redis is down are served from the local tier."""
+        await cache.cache_set("npm:test", "payload", ttl=30)
+
+        assert await cache.cache_get("npm:test") == "payload"
+
+    async def test_delete_drops_local_entries(self):
+        """cache_delete removes every given key from the local tier."""
+        await cache.cache_set(cache.DASHBOARD_CACHE_KEY, "dashboard", ttl=30)
+        await cache.cache_set(cache.DASHBOARD_STATS_CACHE_KEY, "stats", ttl=30)
+
+        await cache.invalidate_dashboard()
+
+        assert await cache.cache_get(cache.DASHBOARD_CACHE_KEY) is None
+        assert await cache.cache_get(cache.DASHBOARD_STATS_CACHE_KEY) is None
+
+    async def test_miss_returns_none(self):
+        """A key that was never cached is a miss."""
+        assert await cache.cache_get("npm:missing") is None
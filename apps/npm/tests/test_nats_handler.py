@@ -0,0 +1,181 @@
+"""Unit tests for NATS consumer acknowledgement and pipelined publishing."""
+import asyncio
+import json
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+from nats.js.api import AckPolicy
+
+from npm.collectors.nats_handler import NATSHandler
+
+
+class FakeMsg:
+    """JetStream message that records how it was settled."""
+
+    def __init__(self, payload: dict) -> None:
+        self.data = json.dumps(payload).encode()
+        self.settled = asyncio.Event()
+        self.result: str | None = None
+
+    async def ack(self) -> None:
+        self.result = "ack"
+        self.settled.set()
+
+    async def nak(self) -> None:
+        self.result = "nak"
+        self.settled.set()
+
+
+class FakeConsumer:
+    """Pull subscription that hands out the given batches, then times out."""
+
+    def __init__(self, batches: list[list[FakeMsg]]) -> None:
+        self.batches = list(batches)
+
+    async def fetch(self, batch: int, timeout: float) -> list[FakeMsg]:
+        if self.batches:
+            return self.batches.pop(0)
+        await asyncio.sleep(0.01)
+        raise TimeoutError
+
+
+class FakeJetStream:
+    """JetStream context returning prepared consumers in order."""
+
+    def __init__(self, *consumers: FakeConsumer) -> None:
+        self.consumers = list(consumers)
+        self.subscriptions: list[dict] = []
+
+    async def pull_subscribe(self, subject, durable=None, stream=None, config=None):
+        self.subscriptions.append(
+            {"durable": durable, "stream": stream, "config": replace(config)}
+        )
+        return self.consumers.pop(0)
+
+
+async def run_consumer(js: FakeJetStream, handler, messages: list[FakeMsg], **kwargs) -> None:
+    """Run a consumer until every message has been acked or nak'd."""
+    nats_handler = NATSHandler()
+    nats_handler.js = js
+    nats_handler._running = True
+    task = await nats_handler._create_consumer("npm.devices.status", "npm-status-handler", handler, **kwargs)
+    try:
+        await asyncio.wait_for(
+            asyncio.gather(*(msg.settled.wait() for msg in messages)), timeout=5
+        )
+    finally:
+        nats_handler._running = False
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestConsumerAcks:
+    """Test that each message is settled on its own handler result."""
+
+    async def test_mixed_batch_naks_only_failures(self):
+        """A failure naks that message alone; successes are acked, not re-run."""
+        messages = [FakeMsg({"device_id": str(i), "status": "up"}) for i in range(5)]
+        handled: list[str] = []
+
+        async def handler(data: dict) -> None:
+            handled.append(data["device_id"])
+            if data["device_id"] in ("1", "3"):
+                raise ValueError("boom")
+
+        js = FakeJetStream(FakeConsumer([messages]))
+        await run_consumer(js, handler, messages)
+
+        assert [msg.result for msg in messages] == ["ack", "nak", "ack", "nak", "ack"]
+        assert sorted(handled) == ["0", "1", "2", "3", "4"]
+        assert js.subscriptions[0]["config"].ack_policy == AckPolicy.EXPLICIT
+
+    async def test_batch_handlers_run_concurrently_up_to_limit(self):
+        """Handlers for one batch overlap, but never beyond max_concurrency."""
+        messages = [FakeMsg({"device_id": str(i), "status": "up"}) for i in range(6)]
+        running = peak = 0
+
+        async def handler(data: dict) -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        js = FakeJetStream(FakeConsumer([messages]))
+        await run_consumer(js, handler, messages, max_concurrency=3)
+
+        assert peak == 3
+        assert [msg.result for msg in messages] == ["ack"] * 6
+
+    async def test_messages_missing_required_keys_are_acked_unparsed(self):
+        messages = [FakeMsg({"device_id": "a"}), FakeMsg({"device_id": "b", "status": "up"})]
+        handled: list[dict] = []
+
+        async def handler(data: dict) -> None:
+            handled.append(data)
+
+        js = FakeJetStream(FakeConsumer([messages]))
+        await run_consumer(js, handler, messages, required_keys=(b'"device_id"', b'"status"'))
+
+        assert [msg.result for msg in messages] == ["ack", "ack"]
+        assert handled == [{"device_id": "b", "status": "up"}]
+
+    async def test_failure_in_first_batch_not_covered_by_next(self):
+        """With a prefetched second batch, the first batch's nak stands."""
+        first = [FakeMsg({"device_id": "bad", "status": "down"}), FakeMsg({"device_id": "a", "status": "up"})]
+        second = [FakeMsg({"device_id": "b", "status": "up"})]
+
+        async def handler(data: dict) -> None:
+            if data["device_id"] == "bad":
+                raise ValueError("boom")
+
+        js = FakeJetStream(FakeConsumer([first, second]))
+        await run_consumer(js, handler, first + second, prefetch=1)
+
+        assert [msg.result for msg in first + second] == ["nak", "ack", "ack"]
+
+
+class FakePublishJetStream:
+    """JetStream context whose publish_async acks are resolved by the test."""
+
+    def __init__(self) -> None:
+        self.published: list[tuple[str, bytes]] = []
+        self.futures: list[asyncio.Future] = []
+
+    async def publish_async(self, subject: str, payload: bytes, wait_stall=None) -> asyncio.Future:
+        self.published.append((subject, payload))
+        future = asyncio.get_running_loop().create_future()
+        self.futures.append(future)
+        return future
+
+
+class TestPublishMetricsBatch:
+    """Test pipelined metrics publishing."""
+
+    async def test_sends_all_before_awaiting_acks(self):
+        js = FakePublishJetStream()
+        nats_handler = NATSHandler()
+        nats_handler.js = js
+
+        publish = asyncio.create_task(nats_handler.publish_metrics_batch(
+            [{"type": "device", "value": 1}, {"value": 2}]
+        ))
+        await asyncio.sleep(0)
+        assert [subject for subject, _ in js.published] == ["npm.metrics.device", "npm.metrics.generic"]
+        assert not publish.done()
+
+        for future in js.futures:
+            future.set_result(SimpleNamespace(seq=1))
+        await publish
+
+    async def test_lost_acks_time_out_and_are_cancelled(self):
+        """Unanswered acks raise after the timeout instead of hanging."""
+        js = FakePublishJetStream()
+        nats_handler = NATSHandler()
+        nats_handler.js = js
+
+        with pytest.raises(asyncio.TimeoutError):
+            await nats_handler.publish_metrics_batch([{"value": 1}, {"value": 2}], timeout=0.05)
+
+        assert all(future.cancelled() for future in js.futures)
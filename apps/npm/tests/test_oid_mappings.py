@@ -0,0 +1,82 @@
+"""Unit tests for vendor detection and the OID tables."""
+import pytest
+
+from npm.collectors.oid_mappings import (
+    STANDARD_OIDS,
+    VendorType,
+    detect_vendor_from_sys_object_id,
+    get_all_oids_for_vendor,
+    get_vendor_oids,
+    oid_to_tuple,
+)
+
+
+class TestDetectVendor:
+    """Test sysObjectID matching on whole OID components."""
+
+    @pytest.mark.parametrize(
+        ("sys_object_id", "vendor"),
+        [
+            ("1.3.6.1.4.1.30065.1.3011.7048", VendorType.ARISTA),
+            ("1.3.6.1.4.1.2636.1.1.1.2.29", VendorType.JUNIPER),
+            ("1.3.6.1.4.1.8072.3.2.10", VendorType.LINUX),
+            ("1.3.6.1.4.1.2604.5", VendorType.SOPHOS),
+            ("1.3.6.1.4.1.21067.2", VendorType.SOPHOS),
+            ("1.3.6.1.4.1.2604", VendorType.SOPHOS),
+            (".1.3.6.1.4.1.2636.1.1", VendorType.JUNIPER),
+        ],
+    )
+    def test_known_prefixes(self, sys_object_id: str, vendor: VendorType):
+        assert detect_vendor_from_sys_object_id(sys_object_id) == vendor
+
+    @pytest.mark.parametrize(
+        "sys_object_id",
+        [
+            "1.3.6.1.4.1.26041.1",   # shares the digits of Sophos' 2604
+            "1.3.6.1.4.1.263.1",     # prefix of Juniper's 2636
+            "1.3.6.1.4.1.80721.1",   # Net-SNMP's 8072 plus a digit
+            "1.3.6.1.4.1.9.1.1",
+            "",
+        ],
+    )
+    def test_partial_component_is_not_a_match(self, sys_object_id: str):
+        assert detect_vendor_from_sys_object_id(sys_object_id) == VendorType.GENERIC
+
+
+class TestVendorTables:
+    """Test merged and read-only vendor tables."""
+
+    def test_merge_keeps_standard_table_intact(self):
+        standard_system = dict(STANDARD_OIDS["system"])
+
+        for vendor in VendorType:
+            get_all_oids_for_vendor(vendor)
+
+        assert dict(STANDARD_OIDS["system"]) == standard_system
+
+    def test_merged_table_contains_standard_and_vendor_oids(self):
+        merged = get_all_oids_for_vendor(VendorType.JUNIPER)
+
+        for category, definitions in STANDARD_OIDS.items():
+            assert set(definitions) <= set(merged[category])
+        for category, definitions in get_vendor_oids(VendorType.JUNIPER).items():
+            assert set(definitions) <= set(merged[category])
+
+    def test_tables_are_read_only(self):
+        with pytest.raises(TypeError):
+            STANDARD_OIDS["system"]["sysDescr"] = None
+        with pytest.raises(TypeError):
+            get_all_oids_for_vendor(VendorType.LINUX)["system"] = {}
+
+    def test_vendor_without_table_gets_empty_mapping(self):
+        assert dict(get_vendor_oids(VendorType.GENERIC)) == {}
+
+
+class TestOidToTuple:
+    """Test dotted OID parsing."""
+
+    def test_oid_to_tuple(self):
+        assert oid_to_tuple("1.3.6.1.2.1.1.3.0") == (1, 3, 6, 1, 2, 1, 1, 3, 0)
+
+    def test_oid_to_tuple_strips_leading_dot(self):
+        assert oid_to_tuple(".1.3.6.1") == (1, 3, 6, 1)
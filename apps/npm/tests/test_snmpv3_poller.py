@@ -0,0 +1,158 @@
+"""Unit tests for packed SNMPv3 GETs."""
+from dataclasses import replace
+from datetime import UTC, datetime
+
+import pytest
+from pyasn1.type.univ import Integer
+from pysnmp.proto.rfc1905 import NoSuchInstance, NoSuchObject
+
+from npm.collectors import snmpv3_poller
+from npm.collectors.snmpv3_poller import (
+    _MAX_GET_VARBINDS,
+    SNMPv3Client,
+    SNMPv3Credential,
+    _column_int,
+    _object_type,
+    _to_int,
+)
+
+CREDENTIAL = SNMPv3Credential(
+    username="monitor",
+    security_level="authPriv",
+    auth_protocol="SHA-256",
+    auth_password="auth-password",
+    priv_protocol="AES-128",
+    priv_password="priv-password",
+    credential_id="5d0f6c5e-0c1a-4f8e-9d7b-2a4c3e1f0b6d",
+    updated_at=datetime(2024, 1, 1, tzinfo=UTC),
+)
+
+GEN_ERR = Integer(5)
+
+
+class FakeAgent:
+    """Answers get_cmd calls for ``oids`` from a table of OID values."""
+
+    def __init__(
+        self, oids: list[str], values: dict[str, object], bad: frozenset[str] = frozenset()
+    ) -> None:
+        # get_multiple sends the shared varbind for each OID, so map them back
+        self.oid_by_varbind = {id(_object_type(oid)): oid for oid in oids}
+        self.values = values
+        self.bad = bad
+        self.requests: list[list[str]] = []
+        self.error_indication: str | None = None
+
+    async def get_cmd(self, engine, user_data, transport, context, *var_binds):
+        oids = [self.oid_by_varbind[id(var_bind)] for var_bind in var_binds]
+        self.requests.append(oids)
+        if self.error_indication:
+            return self.error_indication, 0, 0, ()
+        if any(oid in self.bad for oid in oids):
+            # Agents reject the whole PDU when one varbind fails
+            return None, GEN_ERR, 1, ()
+        return None, 0, 0, tuple((oid, self.values.get(oid, NoSuchInstance())) for oid in oids)
+
+
+@pytest.fixture
+def client() -> SNMPv3Client:
+    return SNMPv3Client()
+
+
+def install(monkeypatch: pytest.MonkeyPatch, agent: FakeAgent) -> None:
+    monkeypatch.setattr(snmpv3_poller, "get_cmd", agent.get_cmd)
+
+
+class TestGetMultiple:
+    """Test SNMPv3Client.get_multiple request packing."""
+
+    async def test_packs_oids_into_requests(self, monkeypatch, client):
+        oids = [f"1.3.6.1.2.1.2.2.1.10.{index}" for index in range(1, 46)]
+        agent = FakeAgent(oids, {oid: Integer(index) for index, oid in enumerate(oids)})
+        install(monkeypatch, agent)
+
+        results = await client.get_multiple("127.0.0.1", 161, CREDENTIAL, oids)
+
+        assert [len(request) for request in agent.requests] == [
+            _MAX_GET_VARBINDS, _MAX_GET_VARBINDS, 45 - 2 * _MAX_GET_VARBINDS,
+        ]
+        assert [oid for request in agent.requests for oid in request] == oids
+        assert list(results) == oids
+        assert [int(value) for value in results.values()] == list(range(45))
+
+    async def test_missing_values_map_to_none(self, monkeypatch, client):
+        oids = ["1.3.6.1.2.1.1.3.0", "1.3.6.1.2.1.1.5.0", "1.3.6.1.2.1.1.6.0"]
+        agent = FakeAgent(oids, {oids[0]: Integer(42), oids[1]: NoSuchObject()})
+        install(monkeypatch, agent)
+
+        results = await client.get_multiple("127.0.0.1", 161, CREDENTIAL, oids)
+
+        assert int(results[oids[0]]) == 42
+        assert results[oids[1]] is None
+        assert results[oids[2]] is None
+
+    async def test_rejected_batch_is_retried_per_oid(self, monkeypatch, client):
+        """One bad varbind only loses its own value, not its whole batch."""
+        oids = [f"1.3.6.1.2.1.2.2.1.14.{index}" for index in range(1, 26)]
+        bad = oids[3]
+        agent = FakeAgent(
+            oids, {oid: Integer(7) for oid in oids if oid != bad}, bad=frozenset({bad})
+        )
+        install(monkeypatch, agent)
+
+        results = await client.get_multiple("127.0.0.1", 161, CREDENTIAL, oids)
+
+        assert results[bad] is None
+        assert all(int(results[oid]) == 7 for oid in oids if oid != bad)
+        # Two packed requests, then the rejected first batch one OID at a time
+        assert len(agent.requests) == 2 + _MAX_GET_VARBINDS
+
+    async def test_transport_error_stops_requests(self, monkeypatch, client):
+        oids = [f"1.3.6.1.2.1.2.2.1.8.{index}" for index in range(1, 41)]
+        agent = FakeAgent(oids, {oid: Integer(1) for oid in oids})
+        agent.error_indication = "No SNMP response received before timeout"
+        install(monkeypatch, agent)
+
+        results = await client.get_multiple("127.0.0.1", 161, CREDENTIAL, oids)
+
+        assert len(agent.requests) == 1
+        assert all(value is None for value in results.values())
+
+    async def test_transport_and_user_data_are_reused(self, monkeypatch, client):
+        oids = ["1.3.6.1.2.1.1.3.0"]
+        install(monkeypatch, FakeAgent(oids, {oids[0]: Integer(1)}))
+
+        await client.get_multiple("127.0.0.1", 161, CREDENTIAL, oids)
+        await client.get_multiple("127.0.0.1", 161, CREDENTIAL, oids)
+
+        assert len(client._transports) == 1
+        assert len(client._user_data) == 1
+
+    async def test_user_data_rebuilt_when_credential_changes(self, client):
+        first = client._get_user_data(CREDENTIAL)
+        rotated = replace(
+            CREDENTIAL,
+            auth_password="rotated-password",
+            updated_at=datetime(2024, 2, 1, tzinfo=UTC),
+        )
+
+        assert client._get_user_data(CREDENTIAL) is first
+        assert client._get_user_data(rotated) is not first
+        assert list(client._user_data) == [CREDENTIAL.credential_id]
+
+
+class TestValueHelpers:
+    """Test integer conversion of polled values."""
+
+    def test_to_int(self):
+        assert _to_int(Integer(12)) == 12
+        assert _to_int("34") == 34
+        assert _to_int(None) is None
+        assert _to_int("n/a") is None
+
+    def test_column_int(self):
+        values = {"1.3.6.1.2.1.2.2.1.8.3": Integer(1), "1.3.6.1.2.1.2.2.1.7.3": None}
+
+        assert _column_int(values, "1.3.6.1.2.1.2.2.1.8", 3) == 1
+        assert _column_int(values, "1.3.6.1.2.1.2.2.1.7", 3) is None
+        assert _column_int(values, "1.3.6.1.2.1.2.2.1.8", 4) is None
@@ -299,8 +299,10 @@ CREATE TABLE npm.alerts (
     details JSONB
 );
 
-CREATE INDEX idx_alerts_device ON npm.alerts(device_id);
-CREATE INDEX idx_alerts_status ON npm.alerts(status);
+-- Composite indexes match the alert list filters (device, status) and its
+-- ORDER BY, so filtered pages and empty matches resolve from the index alone
+CREATE INDEX idx_alerts_device_status_triggered ON npm.alerts(device_id, status, triggered_at DESC);
+CREATE INDEX idx_alerts_status_triggered ON npm.alerts(status, triggered_at DESC);
 CREATE INDEX idx_alerts_triggered ON npm.alerts(triggered_at DESC);
 
 -- Discovery Jobs (network scanning for device discovery)
@@ -0,0 +1,14 @@
+-- Migration 014: Composite indexes for the NPM alert list
+-- The alert list filters on device_id and/or status and orders by
+-- triggered_at DESC. Single-column indexes forced a sort of every matching
+-- row (and a full count) before LIMIT; composite indexes let filtered pages,
+-- including empty ones, be answered from an ordered index range.
+
+CREATE INDEX IF NOT EXISTS idx_alerts_device_status_triggered
+    ON npm.alerts(device_id, status, triggered_at DESC);
+CREATE INDEX IF NOT EXISTS idx_alerts_status_triggered
+    ON npm.alerts(status, triggered_at DESC);
+
+-- Superseded by the composite indexes above (same leading column)
+DROP INDEX IF EXISTS npm.idx_alerts_device;
+DROP INDEX IF EXISTS npm.idx_alerts_status;